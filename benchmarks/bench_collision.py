@@ -0,0 +1,69 @@
+"""
+A million random collision checks on the real map: building `list(range(21)) + [22, 32]` and
+searching it for every check (as Game.is_block used to) against a lookup in the passability map.
+The blocked counts differ: since VOID became id 0 the list blocks it, the passability map doesn't
+
+    python -m benchmarks.bench_collision [--queries 1000000]
+"""
+import argparse
+import random
+from pathlib import Path
+from time import perf_counter
+
+from explorer.lib.parser import TileCatalog, parse_map
+from explorer.lib.passability import Passability
+from explorer.lib.tilemap import TileMap
+
+MAP_PATH = Path(__file__).resolve().parents[1] / "krita" / "explorer_map.png"
+
+
+def list_search(game_map: TileMap, queries: list[tuple[int, int]]) -> int:
+    blocked = 0
+    for y, x in queries:
+        match game_map.get(y, x):
+            case t if t in list(range(21)) + [22, 32]:
+                blocked += 1
+            case _:
+                pass
+    return blocked
+
+
+def bitmap(passability: Passability, queries: list[tuple[int, int]]) -> int:
+    blocked = 0
+    for y, x in queries:
+        if passability.blocked(y, x):
+            blocked += 1
+    return blocked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    game_map = parse_map(MAP_PATH)
+
+    start = perf_counter()
+    passability = Passability(game_map, TileCatalog().barriers)  # type: ignore
+    print(f"passability map built in {(perf_counter() - start) * 1000:.1f}ms")
+
+    rng = random.Random(0)
+    queries = [
+        (rng.randrange(game_map.height), rng.randrange(game_map.width)) for _ in range(args.queries)
+    ]
+
+    for name, check, target in (
+        ("list search", list_search, game_map),
+        ("passability", bitmap, passability),
+    ):
+        start = perf_counter()
+        blocked = check(target, queries)  # type: ignore
+        elapsed = perf_counter() - start
+        print(
+            f"{name:<14}{elapsed * 1000:>8.1f}ms{elapsed / len(queries) * 1e9:>8.0f}ns/query"
+            f"{blocked:>10} blocked"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Fights per second played out by the combat engine alone, every weapon delusion against every enemy
+delusion, the player attacking in the begin phase and passing in the end phase
+
+    python -m benchmarks.bench_combat [--fights 20000] [--seed 0]
+"""
+import argparse
+import random
+from time import perf_counter
+
+from explorer.ctx import Delusions, Phase, Turn
+from explorer.lib.combat import Fight, Fighter, step, winner
+
+# Zap against Zap can wither both ATKs to 0, those fights are called off
+MAX_STEPS = 200
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fights", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed).random
+    pairs = [(p, e) for p in Delusions for e in Delusions]
+    steps = wins = 0
+
+    start = perf_counter()
+    for i in range(args.fights):
+        player, enemy = pairs[i % len(pairs)]
+        fight = Fight(Fighter(100, 100, 20, 20, player), Fighter(150, 150, 15, 15, enemy))
+        for _ in range(MAX_STEPS):
+            if winner(fight):
+                break
+            step(fight, "attack" if fight.phase == Phase.begin else "pass", rng)
+            steps += 1
+        wins += winner(fight) == Turn.player
+    elapsed = perf_counter() - start
+
+    fights = args.fights
+    print(f"{fights / elapsed:.0f} fights/s, {elapsed / fights * 1e6:.1f}us/fight")
+    print(f"{steps / fights:.1f} steps/fight, player won {wins / fights:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Latency of collecting 100 coins: full pad redraw per removed tile vs dirty cell updates.
+Needs a real terminal
+
+    python -m benchmarks.bench_dirty
+"""
+import curses
+from pathlib import Path
+from time import perf_counter
+
+from explorer.game import Game
+from explorer.globals import Colors
+from explorer.globals import Globals as G
+from explorer.lib.parser import parse_map
+from explorer.render.terminal import CursesBackend
+
+MAP_PATH = Path(__file__).resolve().parents[1] / "krita" / "explorer_map.png"
+COINS = 100
+
+
+class RedrawGame(Game):
+    """remove_tile as it was: every removal redraws the whole pad"""
+
+    def remove_tile(self, y, x) -> None:
+        self.game_map.set(y, x, 21)
+        self.redraw()
+
+
+def collect_coins(cls: type[Game]) -> list[float]:
+    game_map = parse_map(MAP_PATH)
+    coins = game_map.find(21)[:COINS]
+    for y, x in coins:
+        game_map.set(y, x, 24)
+
+    game = cls(curses.newpad(G.view_height + 1, G.view_width + 1), game_map)
+
+    times = []
+    for y, x in coins:
+        start = perf_counter()
+        game.remove_tile(y, x)
+        game.render()
+        curses.doupdate()
+        times.append(perf_counter() - start)
+    return times
+
+
+def run(stdscr: curses.window) -> list[str]:
+    curses.start_color()
+    Colors.setup_colors(CursesBackend(stdscr))
+
+    lines = [f"{'':<16}{'total':>10}{'per coin':>12}"]
+    for name, cls in (("full redraw", RedrawGame), ("dirty cells", Game)):
+        times = collect_coins(cls)
+        lines.append(
+            f"{name:<16}{sum(times) * 1000:>8.1f}ms{sum(times) / len(times) * 1e6:>10.0f}us"
+        )
+    return lines
+
+
+if __name__ == "__main__":
+    print("\n".join(curses.wrapper(run)))
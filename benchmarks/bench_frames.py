@@ -0,0 +1,48 @@
+"""
+Frames per second of the whole game rendered with the headless backend, walking back and forth
+across the map, with what an average frame cost in surface calls, cells written and cells changed
+
+    python -m benchmarks.bench_frames [--frames 5000] [--size 40x120]
+"""
+import argparse
+import os
+import tempfile
+from time import perf_counter
+
+from explorer.app import setup
+from explorer.render.headless import HeadlessBackend
+
+WALK = "d" * 20 + "s" + "a" * 20 + "w"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--size", default="40x120", help="HEIGHTxWIDTH")
+    args = parser.parse_args()
+
+    height, width = map(int, args.size.split("x"))
+    os.environ.setdefault("EXPLORER_CACHE_DIR", tempfile.mkdtemp())
+    backend = HeadlessBackend(height, width)
+    game = setup(backend, seed=0)
+    stats = backend.stats
+    # Without the setup frames
+    calls, cells, changed = stats.total_calls, stats.total_cells, stats.total_changed
+
+    start = perf_counter()
+    for i in range(args.frames):
+        game.listen(ord(WALK[i % len(WALK)]))
+        game.render()
+    elapsed = perf_counter() - start
+
+    frames = args.frames
+    print(f"{frames / elapsed:.0f} frames/s, {elapsed / frames * 1e6:.0f}us/frame")
+    print(
+        f"per frame: {(stats.total_calls - calls) / frames:.1f} calls, "
+        f"{(stats.total_cells - cells) / frames:.1f} cells written, "
+        f"{(stats.total_changed - changed) / frames:.1f} cells changed"
+    )
+
+
+if __name__ == "__main__":
+    main()
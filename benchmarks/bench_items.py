@@ -0,0 +1,60 @@
+"""
+Memory per weapon and healable made from the item tables, and how fast the inventory page draws a
+weapon line, with the drawing itself stubbed out so only the lookups are timed
+
+    python -m benchmarks.bench_items [--items 100000] [--draws 200000]
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from explorer.app import setup
+from explorer.ctx import Side, inventory
+from explorer.data.game_items import Heals, Weapons
+from explorer.render.headless import HeadlessBackend
+
+
+class NullPad:
+    def addstr(self, *args) -> None:
+        pass
+
+
+def per_item(make, n: int) -> float:
+    """Bytes allocated per item for `n` items"""
+    tracemalloc.start()
+    items = [make(i) for i in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--draws", type=int, default=200_000)
+    args = parser.parse_args()
+
+    weapons = [make for rarity in Weapons.values() for make in rarity.values()]
+    heals = list(Heals.values())
+    weapon = per_item(lambda i: weapons[i % len(weapons)](), args.items)
+    heal = per_item(lambda i: heals[i % len(heals)](), args.items)
+    print(f"{weapon:.0f} bytes/weapon, {heal:.0f} bytes/healable")
+
+    os.environ.setdefault("EXPLORER_CACHE_DIR", tempfile.mkdtemp())
+    setup(HeadlessBackend(40, 120), seed=0)
+    side = Side()  # type: ignore
+    side.pad = NullPad()
+    equipped = inventory.weapons[0]
+
+    start = perf_counter()
+    for _ in range(args.draws):
+        side.draw_weapon(equipped)
+    elapsed = perf_counter() - start
+    print(f"draw_weapon: {elapsed / args.draws * 1e9:.0f}ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Chests opened per second from the default chest table, one roll at a time as in the game and in
+batches as arrays, with the drop rates of each rarity the batches gave
+
+    python -m benchmarks.bench_loot [--chests 5000000] [--seed 0]
+"""
+import argparse
+import random
+from time import perf_counter
+
+import numpy as np
+
+from explorer.data.loot import CHEST
+
+# Rolls per batch, bounds the memory used
+BATCH = 1 << 20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chests", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    scalar = args.chests // 50
+    start = perf_counter()
+    for _ in range(scalar):
+        CHEST.roll(rng)
+    elapsed = perf_counter() - start
+    print(f"roll:   {scalar / elapsed:>12.0f} chests/s")
+
+    weapons = CHEST.tables[0]
+    counts = np.zeros(len(weapons), dtype=np.int64)
+    generator = np.random.default_rng(args.seed)
+    start = perf_counter()
+    for done in range(0, args.chests, BATCH):
+        rolls = CHEST.sample(min(BATCH, args.chests - done), generator)
+        counts += np.bincount(rolls[:, 0], minlength=len(weapons))
+    elapsed = perf_counter() - start
+    print(f"sample: {args.chests / elapsed:>12.0f} chests/s")
+
+    rates: dict[str, int] = {}
+    for (_, rarity, _), count in zip(weapons.items, counts.tolist()):
+        rates[rarity.name] = rates.get(rarity.name, 0) + count
+    print(", ".join(f"{name} {count / args.chests:.2%}" for name, count in rates.items()))
+
+
+if __name__ == "__main__":
+    main()
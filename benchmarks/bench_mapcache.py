@@ -0,0 +1,46 @@
+"""
+Cold (decode and write cache) vs warm (memory map the cache) map loading
+
+    python -m benchmarks.bench_mapcache [--sizes 1024 4096]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from benchmarks.bench_parser import MAP_PATH, synthetic_map
+from explorer.lib.mapcache import load_ids
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1024, 4096])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assets = [("explorer_map.png", MAP_PATH)]
+        for n in args.sizes:
+            path = Path(tmp) / f"synthetic_{n}.png"
+            synthetic_map(n).save(path)
+            assets.append((f"synthetic {n}x{n}", path))
+
+        print(f"{'map':<20}{'cold':>12}{'warm':>12}")
+        for name, path in assets:
+            cache_dir = Path(tmp) / "cache"
+
+            start = perf_counter()
+            load_ids(path, cache_dir)
+            cold = perf_counter() - start
+
+            warm = min(_timed(path, cache_dir) for _ in range(5))
+            print(f"{name:<20}{cold * 1000:>10.1f}ms{warm * 1000:>10.2f}ms")
+
+
+def _timed(path: Path, cache_dir: Path) -> float:
+    start = perf_counter()
+    load_ids(path, cache_dir)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Bytes sent to the terminal and time per frame with the curses and the ANSI backend, walking the
+same path and flipping through the side pages. Each backend runs in a child process on its own
+pseudo terminal, which this process drains and counts
+
+    python -m benchmarks.bench_output [--frames 2000] [--size 40x120]
+"""
+import argparse
+import curses
+import fcntl
+import json
+import os
+import pty
+import select
+import struct
+import tempfile
+import termios
+from statistics import mean, quantiles
+from time import perf_counter
+
+from explorer.app import setup
+from explorer.render.ansi import ansi_terminal
+from explorer.render.base import Backend
+from explorer.render.terminal import CursesBackend
+
+WALK = "d" * 20 + "s" + "i" + "a" * 20 + "i" + "w" + "c" + "c"
+
+
+def drive(backend: Backend, frames: int, ready: int, go: int, results: str) -> None:
+    game = setup(backend, seed=0)
+
+    # Setup output isn't counted
+    os.write(ready, b"1")
+    os.read(go, 1)
+
+    times = []
+    for i in range(frames):
+        start = perf_counter()
+        game.listen(ord(WALK[i % len(WALK)]))
+        game.render()
+        times.append(perf_counter() - start)
+
+    with open(results, "w") as f:
+        json.dump(times, f)
+
+
+def child(name: str, frames: int, size: tuple[int, int], pipes: tuple[int, int], results: str):
+    fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack("HHHH", *size, 0, 0))
+    os.environ["TERM"] = "xterm-256color"
+
+    if name == "curses":
+        curses.wrapper(lambda stdscr: drive(CursesBackend(stdscr), frames, *pipes, results))
+    else:
+        with ansi_terminal() as backend:
+            drive(backend, frames, *pipes, results)
+
+
+def measure(name: str, frames: int, size: tuple[int, int]) -> tuple[float, list[float]]:
+    """Bytes per frame and the time each frame took"""
+    ready_r, ready_w = os.pipe()
+    go_r, go_w = os.pipe()
+    results = tempfile.mktemp()
+
+    pid, master = pty.fork()
+    if pid == 0:
+        try:
+            child(name, frames, size, (ready_w, go_r), results)
+        finally:
+            os._exit(0)
+
+    total = counted = 0
+    fds = [master, ready_r]
+    while True:
+        readable = select.select(fds, [], [])[0]
+        if ready_r in readable:
+            os.read(ready_r, 1)
+            fds.remove(ready_r)
+            counted = total
+            os.write(go_w, b"1")
+        if master in readable:
+            try:
+                data = os.read(master, 1 << 16)
+            except OSError:
+                break
+            if not data:
+                break
+            total += len(data)
+
+    os.waitpid(pid, 0)
+    with open(results) as f:
+        times = json.load(f)
+    os.remove(results)
+    return (total - counted) / frames, times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--size", default="40x120", help="HEIGHTxWIDTH")
+    args = parser.parse_args()
+
+    size = tuple(map(int, args.size.split("x")))
+    os.environ.setdefault("EXPLORER_CACHE_DIR", tempfile.mkdtemp())
+
+    print(f"{'':<8}{'bytes/frame':>12}{'mean':>10}{'p50':>10}{'p99':>10}")
+    for name in ("curses", "ansi"):
+        per_frame, times = measure(name, args.frames, size)  # type: ignore
+        cuts = quantiles(times, n=100)
+        print(
+            f"{name:<8}{per_frame:>12.0f}{mean(times) * 1e6:>8.0f}us"
+            f"{cuts[49] * 1e6:>8.0f}us{cuts[98] * 1e6:>8.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares the vectorized palette decoder against the old per-pixel getpixel loop
+
+    python -m benchmarks.bench_parser [--sizes 1024 4096] [--repeat 3]
+"""
+import argparse
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from explorer.lib.palette import PIXEL_TO_ID, decode_image
+
+MAP_PATH = Path(__file__).resolve().parents[1] / "krita" / "explorer_map.png"
+
+
+def getpixel_loop(m: Image.Image) -> list[list[int]]:
+    """The decoding part of the original parse_image: one getpixel and dict lookup per pixel"""
+    w, h = m.size
+    return [[PIXEL_TO_ID[m.getpixel((y, x))[0:3]] for y in range(w)] for x in range(h)]
+
+
+def synthetic_map(size: int, seed: int = 0) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    colors = np.array(list(PIXEL_TO_ID), dtype=np.uint8)
+    pixels = colors[rng.integers(0, len(colors), (size, size))]
+    return Image.fromarray(pixels, "RGB").convert("RGBA")
+
+
+def best_of(fn: Callable, m: Image.Image, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn(m)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1024, 4096])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    maps = [("explorer_map.png", Image.open(MAP_PATH))]
+    maps += [(f"synthetic {n}x{n}", synthetic_map(n)) for n in args.sizes]
+
+    print(f"{'map':<20}{'getpixel loop':>16}{'palette decode':>16}{'speedup':>10}")
+    for name, m in maps:
+        m.load()
+        assert decode_image(m).tolist() == getpixel_loop(m)
+
+        legacy = best_of(getpixel_loop, m, args.repeat)
+        vectorized = best_of(decode_image, m, args.repeat)
+        print(
+            f"{name:<20}{legacy * 1000:>14.1f}ms{vectorized * 1000:>14.1f}ms{legacy / vectorized:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Lookups per second in the progression tables against compounding the numbers on every call, as
+enemy encounters and level-ups did before, and how long tables for a 100 level cap take to build
+
+    python -m benchmarks.bench_progression [--calls 200000]
+"""
+import argparse
+from math import floor
+from time import perf_counter
+
+from explorer.lib.progression import MAX_LEVEL, compound, enemy_stats, weapon_atk
+
+
+def compounded_enemy(hp: int, atk: int, level: int) -> tuple[int, int]:
+    if level > 1:
+        return floor(hp * 1.5**level), floor(atk * 1.3**level)
+    return hp, atk
+
+
+def compounded_weapon(atk: int, levels: int) -> int:
+    for _ in range(levels):
+        atk = floor(atk * 1.5)
+    return atk
+
+
+def rate(f, calls: int) -> float:
+    start = perf_counter()
+    for i in range(calls):
+        f(30 + i % 8, 15 + i % 4, 1 + i % MAX_LEVEL)
+    return calls / (perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"enemy_stats: {rate(enemy_stats, args.calls):>10.0f}/s tables")
+    print(f"             {rate(compounded_enemy, args.calls):>10.0f}/s compounded")
+
+    table = lambda hp, atk, level: weapon_atk(atk, level - 1)
+    loop = lambda hp, atk, level: compounded_weapon(atk, level - 1)
+    print(f"weapon_atk:  {rate(table, args.calls):>10.0f}/s tables")
+    print(f"             {rate(loop, args.calls):>10.0f}/s compounded")
+
+    start = perf_counter()
+    compound(20, 1.8, 100)
+    compound(50, 1.5, 100)
+    print(f"100 levels of XP and HP: {(perf_counter() - start) * 1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Curses calls and wall time of a full map redraw, one addch per cell (as Game.redraw used to do)
+against one addstr per colour run, with the rows encoded in one batch and then already cached.
+Then a viewport redrawn after each step of the camera moving sideways, with rows encoded for each
+camera position against windows cut from rows encoded once. Needs a real terminal
+
+    python -m benchmarks.bench_rows [--repeat 5]
+"""
+import argparse
+import curses
+from pathlib import Path
+from time import perf_counter
+
+from explorer.globals import Colors
+from explorer.lib.parser import TileCatalog, parse_map
+from explorer.lib.runs import EncodedRow, RowEncoder, Runs
+from explorer.lib.tilemap import TileMap
+from explorer.render.terminal import CursesBackend
+
+MAP_PATH = Path(__file__).resolve().parents[1] / "krita" / "explorer_map.png"
+
+
+def per_cell(pad: curses.window, game_map: TileMap, cache: dict[int, Runs]) -> int:
+    chars, colors = TileCatalog().chars, TileCatalog().colors  # type: ignore
+    calls = 0
+    pad.move(0, 0)
+    for row in game_map.rows():
+        for id in row:
+            pad.addch(chars[id], colors[id])
+        pad.addch("\n")
+        calls += len(row) + 1
+    return calls
+
+
+def per_run(pad: curses.window, game_map: TileMap, cache: dict[int, Runs]) -> int:
+    encoder = RowEncoder(TileCatalog().chars, TileCatalog().colors)  # type: ignore
+    missing = [y for y in range(game_map.height) if y not in cache]
+    if missing:
+        rows = encoder.encode_rows([bytes(game_map.row(y)) for y in missing])
+        cache.update(zip(missing, rows))
+
+    calls = 0
+    for y in range(game_map.height):
+        runs = cache[y]
+        pad.move(y, 0)
+        for text, attr in runs:
+            pad.addstr(text, attr)
+        calls += len(runs) + 1
+    return calls
+
+
+# Viewport of the sideways walk, and how far it walks
+VIEW = (40, 100)
+STEPS = 100
+
+
+def per_position(pad: curses.window, game_map: TileMap, steps: int) -> int:
+    encoder = RowEncoder(TileCatalog().chars, TileCatalog().colors)  # type: ignore
+    height, width = VIEW
+    calls = 0
+    for left in range(steps):
+        for y in range(height):
+            runs = encoder.encode(game_map.span(y, left, left + width))
+            pad.move(y, 0)
+            for text, attr in runs:
+                pad.addstr(text, attr)
+            calls += len(runs) + 1
+    return calls
+
+
+def per_window(pad: curses.window, game_map: TileMap, steps: int) -> int:
+    encoder = RowEncoder(TileCatalog().chars, TileCatalog().colors)  # type: ignore
+    height, width = VIEW
+    cache: dict[int, EncodedRow] = {}
+    calls = 0
+    for left in range(steps):
+        for y in range(height):
+            row = cache.get(y)
+            if row is None or not row.covers(left, left + width):
+                lo = max(left - width, 0)
+                runs = encoder.encode(game_map.span(y, lo, lo + 3 * width))
+                row = cache[y] = EncodedRow(lo, runs)
+            runs = row.window(left, left + width)
+            pad.move(y, 0)
+            for text, attr in runs:
+                pad.addstr(text, attr)
+            calls += len(runs) + 1
+    return calls
+
+
+def run(stdscr: curses.window, repeat: int) -> list[str]:
+    curses.start_color()
+    Colors.setup_colors(CursesBackend(stdscr))
+
+    game_map = parse_map(MAP_PATH)
+    pad = curses.newpad(game_map.height + 1, game_map.width + 1)
+
+    lines = [
+        f"{game_map.height}x{game_map.width} map",
+        f"{'':<16}{'calls/frame':>12}{'best':>10}",
+    ]
+    cache: dict[int, Runs] = {}
+    for name, draw, warm in (
+        ("addch per cell", per_cell, False),
+        ("runs, cold", per_run, False),
+        ("runs, cached", per_run, True),
+    ):
+        times = []
+        for _ in range(repeat):
+            if not warm:
+                cache.clear()
+            start = perf_counter()
+            calls = draw(pad, game_map, cache)
+            times.append(perf_counter() - start)
+        lines.append(f"{name:<16}{calls:>12}{min(times) * 1000:>8.1f}ms")
+
+    lines.append(f"{VIEW[0]}x{VIEW[1]} viewport, {STEPS} steps sideways")
+    for name, walk in (("encode per step", per_position), ("windows", per_window)):
+        times = []
+        for _ in range(repeat):
+            start = perf_counter()
+            calls = walk(pad, game_map, STEPS)
+            times.append(perf_counter() - start)
+        lines.append(f"{name:<16}{calls // STEPS:>12}{min(times) / STEPS * 1000:>8.2f}ms")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("\n".join(curses.wrapper(run, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+How the balance sweep scales with worker processes: fights per second for each worker count over
+the same grid and seed, and a digest of the rows to show every count gave the same output
+
+    python -m benchmarks.bench_sweep [--fights 500] [--levels 1-5] [--workers 1,2,4,8] [--seed 0]
+"""
+import argparse
+import hashlib
+import json
+import os
+from time import perf_counter
+
+from explorer.simulate import matchups, parse_levels, sweep
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fights", type=int, default=500)
+    parser.add_argument("--levels", default="1-5")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    base = None
+    for workers in map(int, args.workers.split(",")):
+        rows = matchups(parse_levels(args.levels))
+        digest = hashlib.sha256()
+        count = 0
+        start = perf_counter()
+        for count, row in enumerate(sweep(rows, args.fights, args.seed, workers=workers), 1):
+            digest.update(json.dumps(row).encode())
+        elapsed = perf_counter() - start
+
+        rate = count * args.fights / elapsed
+        base = base or rate
+        print(
+            f"{workers} workers: {rate:>10.0f} fights/s, {rate / base:.2f}x,"
+            f" rows {digest.hexdigest()[:12]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Memory and time of parse_image's TileMap vs nested lists of shared Tile prototypes vs one Tile
+object per map cell.
+Needs a real terminal since the colours come from curses
+
+    python -m benchmarks.bench_tiles
+"""
+import curses
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+from PIL import Image
+
+from explorer.globals import Colors
+from explorer.lib.palette import decode_image
+from explorer.lib.parser import TileCatalog, parse_image
+from explorer.render.terminal import CursesBackend
+
+MAP_PATH = Path(__file__).resolve().parents[1] / "krita" / "explorer_map.png"
+
+
+class LegacyTile:
+    """Tile as it was before the catalog: a fresh mutable object per map cell"""
+
+    __slots__ = ("char", "barrier", "color", "id", "name")
+
+    def __init__(self, char: str, barrier: bool, color: int, id: int, name: str) -> None:
+        self.char = char
+        self.barrier = barrier
+        self.color = color
+        self.id = id
+        self.name = name
+
+
+def legacy_parse_image(m: Image.Image) -> list[list[LegacyTile]]:
+    tiles = TileCatalog().tiles  # type: ignore
+
+    def new(id: int) -> LegacyTile:
+        t = tiles[id]
+        return LegacyTile(t.char, t.barrier, t.color, t.id, t.name)
+
+    return [[new(id) for id in ids] for ids in decode_image(m).tolist()]
+
+
+def prototype_parse_image(m: Image.Image) -> list[list]:
+    tiles = TileCatalog().tiles  # type: ignore
+    return [list(map(tiles.__getitem__, row)) for row in parse_image(m).rows()]
+
+
+def measure(fn, m: Image.Image, repeat: int = 5) -> tuple[float, int, int]:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn(m)
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    game_map = fn(m)
+    curr, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del game_map
+
+    return min(times), curr, peak
+
+
+def run(stdscr: curses.window) -> list[str]:
+    curses.start_color()
+    Colors.setup_colors(CursesBackend(stdscr))
+    m = Image.open(MAP_PATH)
+    m.load()
+    # Build the catalog and decoder tables outside of the measurements
+    game_map = parse_image(m)
+
+    lines = [f"map {game_map.height}x{game_map.width} cells"]
+    lines.append(f"{'':<22}{'time':>10}{'current':>14}{'peak':>14}")
+    for name, fn in (
+        ("one Tile per cell", legacy_parse_image),
+        ("shared prototypes", prototype_parse_image),
+        ("TileMap", parse_image),
+    ):
+        t, curr, peak = measure(fn, m)
+        lines.append(f"{name:<22}{t * 1000:>8.1f}ms{curr / 1024:>12.0f}KB{peak / 1024:>12.0f}KB")
+    return lines
+
+
+if __name__ == "__main__":
+    print("\n".join(curses.wrapper(run)))
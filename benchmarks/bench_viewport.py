@@ -0,0 +1,133 @@
+"""
+Startup and per-step render cost of the viewport renderer against the old full map pad, for
+growing map sizes. The full pad is skipped for maps curses can't allocate a pad for. Needs a real
+terminal
+
+    python -m benchmarks.bench_viewport [--steps 200]
+"""
+import argparse
+import curses
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from explorer.ctx import player
+from explorer.game import Game
+from explorer.globals import Colors
+from explorer.globals import Globals as G
+from explorer.lib.parser import TileCatalog
+from explorer.lib.tilemap import GameMap, TileMap
+from explorer.lib.world import ChunkedWorld, write_world
+from explorer.render.terminal import CursesBackend
+
+from .bench_world import synthetic_chunk
+
+FULL_PAD_LIMIT = 1024
+
+
+class FullPadGame(Game):
+    """Rendering as it was: the whole map lives in the pad and render shows a window of it"""
+
+    def redraw(self) -> None:
+        for y in range(self.game_map.height):
+            self.pad.move(y, 0)
+            for id in self.game_map.span(y, 0, self.game_map.width):
+                self.pad.addch(self.chars[id], self.colors[id])
+        self.dirty.clear()
+
+    def scroll(self, dy: int, dx: int) -> None:
+        pass
+
+    def render(self) -> None:
+        self.pad.noutrefresh(
+            self.y_offset,
+            self.x_offset,
+            G.padding_height + 1,
+            G.padding_width + 1,
+            G.padding_height + G.view_height,
+            G.padding_width + G.view_width,
+        )
+
+
+def synthetic_map(size: int) -> TileMap:
+    chunks = size // 64
+    ids = np.block([[synthetic_chunk(cy, cx, 64) for cx in range(chunks)] for cy in range(chunks)])
+    return TileMap.from_array(ids, TileCatalog().table)  # type: ignore
+
+
+def walk(cls: type[Game], game_map: GameMap, steps: int) -> tuple[int, float, float, float]:
+    """
+    Pad cells, startup time, mean time per step to move and compose the viewport, mean time per
+    step to refresh the terminal (dominated by terminal output, so about the same for both)
+    """
+    y = game_map.height // 2 + 64 // 2
+    player.y, player.x = y + 1, game_map.width // 2 + 1
+
+    start = perf_counter()
+    if cls is FullPadGame:
+        pad = curses.newpad(game_map.height + 1, game_map.width + 1)
+    else:
+        pad = curses.newpad(G.view_height + 1, G.view_width + 1)
+    game = cls(pad, game_map)
+    startup = perf_counter() - start
+
+    compose = refresh = 0.0
+    for _ in range(steps):
+        start = perf_counter()
+        game.displace_right()
+        game.flush()
+        mid = perf_counter()
+        game.render()
+        curses.doupdate()
+        end = perf_counter()
+        compose += mid - start
+        refresh += end - mid
+
+    height, width = pad.getmaxyx()
+    return height * width, startup, compose / steps, refresh / steps
+
+
+def run(stdscr: curses.window, steps: int, world: Path) -> list[str]:
+    curses.start_color()
+    Colors.setup_colors(CursesBackend(stdscr))
+
+    lines = [f"{'':<28}{'pad cells':>12}{'startup':>10}{'compose':>10}{'refresh':>10}"]
+    cases: list[tuple[str, type[Game], GameMap]] = []
+    for size in (256, 1024, 4096):
+        game_map = synthetic_map(size)
+        if size <= FULL_PAD_LIMIT:
+            cases.append((f"full pad {size}x{size}", FullPadGame, game_map))
+        cases.append((f"viewport {size}x{size}", Game, game_map))
+
+    chunked = ChunkedWorld(world, TileCatalog().table)  # type: ignore
+    cases.append((f"viewport chunked {chunked.height}x{chunked.width}", Game, chunked))
+
+    for name, cls, game_map in cases:
+        cells, startup, compose, refresh = walk(cls, game_map, steps)
+        lines.append(
+            f"{name:<28}{cells:>12}{startup * 1000:>8.1f}ms"
+            f"{compose * 1e6:>8.0f}us{refresh * 1e6:>8.0f}us"
+        )
+
+    chunked.close()
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--world-size", type=int, default=16384)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.world"
+        write_world(
+            path, args.world_size, args.world_size, lambda cy, cx: synthetic_chunk(cy, cx, 64)
+        )
+        print("\n".join(curses.wrapper(run, args.steps, path)))
+
+
+if __name__ == "__main__":
+    main()
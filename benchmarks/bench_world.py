@@ -0,0 +1,85 @@
+"""
+Walks a viewport across a large synthetic chunked world and reports per-step latency with and
+without background prefetching, plus how many chunks stay resident
+
+    python -m benchmarks.bench_world [--size 16384] [--steps 600]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter, sleep
+
+import numpy as np
+
+from explorer.lib.world import ChunkedWorld, write_world
+
+TILES = [None] * 256
+VIEW_HEIGHT, VIEW_WIDTH = 50, 150
+
+
+def synthetic_chunk(cy: int, cx: int, chunk_size: int) -> np.ndarray:
+    """Walled rooms with paths through them and a few scattered items"""
+    rng = np.random.default_rng(cy * 100_003 + cx)
+    chunk = np.full((chunk_size, chunk_size), 21, dtype=np.uint8)
+    chunk[0, :] = chunk[:, 0] = 19
+    chunk[chunk_size // 2, :] = chunk[:, chunk_size // 2] = 21
+    items = rng.integers(1, chunk_size, (8, 2))
+    chunk[items[:, 0], items[:, 1]] = rng.choice([22, 23, 24, 26], 8)
+    return chunk
+
+
+def walk(world: ChunkedWorld, steps: int, prefetch: bool) -> list[float]:
+    """Moves right one cell per step and reads every cell of the viewport, like a full render"""
+    top, left = world.height // 2, 0
+    times = []
+    for _ in range(steps):
+        start = perf_counter()
+        left += 1
+        if prefetch:
+            world.prefetch(top, left, VIEW_HEIGHT, VIEW_WIDTH, 0, 1)
+        for y in range(top, top + VIEW_HEIGHT):
+            for x in range(left, left + VIEW_WIDTH):
+                world.get(y, x)
+        times.append(perf_counter() - start)
+        # Time between frames in which the prefetch thread gets to work
+        sleep(0.005)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=16384)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=600)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.world"
+
+        start = perf_counter()
+        write_world(
+            path,
+            args.size,
+            args.size,
+            lambda cy, cx: synthetic_chunk(cy, cx, args.chunk_size),
+            args.chunk_size,
+        )
+        print(f"world {args.size}x{args.size}, {args.chunk_size}x{args.chunk_size} chunks")
+        print(
+            f"built in {perf_counter() - start:.1f}s, {path.stat().st_size / 2**20:.1f}MB on disk"
+        )
+
+        print(f"{'':<14}{'median':>10}{'p99':>10}{'max':>10}{'sync loads':>12}{'resident':>10}")
+        for prefetch in (False, True):
+            world = ChunkedWorld(path, TILES, capacity=64)  # type: ignore
+            times = np.array(walk(world, args.steps, prefetch)) * 1000
+            name = "prefetch" if prefetch else "no prefetch"
+            print(
+                f"{name:<14}{np.median(times):>8.2f}ms{np.percentile(times, 99):>8.2f}ms"
+                f"{times.max():>8.2f}ms{world.stats['loads']:>12}{world.resident_chunks:>10}"
+            )
+            world.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
+import argparse
+from pathlib import Path
 from curses import window
 from curses import wrapper
-from .app import main
+from .app import main, main_ansi
+from .lib.rng import new_seed
 
 
 def test_keys(stdscr: window) -> None:
@@ -11,5 +14,30 @@ def test_keys(stdscr: window) -> None:
 
 
 if __name__ == "__main__":
-    wrapper(main)
+    parser = argparse.ArgumentParser(prog="explorer")
+    parser.add_argument(
+        "--backend",
+        choices=("curses", "ansi"),
+        default="curses",
+        help="ansi writes only the cells that changed with escape sequences, instead of curses",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="replays a session, the seed of the last one is printed on exit"
+    )
+    parser.add_argument(
+        "--world",
+        type=Path,
+        help="streams the map from a chunked world file, see `python -m explorer.lib.world`",
+    )
+    args = parser.parse_args()
+
+    # Picked here rather than in setup() so that it can be printed however the game ends
+    seed = new_seed() if args.seed is None else args.seed
+    try:
+        if args.backend == "ansi":
+            main_ansi(seed, args.world)
+        else:
+            wrapper(main, seed, args.world)
+    finally:
+        print(f"seed {seed}")
     # wrapper(test_keys)
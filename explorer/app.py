@@ -1,10 +1,10 @@
+import asyncio
 import curses
-import random
-from math import floor
+import signal
+import sys
+from collections import deque
 from pathlib import Path
-from typing import Protocol
-
-from PIL import Image
+from typing import Callable, Protocol
 
 from explorer.data.game_items import Weapons
 
@@ -13,23 +13,29 @@ from .ctx import (
     Delusions,
     Healable,
     Log,
-    Phase,
     Rarity,
     Side,
     SideState,
     Turn,
     Weapon,
+    WeaponTemplate,
     inventory,
+    paint_items,
     player,
     state,
-    fight_state,
 )
 from .game import Game
 from .globals import Colors
 from .globals import Globals as G
 
 # from .side import Side
-from .lib.parser import parse_command, parse_image
+from .lib import combat
+from .lib.parser import load_world, parse_command, parse_map
+from .lib.rng import Rngs
+from .lib.tilemap import GameMap
+from .render.ansi import ansi_terminal
+from .render.base import Backend, Surface
+from .render.terminal import CursesBackend
 
 
 class GameObject(Protocol):
@@ -37,23 +43,94 @@ class GameObject(Protocol):
         """Renders the GameObject"""
 
 
+# Frames are drawn at most this many times a second, input in between is handled in one batch
+MAX_FPS = 60
+
+# The map, relative to the repository root
+MAP_IMAGE = Path("krita") / "explorer_map.png"
+
+# Smallest screen, as (height, width), the layout fits on. Smaller ones show a message instead
+MIN_SIZE = (24, 80)
+
+
 class GameWrapper:
     """Main Game object responsible for being the master"""
 
-    def __init__(self, stdscr: curses.window) -> None:
+    def __init__(self, backend: Backend, rngs: Rngs) -> None:
         self.__objects: list[GameObject] = []
-        self.stdscr = stdscr
+        self.backend = backend
+        self.stdscr = backend.stdscr
+        # Every roll of the session, see lib/rng.py
+        self.rngs = rngs
+
+        # Frames are composed from layers, bottom to top: stdscr holding the static borders, the
+        # GameObjects' pads, then this one cell window for the player. Each layer only copies its
+        # changes into the backend's virtual screen with noutrefresh, and render() sends the
+        # result to the terminal once with doupdate
+        self.overlay = backend.newwin(1, 1, G.center_y, G.center_x)
+
+        # How many keys each of the last frames handled, see on_input()
+        self.frame_inputs: deque[int] = deque(maxlen=1000)
+        self.pending_inputs = 0
+
+        # Periodic background work as (interval in seconds, callback), see every()
+        self.timers: list[tuple[float, Callable[[], None]]] = []
+        self.game_over = False
+
+        # Size of the screen the layout was last made for, see resize()
+        self.screen = backend.size()
+        self.too_small = False
 
     def initialize(self) -> None:
         self.stdscr.clear()
-        self.stdscr.refresh()
-        curses.curs_set(0)
-        curses.start_color()
-        curses.use_default_colors()
-        Colors.setup_colors()
+        self.backend.start()
+        Colors.setup_colors(self.backend)
+        paint_items()
+
+        # The borders never change, so they are drawn once instead of every frame
+        self.render_border()
+        self.stdscr.noutrefresh()
 
         self.render()
 
+    def game_pad(self) -> Surface:
+        # One spare row and column for the newlines written by Game.redraw
+        return self.backend.newpad(G.view_height + 1, G.view_width + 1)
+
+    def side_pad(self) -> Surface:
+        return self.backend.newpad(G.game_height - 1, G.padding_width - 4)
+
+    def resize(self) -> None:
+        """
+        Lays the screen out again after the terminal was resized. Only what is sized after the
+        screen is reallocated: the pads, the player overlay and the row cache. The map, the player
+        and everything derived from the map stay as they are, so this takes the same time for any
+        map size
+        """
+        height, width = self.backend.resized()
+        if (height, width) == self.screen:
+            return
+        self.screen = (height, width)
+        self.stdscr.clear()
+
+        self.too_small = height < MIN_SIZE[0] or width < MIN_SIZE[1]
+        if self.too_small:
+            # The last layout is kept until there is room for one again
+            self.stdscr.addstr(0, 0, "Terminal too small"[: width - 1])
+            self.stdscr.noutrefresh()
+            return
+
+        G.configure(height, width)
+        self.render_border()
+        self.stdscr.noutrefresh()
+        self.overlay = self.backend.newwin(1, 1, G.center_y, G.center_x)
+
+        game, side = self.get_game(), self.get_side()
+        if game:
+            game.resize(self.game_pad())
+        if side:
+            side.resize(self.side_pad())
+
     def add_object(self, o: GameObject) -> None:
         self.__objects.append(o)
 
@@ -73,15 +150,27 @@ class GameWrapper:
         except StopIteration:
             return None
 
-    def listen(self) -> None:
+    def listen(self, key: int) -> None:
         """
         Acts upon keyboard input
         """
-        key = self.stdscr.getch()
+        if key == curses.KEY_RESIZE:
+            self.resize()
+            return
+        if self.too_small:
+            # Paused until the layout fits again, except for quitting
+            if key == 81:  # Q
+                raise Exception
+            return
+
         side = self.get_side()
         if not side:
             return
 
+        # Keys are handled in batches without rendering in between, which is where these were
+        # updated before
+        side.update_stats()
+
         # Enjoy this beautiful mountain of indents
 
         # Acts differently depending on the side pad's state
@@ -95,7 +184,7 @@ class GameWrapper:
                         side.prompt_buffer = ""
 
                         if side.temp_weapon:
-                            command_result = parse_command(command, replace=True)
+                            command_result = parse_command(command, self.rngs, replace=True)
                             Log(command_result.resolve)
                             side.render()
 
@@ -105,352 +194,73 @@ class GameWrapper:
 
                         # Recursive battle imperative logic
                         elif side.enemy:
-                            assert inventory.equipped_weapon
-
-                            # Enemy defeated
-                            if side.enemy.hp <= 0:
-                                game = self.get_game()
-                                assert game
-
-                                # Remove all enemy tiles blocking the path
-                                y, x = side.enemy.pos
-
-                                connected_tiles = [
-                                    (y, x),
-                                    (y + 1, x),
-                                    (y - 1, x),
-                                    (y, x + 1),
-                                    (y, x - 1),
-                                ]
-
-                                enemy_tiles = filter(
-                                    lambda pair: game.game_map[pair[0]][pair[1]].id == 22,
-                                    connected_tiles,
-                                )
-
-                                for tile in enemy_tiles:
-                                    game.remove_tile(*tile)
-
-                                Log("")
-                                Log(f"Defeated {side.enemy.name}")
-                                # Reset state and reward XP
-                                side.enemy = None
-                                inventory.equipped_weapon.atk = side.old_weapon_atk
-                                side.old_weapon_atk = 0
-                                state.level.xp += 10
-                                game.render()
-                                return
-
-                            if state.hp.hp <= 0:
-                                Log("")
-                                Log("")
-                                Log("You Lose! [Ctrl-C] to exit")
-                                self.render()
-                                while True:
-                                    pass
-
-                            # Begin effects
-                            if fight_state.phase == Phase.begin:
-                                match fight_state.turn:
-                                    case Turn.player:
-                                        Log("[Phase begin! Your Turn!]")
-                                        Log("")
-                                        if not fight_state.player_fxd:
-                                            match inventory.equipped_weapon.delusion.type:
-                                                case Delusions.Plant:
-
-                                                    Log(f"~~~Your Plant Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.75:
-                                                        heal_qty = floor(state.hp.max_hp * 10 / 100)
-                                                        old_hp = state.hp.hp
-                                                        state.hp.hp = (
-                                                            x
-                                                            if (x := old_hp + heal_qty)
-                                                            <= state.hp.max_hp
-                                                            else state.hp.max_hp
-                                                        )
-                                                        atk_bonus = floor(
-                                                            side.old_weapon_atk * 10 / 100
-                                                        )
-                                                        inventory.equipped_weapon.atk += atk_bonus
-                                                        Log(f"(YOU) +HP {state.hp.hp - old_hp}")
-                                                        Log(f"(YOU) +ATK {atk_bonus}")
-                                                    else:
-                                                        Log("Did nothing")
-
-                                                case Delusions.Zap:
-                                                    Log(f"~~~Your Zap Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.75:
-                                                        atk_wither = floor(
-                                                            side.enemy.original_atk * 15 / 100
-                                                        )
-
-                                                        # If B has negative attack, it will heal A so the limit is 0
-                                                        side.enemy.atk = max(
-                                                            side.enemy.atk - atk_wither, 0
-                                                        )
-                                                        # side.enemy.atk -= atk_wither
-                                                        Log(f"(ENEMY) -ATK {atk_wither}")
-                                                    else:
-                                                        Log("Did nothing")
-                                    case Turn.opponent:
-                                        Log("[Phase begin! Enemy Turn!]")
-                                        Log("")
-                                        if not fight_state.opponent_fxd:
-                                            match side.enemy.delusion.type:
-                                                case Delusions.Plant:
-                                                    Log(f"~~~Enemy Plant Ability~~~")
-                                                    fight_state.opponent_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.75:
-                                                        heal_qty = floor(
-                                                            side.enemy.max_hp * 10 / 100
-                                                        )
-                                                        old_hp = side.enemy.hp
-                                                        side.enemy.hp = (
-                                                            x
-                                                            if (x := old_hp + heal_qty)
-                                                            <= side.enemy.max_hp
-                                                            else side.enemy.max_hp
-                                                        )
-                                                        atk_bonus = floor(
-                                                            side.enemy.original_atk * 10 / 100
-                                                        )
-                                                        side.enemy.atk += atk_bonus
-                                                        Log(f"(ENEMY) +HP {side.enemy.hp - old_hp}")
-                                                        Log(f"(ENEMY) +ATK {atk_bonus}")
-                                                    else:
-                                                        Log("Did nothing")
-
-                                                case Delusions.Zap:
-                                                    Log(f"~~~Enemy Zap Ability~~~")
-                                                    fight_state.opponent_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.75:
-                                                        atk_wither = floor(
-                                                            side.old_weapon_atk * 15 / 100
-                                                        )
-
-                                                        inventory.equipped_weapon.atk = max(
-                                                            inventory.equipped_weapon.atk
-                                                            - atk_wither,
-                                                            0,
-                                                        )
-                                                        # inventory.equipped_weapon.atk -= atk_wither
-                                                        Log(f"(YOU) -ATK {atk_wither}")
-                                                    else:
-                                                        Log("Did nothing")
-
-                                        enemy_command = parse_command("attack", fight=True)
-                                        Log(enemy_command.resolve)
-                                        Log("")
-
-                            # End effects
-                            if fight_state.phase == Phase.end:
-                                match fight_state.turn:
-                                    case Turn.player:
-                                        Log("[Phase End! Your Turn!]")
-                                        Log("")
-                                        if not fight_state.player_fxd:
-                                            match inventory.equipped_weapon.delusion.type:
-                                                case Delusions.Freeze:
-                                                    Log("~~~Your Freeze Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.35:
-                                                        hp_wither = floor(
-                                                            side.enemy.max_hp * 5 / 100
-                                                        )
-
-                                                        side.enemy.hp -= hp_wither
-
-                                                        fight_state.phase = Phase.begin
-                                                        fight_state.turn = Turn.player
-                                                        fight_state.player_fxd = False
-                                                        fight_state.opponent_fxd = False
-
-                                                        Log(f"(ENEMY) -HP {hp_wither}")
-                                                        Log(f"Skipped Enemy Turn!")
-                                                        side.toggle_prompt()
-                                                    else:
-                                                        Log("Did nothing")
-                                                case Delusions.Burn:
-                                                    Log("~~~Your Burn Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.5:
-                                                        burn_dmg = floor(
-                                                            inventory.equipped_weapon.atk * 25 / 100
-                                                        )
-
-                                                        side.enemy.hp -= burn_dmg
-
-                                                        Log(f"(ENEMY) -HP {burn_dmg}")
-                                                    else:
-                                                        Log("Did nothing")
-                                                case Delusions.Stun:
-                                                    Log("~~~Your Stun Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.35:
-                                                        fight_state.phase = Phase.begin
-                                                        fight_state.turn = Turn.player
-                                                        fight_state.player_fxd = False
-                                                        fight_state.opponent_fxd = False
-
-                                                        Log(f"Skipped Enemy Turn!")
-                                                        side.toggle_prompt()
-                                                    else:
-                                                        Log("Did nothing")
-                                                case Delusions.Drain:
-                                                    Log("~~~Your Drain Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.75:
-                                                        heal_qty = (
-                                                            inventory.equipped_weapon.atk // 2
-                                                        )
-                                                        old_hp = state.hp.hp
-                                                        state.hp.hp = (
-                                                            x
-                                                            if (x := old_hp + heal_qty)
-                                                            <= state.hp.max_hp
-                                                            else state.hp.max_hp
-                                                        )
-
-                                                        Log(f"(ENEMY) +HP {state.hp.hp - old_hp}")
-                                                    else:
-                                                        Log("Did nothing")
-
-                                                case Delusions.Bleed:
-                                                    Log("~~~Your Bleed Ability~~~")
-                                                    fight_state.player_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.5:
-                                                        hp_wither = floor(
-                                                            side.enemy.max_hp * 10 / 100
-                                                        )
-
-                                                        side.enemy.hp -= hp_wither
-
-                                                        Log(f"(ENEMY) -HP {hp_wither}")
-                                                    else:
-                                                        Log("Did nothing")
-
-                                    case Turn.opponent:
-                                        Log("")
-                                        if not fight_state.opponent_fxd:
-                                            match side.enemy.delusion.type:
-                                                case Delusions.Freeze:
-                                                    Log("~~~Enemy Freeze Ability~~~")
-                                                    fight_state.opponent_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.35:
-                                                        hp_wither = floor(state.hp.max_hp * 5 / 100)
-
-                                                        state.hp.hp -= hp_wither
-
-                                                        fight_state.phase = Phase.begin
-                                                        fight_state.turn = Turn.opponent
-                                                        fight_state.player_fxd = False
-                                                        fight_state.opponent_fxd = False
-
-                                                        Log(f"(YOU) -HP {hp_wither}")
-                                                        Log("Skipped Your Turn!")
-                                                        side.enemy.extra_turn = True
-                                                        side.toggle_prompt()
-                                                    else:
-                                                        side.enemy.extra_turn = False
-                                                        Log("Did nothing")
-                                                case Delusions.Burn:
-                                                    Log("~~~Enemy Burn Ability~~~")
-                                                    fight_state.opponent_fxd = True
-
-                                                    rng = random.random()
-                                                    if rng <= 0.5:
-                                                        burn_dmg = floor(side.enemy.atk * 25 / 100)
-
-                                                        state.hp.hp -= burn_dmg
-
-                                                        Log(f"(YOU) -HP {burn_dmg}")
-                                                    else:
-                                                        Log("Did nothing")
-                                                case Delusions.Stun:
-                                                    Log("~~~Enemy Stun Ability~~~")
-                                                    fight_state.opponent_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.35:
-                                                        fight_state.phase = Phase.begin
-                                                        fight_state.turn = Turn.opponent
-                                                        fight_state.player_fxd = False
-                                                        fight_state.opponent_fxd = False
-
-                                                        Log(f"Skipped Your Turn!")
-                                                        side.enemy.extra_turn = True
-                                                        side.toggle_prompt()
-                                                    else:
-                                                        side.enemy.extra_turn = False
-                                                        Log("Did nothing")
-                                                case Delusions.Drain:
-                                                    Log("~~~Enemy Drain Ability~~~")
-                                                    fight_state.opponent_fxd = True
-                                                    rng = random.random()
-                                                    if rng <= 0.75:
-                                                        heal_qty = side.enemy.atk // 2
-
-                                                        old_hp = side.enemy.hp
-                                                        side.enemy.hp = (
-                                                            x
-                                                            if (x := old_hp + heal_qty)
-                                                            <= side.enemy.max_hp
-                                                            else side.enemy.max_hp
-                                                        )
-
-                                                        Log(f"(ENEMY) +HP {side.enemy.hp - old_hp}")
-                                                    else:
-                                                        Log("Did nothing")
-                                                case Delusions.Bleed:
-                                                    Log("~~~Enemy Bleed Ability~~~")
-                                                    fight_state.opponent_fxd = True
-
-                                                    rng = random.random()
-                                                    if rng <= 0.5:
-                                                        hp_wither = floor(
-                                                            state.hp.max_hp * 10 / 100
-                                                        )
-
-                                                        state.hp.hp -= hp_wither
-
-                                                        Log(f"(YOU) -HP {hp_wither}")
-                                                    else:
-                                                        Log("Did nothing")
-
-                            # Command input
-                            if fight_state.turn == Turn.player:
-                                if not (command.isspace() or command == ""):
-                                    # Dev cheat
-                                    if command == "kill":
-                                        side.enemy.hp = 0
-
-                                    command_result = parse_command(command, fight=True)
-                                    Log(command_result.resolve)
-                                    side.render()
-                            elif fight_state.turn == Turn.opponent and not side.enemy.extra_turn:
-                                enemy_command = parse_command("pass", fight=True)
-                                Log(enemy_command.resolve)
-                                side.render()
+                            fight = side.fight
+                            assert fight
+
+                            match combat.winner(fight):
+                                case Turn.player:
+                                    game = self.get_game()
+                                    assert game
+
+                                    # Remove all enemy tiles blocking the path
+                                    y, x = side.enemy.pos
+
+                                    connected_tiles = [
+                                        (y, x),
+                                        (y + 1, x),
+                                        (y - 1, x),
+                                        (y, x + 1),
+                                        (y, x - 1),
+                                    ]
+
+                                    enemy_tiles = filter(
+                                        lambda pair: game.game_map.get(*pair) == 22,
+                                        connected_tiles,
+                                    )
+
+                                    for tile in enemy_tiles:
+                                        game.remove_tile(*tile)
+
+                                    Log("")
+                                    Log(f"Defeated {side.enemy.name}")
+                                    # Reset state and reward XP
+                                    side.end_fight()
+                                    state.level.xp += 10
+                                    game.render()
+                                    return
+
+                                case Turn.opponent:
+                                    Log("")
+                                    Log("")
+                                    Log("You Lose! [Ctrl-C] to exit")
+                                    self.render()
+                                    # run() stops reading input and sleeps until Ctrl-C
+                                    self.game_over = True
+                                    return
+
+                            # Phase effects, or the whole of the enemy's turn. The command typed
+                            # is only used on the player's turn
+                            players_turn = fight.turn == Turn.player
+                            for event in combat.advance(fight, self.rngs.combat.random):
+                                Log(event)
+
+                            if players_turn and not (command.isspace() or command == ""):
+                                # Dev cheat
+                                if command == "kill":
+                                    fight.enemy.hp = 0
+
+                                command_result = parse_command(command, self.rngs, fight=True)
+                                Log(command_result.resolve)
 
                             # Recurse the function if the enemy is still alive
                             if side.enemy:
+                                side.show_fight()
                                 side.toggle_prompt()
+                            side.render()
                         else:
                             # Guard here so the console logger doesn't log blank lines
                             if not (command.isspace() or command == ""):
-                                command_result = parse_command(command)
+                                command_result = parse_command(command, self.rngs)
                                 Log(command_result.resolve)
 
                                 if command_result.ok:
@@ -542,7 +352,7 @@ class GameWrapper:
 
         player_color: int
         player_char: str
-        match game.game_map[player.map_y][player.map_x].id:
+        match game.game_map.get(player.map_y, player.map_x):
             case 23:  # CHEST
                 player_color = Colors.CHEST
                 player_char = "E"
@@ -556,8 +366,7 @@ class GameWrapper:
                 player_color = Colors.SUPER
                 player_char = "E"
             case 34:  # ATTACK
-                enemy = game.check_enemy(player.map_y, player.map_x)
-                if enemy.enemy:
+                if game.enemy_index.near(player.map_y, player.map_x):
                     player_color = Colors.ENEMY
                     player_char = "E"
                 else:
@@ -568,62 +377,140 @@ class GameWrapper:
                 player_color = Colors.OVERLAY
                 player_char = ""
 
-        self.stdscr.addstr(G.center_y, G.center_x, player_char, player_color)
+        # insstr rather than addstr, which errors when the cursor can't move past the last cell
+        self.overlay.insstr(0, 0, player_char, player_color)
+        self.overlay.noutrefresh()
 
     def render(self) -> None:
         """
-        Calls the render method on all gameobjects
+        Calls the render method on all gameobjects, then draws the composed frame in one go
         """
-        self.stdscr.clear()
-        self.render_border()
-        self.stdscr.refresh()
-        for o in self.__objects:
-            o.render()
-        self.render_player()
-
-    def run(self) -> None:
-        # I'm keeping the try/except commented out because this game is probably error prone
-        # try:
+        if not self.too_small:
+            for o in self.__objects:
+                o.render()
+            self.render_player()
+        self.backend.doupdate()
+
+    def every(self, seconds: float, callback: Callable[[], None]) -> None:
+        """
+        Calls `callback` every `seconds` while the game runs (animations, autosave...) and draws a
+        frame after it. Register before run()
+        """
+        self.timers.append((seconds, callback))
+
+    def on_input(self) -> None:
+        """
+        Called by the event loop when there is input. Handles every key that is waiting, keys
+        repeated faster than frames can be drawn are applied together and shown in one frame
+        """
+        try:
+            while not self.game_over and (key := self.stdscr.getch()) != -1:
+                self.listen(key)
+                self.pending_inputs += 1
+        except Exception as e:
+            # Q raises to quit, ends run() with the exception. Only the first one does, the loop
+            # may call back again before run() unwinds
+            if not self.done.done():
+                self.done.set_exception(e)
+            return
+
+        if self.game_over:
+            asyncio.get_running_loop().remove_reader(sys.stdin.fileno())
+
+        self.frame_requested.set()
+
+    def on_resize(self) -> None:
+        """Called by the event loop on SIGWINCH"""
+        self.resize()
+        self.frame_requested.set()
+
+    async def render_loop(self) -> None:
+        """Draws a frame when something asked for one, at most MAX_FPS times a second"""
         while True:
-            self.listen()
+            await self.frame_requested.wait()
+            self.frame_requested.clear()
+
+            self.frame_inputs.append(self.pending_inputs)
+            self.pending_inputs = 0
             self.render()
 
-        # except:
-        #     pass
+            await asyncio.sleep(1 / MAX_FPS)
 
+    def on_task_done(self, task: asyncio.Task) -> None:
+        """A task that raised ends run() with its exception, instead of the game freezing"""
+        if not task.cancelled() and task.exception() and not self.done.done():
+            self.done.set_exception(task.exception())  # type: ignore
 
-def main(stdscr: curses.window):
+    async def timer(self, seconds: float, callback: Callable[[], None]) -> None:
+        while True:
+            await asyncio.sleep(seconds)
+            callback()
+            self.frame_requested.set()
 
-    # # Memory debugging
-    # import tracemalloc
-    #
-    # tracemalloc.start()
+    async def run(self) -> None:
+        """
+        Input, rendering and timers run as tasks on one event loop. Nothing runs between events,
+        so the game uses no CPU while idle, including on the game over screen
+        """
+        loop = asyncio.get_running_loop()
+        self.done: asyncio.Future[None] = loop.create_future()
+        self.frame_requested = asyncio.Event()
 
-    game = GameWrapper(stdscr)
-    game.initialize()
-    game.add_object(
-        Game(
-            curses.newpad(257 + G.center_y * 2, 257 + G.center_x * 2),
-            parse_image(
-                Image.open(Path(__file__).resolve().parents[1] / "krita" / "explorer_map.png")
-            ),
-        ),
-    )
+        # getch is only called once the event loop saw input, and then drains it without waiting
+        self.stdscr.nodelay(True)
+        loop.add_reader(sys.stdin.fileno(), self.on_input)
+        # Replaces curses' own handler, which would only report the resize on the next getch
+        loop.add_signal_handler(signal.SIGWINCH, self.on_resize)
+
+        tasks = [asyncio.create_task(self.render_loop())]
+        tasks += [asyncio.create_task(self.timer(*t)) for t in self.timers]
+        for task in tasks:
+            task.add_done_callback(self.on_task_done)
 
-    game.add_object(
-        Side(
-            curses.newpad(G.game_height - 1, G.padding_width - 4),
-            stdscr,
-        )
+        try:
+            await self.done
+        finally:
+            loop.remove_reader(sys.stdin.fileno())
+            loop.remove_signal_handler(signal.SIGWINCH)
+            for task in tasks:
+                task.cancel()
+
+
+def setup(backend: Backend, seed: int | None = None, world: Path | None = None) -> GameWrapper:
+    """
+    Builds the game on a backend, ready to run() or to be fed keys with listen(). The same seed
+    and keys play the same session. With `world`, the map is streamed from that chunked world
+    file instead of being parsed from the map image
+    """
+    rngs = Rngs(seed)
+    G.configure(*backend.size())
+
+    game = GameWrapper(backend, rngs)
+    game.initialize()
+    game_map: GameMap = (
+        load_world(world) if world else parse_map(Path(__file__).resolve().parents[1] / MAP_IMAGE)
     )
+    game.add_object(Game(game.game_pad(), game_map, rngs))
+    game.add_object(Side(game.side_pad(), backend.stdscr))
 
     # Give you a free exclusive weapon
-    hard_stick = Weapon("Potato", 10, Delusion(Delusions.Plant), Rarity.Common)
+    hard_stick = Weapon(WeaponTemplate("Potato", 10, Delusion(Delusions.Plant), Rarity.Common))
     inventory.add_weapon(hard_stick)
     inventory.equipped_weapon = hard_stick
 
     game.render()
-    game.run()
+    return game
+
+
+def main(stdscr: curses.window, seed: int | None = None, world: Path | None = None):
+
+    # # Memory debugging
+    # import tracemalloc
+    #
+    # tracemalloc.start()
+
+    game = setup(CursesBackend(stdscr), seed, world)
+    asyncio.run(game.run())
 
     # # Memory debugging
     # curr, peak = tracemalloc.get_traced_memory()
@@ -631,3 +518,9 @@ def main(stdscr: curses.window):
     # tracemalloc.stop()
     # while True:
     #     pass
+
+
+def main_ansi(seed: int | None = None, world: Path | None = None) -> None:
+    """Like main, but draws with escape sequences instead of curses"""
+    with ansi_terminal() as backend:
+        asyncio.run(setup(backend, seed, world).run())
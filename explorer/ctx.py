@@ -1,15 +1,22 @@
 from collections import deque
-from curses import A_BOLD, window
+from curses import A_BOLD
 from enum import Enum, auto
 from getpass import getuser
 from math import floor
+from typing import TYPE_CHECKING
 
 
 from recordclass import RecordClass  # type: ignore
 
 from .globals import Colors
 from .globals import Globals as G
+from .lib.progression import BASE_MAX_HP, MAX_XP, level_for, weapon_atk
 from .lib.singleton import singleton
+from .lib.versioned import versioned
+from .render.base import Surface
+
+if TYPE_CHECKING:
+    from .lib.combat import Fight
 
 
 class Player:
@@ -21,10 +28,9 @@ class Player:
         self.__y = y
         self.__x = x
 
-        self.rel_y = y + G.padding_height
-        self.rel_x = x + G.padding_width
-        self.map_y = y + G.center_y - 1
-        self.map_x = x + G.center_x - 1
+        # Position in the map grid, which is 0 indexed
+        self.map_y = y - 1
+        self.map_x = x - 1
 
     @property
     def y(self) -> int:
@@ -37,20 +43,17 @@ class Player:
     @y.setter
     def y(self, y2) -> None:
         self.__y = y2
-        self.rel_y = y2 + G.padding_height
-        self.map_y = y2 + G.center_y - 1
+        self.map_y = y2 - 1
 
     @x.setter
     def x(self, x2) -> None:
         self.__x = x2
-        self.rel_x = x2 + G.padding_height
-        self.map_x = x2 + G.center_x - 1
+        self.map_x = x2 - 1
 
 
 class Phase(Enum):
     """
-    Battle phases
-    Phase.counter is deprecated
+    Battle phases. Counter effects aren't a phase of a turn, they roll when their owner is attacked
     """
 
     begin = auto()
@@ -150,7 +153,7 @@ class Delusion:
     Mech:       75% chance || Take half damage, increase my weapon ATK by 10%, COUNTER
     Corrupt:    50% chance || Make the enemy attack itself with half damage, COUNTER
     Stun:       35% chance || Skip their turn, END
-    Zap:        50% chance || Weaken their weapon ATK by 15%, BEGIN
+    Zap:        75% chance || Weaken their weapon ATK by 15%, BEGIN
     Drain:      75% chance || Heal me by 50% of what I strike, END
     Bleed:      50% chance || Reduce their HP by 10% of their max HP, END
 
@@ -165,46 +168,31 @@ class Delusion:
     Zap:        Moderate    ~18~21~23~27
     Drain:      Moderate    ~13~18~22~26
     Bleed:      High        ~23~25~27~34
+
+    There's one Delusion per delusion, Delusion(type) returns the shared one. Its colour is filled
+    in by paint_items() once Colors is set up
     """
 
-    __slots__ = ("type", "phase")
-
-    def __init__(self, type: Delusions) -> None:
-        self.type: Delusions = type
-        self.phase: Phase = self.get_phase()
-
-    def get_phase(self) -> Phase:
-        return meta[self.type]["phase"]
-
-    def get_strong(self) -> Delusions:
-        return meta[self.type]["strong"]
-
-    def get_symbol(self) -> str:
-        return meta[self.type]["symbol"]
-
-    def get_color(self):
-        # I was going to do something like this:
-        # return meta[self.type]["color"]
-        # But there's an issue with Recordclass so I have to do it like this:
-        match self.type:
-            case Delusions.Freeze:
-                return Colors.FREEZE
-            case Delusions.Burn:
-                return Colors.BURN
-            case Delusions.Plant:
-                return Colors.PLANT
-            case Delusions.Mech:
-                return Colors.MECH
-            case Delusions.Corrupt:
-                return Colors.CORRUPT
-            case Delusions.Stun:
-                return Colors.STUN
-            case Delusions.Zap:
-                return Colors.ZAP
-            case Delusions.Drain:
-                return Colors.DRAIN
-            case Delusions.Bleed:
-                return Colors.BLEED
+    __slots__ = ("type", "phase", "strong", "symbol", "color")
+
+    type: Delusions
+    phase: Phase
+    strong: Delusions | None
+    symbol: str
+    color: int
+
+    def __new__(cls, type: Delusions) -> "Delusion":
+        if type not in DELUSIONS:
+            delusion = DELUSIONS[type] = super().__new__(cls)
+            delusion.type = type
+            delusion.phase = meta[type]["phase"]
+            delusion.strong = meta[type]["strong"]
+            delusion.symbol = meta[type]["symbol"]
+            delusion.color = 0
+        return DELUSIONS[type]
+
+
+DELUSIONS: dict[Delusions, Delusion] = {}
 
 
 class Rarity(Enum):
@@ -214,46 +202,102 @@ class Rarity(Enum):
     Mythic = auto()
 
 
-class Weapon:
-    def __init__(
-        self, name: str, atk: int, delusion: Delusion, rarity: Rarity, level: int = 1
-    ) -> None:
+# Colour of each rarity, filled in by paint_items()
+RARITY_COLORS: dict[Rarity, int] = {rarity: 0 for rarity in Rarity}
+
+
+def paint_items() -> None:
+    """Looks up the colours of delusions and rarities once Colors is set up, not on every draw"""
+    for type in Delusions:
+        Delusion(type).color = getattr(Colors, type.name.upper())
+    for rarity in Rarity:
+        RARITY_COLORS[rarity] = getattr(Colors, rarity.name.upper())
+
+
+class WeaponTemplate:
+    """
+    What all weapons of a kind share, made once in data/game_items.py. Calling it makes a weapon
+    """
+
+    __slots__ = ("name", "atk", "delusion", "rarity")
+
+    def __init__(self, name: str, atk: int, delusion: Delusion, rarity: Rarity) -> None:
         self.name = name
         self.atk = atk
         self.delusion = delusion
         self.rarity = rarity
+
+    def __call__(self, level: int = 1) -> "Weapon":
+        return Weapon(self, level)
+
+
+@versioned
+class Weapon:
+    """A weapon in the inventory. Only its ATK and level are its own, the rest is the template's"""
+
+    __slots__ = ("template", "atk", "level", "version")
+
+    def __init__(self, template: WeaponTemplate, level: int = 1) -> None:
+        self.version = 0
+        self.template = template
+        self.atk = template.atk
         self.level = level
 
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    @property
+    def delusion(self) -> Delusion:
+        return self.template.delusion
+
+    @property
+    def rarity(self) -> Rarity:
+        return self.template.rarity
+
     def get_rarity_color(self) -> int:
-        match self.rarity:
-            case Rarity.Common:
-                return Colors.COMMON
-            case Rarity.Rare:
-                return Colors.RARE
-            case Rarity.Epic:
-                return Colors.EPIC
-            case Rarity.Mythic:
-                return Colors.MYTHIC
+        return RARITY_COLORS[self.template.rarity]
 
 
-class Healable:
+class HealTemplate:
+    """What all healables of a kind share, made once in data/game_items.py"""
+
+    __slots__ = ("name", "amount", "rarity")
+
     def __init__(self, name: str, amount: int, rarity: Rarity) -> None:
         self.name = name
         self.amount = amount
         self.rarity = rarity
 
+    def __call__(self) -> "Healable":
+        return Healable(self)
+
+
+class Healable:
+    """A healable in the inventory, each one its own object so the inventory can tell them apart"""
+
+    __slots__ = ("template",)
+
+    def __init__(self, template: HealTemplate) -> None:
+        self.template = template
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    @property
+    def amount(self) -> int:
+        return self.template.amount
+
+    @property
+    def rarity(self) -> Rarity:
+        return self.template.rarity
+
     def get_rarity_color(self) -> int:
-        match self.rarity:
-            case Rarity.Common:
-                return Colors.COMMON
-            case Rarity.Rare:
-                return Colors.RARE
-            case Rarity.Epic:
-                return Colors.EPIC
-            case Rarity.Mythic:
-                return Colors.MYTHIC
+        return RARITY_COLORS[self.template.rarity]
 
 
+@versioned
 class Inventory(RecordClass):
     """
     Exported inventory object which keeps track of all inventory state
@@ -264,6 +308,7 @@ class Inventory(RecordClass):
     items: list[str | None]
     _money: int
     equipped_weapon: Weapon | None
+    version: int = 0
 
     def add_weapon(self, weapon: Weapon) -> None:
         # By default, weapons is [None, None, None, None, None]
@@ -272,6 +317,7 @@ class Inventory(RecordClass):
 
         if amount_of_weapons < 5:
             self.weapons[amount_of_weapons] = weapon
+            self.version += 1
             Log(f"Got {weapon.name}!")
             state.check_xp()
             return
@@ -283,13 +329,13 @@ class Inventory(RecordClass):
 
         # All the math is to draw a responsive sized border around the message in the console
         Log(f"┏{'━' * (G.padding_width - 7)}┓")
-        msg = f"┃ Got {weapon.name} [{weapon.delusion.get_symbol()} {weapon.atk} {str(weapon.rarity)[7:8]}]!"
+        msg = f"┃ Got {weapon.name} [{weapon.delusion.symbol} {weapon.atk} {str(weapon.rarity)[7:8]}]!"
         Log(f"{msg}{' ' * (G.padding_width - 6 - len(msg))}┃")
         Log(f"┃ Use `replace <n>` or `discard`!{' ' * (G.padding_width - 39)}┃")
 
         for i, w in enumerate(inventory.weapons):
             if w:
-                msg = f"┃ {i+1}. {w.name} [{w.delusion.get_symbol()} {w.atk} {str(w.rarity)[7:8]}]"
+                msg = f"┃ {i+1}. {w.name} [{w.delusion.symbol} {w.atk} {str(w.rarity)[7:8]}]"
                 Log(f"{msg}{' ' * (G.padding_width - 6 - len(msg))}┃")
 
         Log(f"┗{'━' * (G.padding_width - 7)}┛")
@@ -303,6 +349,7 @@ class Inventory(RecordClass):
 
         if amount_of_heals < 5:
             self.heals[amount_of_heals] = heal
+            self.version += 1
             Log(f"Got {heal.name}!")
             return
 
@@ -325,21 +372,30 @@ class Inventory(RecordClass):
         Log(f"Money {curr} -> {n}")
 
 
-LEVEL_META: dict[int, dict[str, int]] = {
-    1: {"max_xp": 20, "base_max_hp": 50},
+# An equipped weapon's delusion changes the player's HP capacity, for game balance
+HP_MULTIPLIER = {
+    Delusions.Freeze: 1.1,
+    Delusions.Burn: 0.75,
+    Delusions.Plant: 1.5,
+    Delusions.Mech: 1.35,
+    Delusions.Corrupt: 0.8,
+    Delusions.Stun: 1.05,
+    Delusions.Zap: 1.1,
+    Delusions.Drain: 1.0,
+    Delusions.Bleed: 0.9,
+}
+
+
+# Max HP by delusion and level
+MAX_HP = {
+    delusion: [floor(base * multiplier) for base in BASE_MAX_HP]
+    for delusion, multiplier in HP_MULTIPLIER.items()
 }
 
-# The compound scaling is subject to change
-for _ in range(9):
-    LEVEL_META.update(
-        {
-            len(LEVEL_META)
-            + 1: {
-                "max_xp": int(round(LEVEL_META[len(LEVEL_META)]["max_xp"] * 1.8, -1)),
-                "base_max_hp": int(round(LEVEL_META[len(LEVEL_META)]["base_max_hp"] * 1.5, -1)),
-            }
-        }
-    )
+
+def max_hp(level: int, delusion: Delusions) -> int:
+    """The player's max HP at `level` with a weapon of `delusion` equipped"""
+    return MAX_HP[delusion][level]
 
 
 class State(RecordClass):
@@ -347,122 +403,63 @@ class State(RecordClass):
     General game state
     """
 
+    @versioned
     class LevelData(RecordClass):
         level: int
         xp: int
         max_xp: int
+        version: int = 0
 
+    @versioned
     class HpData(RecordClass):
         hp: int
         max_hp: int
+        version: int = 0
+
+    level = LevelData(level=1, xp=0, max_xp=MAX_XP[1])
+    hp = HpData(hp=BASE_MAX_HP[1], max_hp=BASE_MAX_HP[1])
 
-    level = LevelData(level=1, xp=0, max_xp=LEVEL_META[1]["max_xp"])
-    hp = HpData(hp=LEVEL_META[1]["base_max_hp"], max_hp=LEVEL_META[1]["base_max_hp"])
+    @property
+    def version(self) -> int:
+        return self.level.version + self.hp.version
 
     def add_xp(self, xp: int) -> None:
         self.level.xp += xp
         self.check_xp()
 
     def check_xp(self) -> None:
-        """Recursive function that updates hp, xp, weapon atk based on player level"""
+        """Levels up for the XP gained, the weapons level up with the player"""
+        level = max(self.level.level, level_for(self.level.xp))
+        if level != self.level.level:
+            self.level.level = level
+            self.level.max_xp = MAX_XP[level]
 
-        for weapon in inventory.weapons:
+            self.hp.hp = BASE_MAX_HP[level]
+            self.hp.max_hp = BASE_MAX_HP[level]
+
+        for weapon in (*inventory.weapons, Side().temp_weapon):  # type: ignore
             if weapon:
-                if weapon.level > self.level.level:
+                if weapon.level > level:
                     raise Exception("Weapon level and player level are out of sync!")
 
-                while weapon.level < self.level.level:
-                    weapon.atk = floor(weapon.atk * 1.5)
-                    weapon.level += 1
-
-        temp_weapon = Side().temp_weapon  # type: ignore
-        if temp_weapon:
-            if temp_weapon.level > self.level.level:
-                raise Exception("Temp Weapon level and player level are out of sync!")
-
-            while temp_weapon.level < self.level.level:
-                temp_weapon.atk = floor(temp_weapon.atk * 1.5)
-                temp_weapon.level += 1
-
-        if self.level.level == 10:
-            return
-
-        if self.level.xp < self.level.max_xp:
-            return
-
-        self.level.level += 1
-        self.level.max_xp = LEVEL_META[self.level.level]["max_xp"]
-
-        self.hp.hp = LEVEL_META[self.level.level]["base_max_hp"]
-        self.hp.max_hp = LEVEL_META[self.level.level]["base_max_hp"]
-
-        # for weapon in inventory.weapons:
-        #     if weapon:
-        #         if weapon.level > self.level.level:
-        #             raise Exception("Weapon level and player level are out of sync!")
-        #
-        #         while weapon.level < self.level.level:
-        #             weapon.atk = floor(weapon.atk * 1.5)
-        #             weapon.level += 1
-        #
-        # temp_weapon = Side().temp_weapon  # type: ignore
-        # if temp_weapon:
-        #     if temp_weapon.level > self.level.level:
-        #         raise Exception("Temp Weapon level and player level are out of sync!")
-        #
-        #     while temp_weapon.level < self.level.level:
-        #         temp_weapon.atk = floor(temp_weapon.atk * 1.5)
-        #         temp_weapon.level += 1
-
-        self.check_xp()
+                if weapon.level < level:
+                    weapon.atk = weapon_atk(weapon.atk, level - weapon.level)
+                    weapon.level = level
 
     def update_max_hp(self) -> None:
         # An equipped weapon's delusion will change the player's hp capacity for game balance
         if inventory.equipped_weapon is None:
             return
 
-        match inventory.equipped_weapon.delusion.type:
-            case Delusions.Freeze:
-                hp_multiplier = 1.1
-            case Delusions.Burn:
-                hp_multiplier = 0.75
-            case Delusions.Plant:
-                hp_multiplier = 1.5
-            case Delusions.Mech:
-                hp_multiplier = 1.35
-            case Delusions.Corrupt:
-                hp_multiplier = 0.8
-            case Delusions.Stun:
-                hp_multiplier = 1.05
-            case Delusions.Zap:
-                hp_multiplier = 1.1
-            case Delusions.Drain:
-                hp_multiplier = 1.0
-            case Delusions.Bleed:
-                hp_multiplier = 0.9
-
-        if state.hp.hp == state.hp.max_hp:
-            state.hp.max_hp = floor(
-                round(LEVEL_META[self.level.level]["base_max_hp"]) * hp_multiplier
-            )
+        # Full HP stays full
+        full = state.hp.hp == state.hp.max_hp
+        state.hp.max_hp = max_hp(self.level.level, inventory.equipped_weapon.delusion.type)
+        if full:
             state.hp.hp = state.hp.max_hp
-        else:
-            state.hp.max_hp = floor(
-                round(LEVEL_META[self.level.level]["base_max_hp"]) * hp_multiplier
-            )
-
-
-class FightState:
-    def __init__(self) -> None:
-        self.turn: Turn = Turn.null
-        self.phase: Phase = Phase.null
-        self.player_fxd: bool = False
-        self.opponent_fxd: bool = False
 
 
 player = Player(176, 61)
 state = State()
-fight_state = FightState()
 inventory = Inventory(
     weapons=[None] * 5,
     heals=[None] * 5,
@@ -482,14 +479,14 @@ class SideState(Enum):
 
 
 @singleton
+@versioned
 class Side:
     """
     Singleton object used for keeping track of the UI on the side pad, and some temporary state
     """
 
-    def __init__(self, pad: window, stdscr: window) -> None:
-        self.pad = pad
-        self.pad.bkgd(" ", Colors.WALL)
+    def __init__(self, pad: Surface, stdscr: Surface) -> None:
+        self.version = 0
 
         self.text: str = ""
         self.state: SideState = SideState.default
@@ -499,29 +496,58 @@ class Side:
         self.log_buffer: deque[str] = deque()
         self.prompt_buffer: str = ""
 
-        self.max_log_length: int = G.game_height - 2 - 7 - 8
-        self.max_prompt_length: int = G.padding_width - 4 - 18
-
         self.stdscr = stdscr
 
         # Replacement weapon state
         self.temp_weapon: Weapon | None = None
 
-        # Temporary fight state
+        # Temporary fight state, the rules play out on `fight`, see lib/combat.py
         self.enemy = None
-        self.old_weapon_atk: int = 0
+        self.fight: Fight | None = None
+
+        # Doesn't change while the game runs
+        self._user = getuser()
+
+        # What the pad and the derived stats were last computed from, see render and update_stats
+        self._drawn: tuple | None = None
+        self._drawn_position: tuple[int, int] | None = None
+        self._position_row = 0
+        self._xp_key: tuple | None = None
+        self._hp_key: tuple | None = None
+
+        self.resize(pad)
+
+    def resize(self, pad: Surface) -> None:
+        """
+        Takes a new pad, at startup and after the screen was resized, and fits everything sized
+        after the screen to it
+        """
+        self.pad = pad
+        self.pad.bkgd(" ", Colors.WALL)
+
+        self.max_log_length: int = G.game_height - 2 - 7 - 8
+        self.max_prompt_length: int = G.padding_width - 4 - 18
+        while len(self.log_buffer) > self.max_log_length:
+            self.log_buffer.popleft()
+        self.prompt_buffer = self.prompt_buffer[: self.max_prompt_length]
+
+        user = self._user
+        self.name = (
+            user if len(user) <= G.padding_width - 4 else user[: G.padding_width - 7] + "..."
+        )
+
+        # Nothing is on the new pad yet
+        self._drawn = None
 
     def draw_stats(self) -> None:
         """
         Draws the UI for the main side page
         """
         draw = self.pad.addstr
-        user = getuser()
-        name = user if len(user) <= G.padding_width - 4 else user[: G.padding_width - 7] + "..."
 
-        self.pad.clear()
+        self.pad.erase()
 
-        draw(f"{name}\n\n", A_BOLD)
+        draw(f"{self.name}\n\n", A_BOLD)
 
         draw("LEVEL: ", A_BOLD)
         draw(f"{state.level.level} ({state.level.xp} / {state.level.max_xp} XP)\n")
@@ -543,11 +569,25 @@ class Side:
         draw(f"{current_weapon.name if current_weapon else 'NA'}\n")
         draw("DELUSION: ", A_BOLD)
         draw(
-            f"{str(current_weapon.delusion.type)[10:] + ' ' + current_weapon.delusion.get_symbol() if current_weapon else 'NA'}\n",
-            current_weapon.delusion.get_color() if current_weapon else 0,
+            f"{str(current_weapon.delusion.type)[10:] + ' ' + current_weapon.delusion.symbol if current_weapon else 'NA'}\n",
+            current_weapon.delusion.color if current_weapon else 0,
         )
 
-        draw(f"\n\nPlayer Y: ", A_BOLD)
+        draw("\n\n")
+        self._position_row = self.pad.getyx()[0]
+        self.draw_position()
+
+    def draw_position(self) -> None:
+        """
+        Draws the player position at the bottom of the main side page, on its own since it's the
+        only thing there that changes while walking around
+        """
+        draw = self.pad.addstr
+
+        self.pad.move(self._position_row, 0)
+        self.pad.clrtobot()
+
+        draw(f"Player Y: ", A_BOLD)
         draw(f"{player.y}")
         draw(f"\nPlayer X: ", A_BOLD)
         draw(f"{player.x}")
@@ -571,7 +611,7 @@ class Side:
 
         draw(f"{weapon.name} ", weapon.get_rarity_color())
         draw("[")
-        draw(f"{weapon.delusion.get_symbol()} ", weapon.delusion.get_color())
+        draw(f"{weapon.delusion.symbol} ", weapon.delusion.color)
         draw(f"{weapon.atk}]\n")
 
     def draw_heal(self, heal: Healable | None) -> None:
@@ -596,7 +636,7 @@ class Side:
         """
         draw = self.pad.addstr
 
-        self.pad.clear()
+        self.pad.erase()
 
         draw("~~~INVENTORY~~~\n\n")
 
@@ -627,8 +667,8 @@ class Side:
         draw(f"{current_weapon.atk if current_weapon else 'NA'}")
         draw(" / ")
         draw(
-            f"{str(current_weapon.delusion.type)[10:] + ' ' + current_weapon.delusion.get_symbol() if current_weapon else 'NA'}\n",
-            current_weapon.delusion.get_color() if current_weapon else 0,
+            f"{str(current_weapon.delusion.type)[10:] + ' ' + current_weapon.delusion.symbol if current_weapon else 'NA'}\n",
+            current_weapon.delusion.color if current_weapon else 0,
         )
         draw(f"\n{'ENEMY NAME' if not self.enemy else self.enemy.name }━━━━━━\n")
         draw("HP: ", A_BOLD)
@@ -652,8 +692,8 @@ class Side:
         draw(f"{'ATK' if not self.enemy else self.enemy.atk}")
         draw(" / ")
         draw(
-            f"{'DEL' if not self.enemy else str(self.enemy.delusion.type)[10:] + ' ' + self.enemy.delusion.get_symbol()}\n\n",
-            self.enemy.delusion.get_color() if self.enemy else 0,
+            f"{'DEL' if not self.enemy else str(self.enemy.delusion.type)[10:] + ' ' + self.enemy.delusion.symbol}\n\n",
+            self.enemy.delusion.color if self.enemy else 0,
         )
         draw("~~~~~~\n")
 
@@ -663,7 +703,7 @@ class Side:
         """
         draw = self.pad.addstr
 
-        self.pad.clear()
+        self.pad.erase()
 
         if not prompt:
             draw("~~~CONSOLE/LOG~~~\n\n")
@@ -698,6 +738,7 @@ class Side:
             self.log_buffer.popleft()
 
         self.log_buffer.append(t)
+        self.version += 1
 
     def toggle_inventory(self) -> None:
         self.state = SideState.inventory if self.state != SideState.inventory else SideState.default
@@ -705,25 +746,75 @@ class Side:
     def toggle_console(self) -> None:
         self.state = SideState.console if self.state != SideState.console else SideState.default
 
+    def show_fight(self) -> None:
+        """Copies the numbers of the fight to the player, weapon and enemy the pad draws"""
+        fight = self.fight
+        assert fight and self.enemy and inventory.equipped_weapon
+        state.hp.hp = fight.player.hp
+        inventory.equipped_weapon.atk = fight.player.atk
+        self.enemy.hp = fight.enemy.hp
+        self.enemy.atk = fight.enemy.atk
+
+    def end_fight(self) -> None:
+        """Forgets the enemy, the weapon gets back the ATK it had before the fight"""
+        fight = self.fight
+        assert fight and inventory.equipped_weapon
+        self.show_fight()
+        inventory.equipped_weapon.atk = fight.player.base_atk
+        self.enemy = None
+        self.fight = None
+
     def toggle_prompt(self) -> None:
         # Can only toggle the prompt whne in console mode
         self.state = SideState.prompt
 
+    def update_stats(self) -> None:
+        """
+        Levels up and recomputes max HP, only when the XP, level or weapons they depend on changed
+        """
+        if (state.level.version, inventory.version, self.temp_weapon) != self._xp_key:
+            state.check_xp()
+            self._xp_key = (state.level.version, inventory.version, self.temp_weapon)
+
+        if (state.level.level, inventory.equipped_weapon) != self._hp_key:
+            state.update_max_hp()
+            self._hp_key = (state.level.level, inventory.equipped_weapon)
+
+    def view_version(self) -> tuple:
+        """Changes whenever something shown on the side pad may have changed"""
+        return (
+            self.version,
+            state.version,
+            inventory.version,
+            tuple(w.version for w in inventory.weapons if w),
+            self.enemy.version if self.enemy else 0,
+        )
+
     def render(self) -> None:
-        state.check_xp()
-        state.update_max_hp()
-
-        match self.state:
-            case SideState.default:
-                self.draw_stats()
-            case SideState.inventory:
-                self.draw_inventory()
-            case SideState.console:
-                self.draw_console(prompt=False)
-            case SideState.prompt:
-                self.draw_console(prompt=True)
-
-        self.pad.refresh(
+        self.update_stats()
+
+        version = self.view_version()
+        if version != self._drawn:
+            self._drawn = version
+
+            match self.state:
+                case SideState.default:
+                    self.draw_stats()
+                case SideState.inventory:
+                    self.draw_inventory()
+                case SideState.console:
+                    self.draw_console(prompt=False)
+                case SideState.prompt:
+                    self.draw_console(prompt=True)
+        elif self.state == SideState.default and self._drawn_position != (player.y, player.x):
+            self.draw_position()
+        else:
+            # Nothing changed, the pad is still on the screen as it was
+            return
+
+        self._drawn_position = (player.y, player.x)
+
+        self.pad.noutrefresh(
             0,
             0,
             G.padding_height + 1,
@@ -0,0 +1,50 @@
+"""
+What chests and pickups drop. Items are ("weapon", rarity, key) into Weapons or ("heal", key) into
+Heals, each table gives one of them with odds proportional to the weights. Change the odds here
+"""
+from ..ctx import Healable, Rarity, Weapon
+from ..lib.loot import Loot
+from .game_items import Heals, Weapons
+
+Item = tuple
+
+# 60% bandage, 25% health pot, 12% med kit, 3% blessing
+HEALS: dict[Item, float] = {("heal", 1): 60, ("heal", 2): 25, ("heal", 3): 12, ("heal", 4): 3}
+
+
+def weapons(rarities: dict[Rarity, float], keys=range(1, 10)) -> dict[Item, float]:
+    """The weapons of each rarity, equally likely within a rarity"""
+    return {("weapon", rarity, key): weight for rarity, weight in rarities.items() for key in keys}
+
+
+def fixed(item: Item) -> dict[Item, float]:
+    return {item: 1}
+
+
+# Chests with loot of their own, by (y, x) of the player opening them
+CHESTS: dict[tuple[int, int], Loot] = {
+    # Beginner chest, west of spawn
+    (176, 49): Loot(weapons({Rarity.Common: 1}, range(1, 4)), fixed(("heal", 1))),
+    # Unguarded, south west of spawn
+    (185, 43): Loot(
+        weapons({Rarity.Common: 1, Rarity.Rare: 1}), fixed(("heal", 1)), fixed(("heal", 2))
+    ),
+}
+
+# All other chests
+CHEST = Loot(weapons({Rarity.Common: 3, Rarity.Rare: 2, Rarity.Epic: 1}), HEALS)
+
+# Pickups by tile id
+TILES: dict[int, Loot] = {
+    26: Loot(HEALS),  # HEAL
+    27: Loot(weapons({Rarity.Mythic: 1})),  # MYTHIC
+}
+
+
+def make(item: Item) -> Weapon | Healable:
+    match item:
+        case ("weapon", rarity, key):
+            return Weapons[rarity][key]()
+        case ("heal", key):
+            return Heals[key]()
+    raise ValueError(f"unknown loot {item!r}")
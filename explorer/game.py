@@ -1,27 +1,29 @@
-import random
-from curses import window
-from math import floor
-
 from .ctx import (
     Delusion,
-    Healable,
-    Phase,
-    Rarity,
     Side,
-    Turn,
     Weapon,
     inventory,
     player,
     state,
-    fight_state,
     Log,
 )
-from .data.game_items import Enemies, Heals, Weapons
-from .globals import Colors
+from .data.game_items import Enemies
+from .data.loot import CHEST, CHESTS, TILES, make
 from .globals import Globals as G
-from .lib.parser import Tile
-
-
+from .lib.combat import Fight, Fighter
+from .lib.enemies import EnemyIndex
+from .lib.loot import Loot
+from .lib.parser import Tile, TileCatalog
+from .lib.passability import Passability
+from .lib.progression import enemy_stats
+from .lib.rng import Rngs
+from .lib.runs import EncodedRow, RowEncoder, Runs
+from .lib.tilemap import GameMap
+from .lib.versioned import versioned
+from .render.base import Surface
+
+
+@versioned
 class EnemyResult:
     # Enemy object
     def __init__(
@@ -33,6 +35,7 @@ class EnemyResult:
         delusion: Delusion | None = None,
         name: str | None = None,
     ) -> None:
+        self.version = 0
         self.enemy = enemy
         self.pos = pos
         self.max_hp = hp
@@ -41,14 +44,11 @@ class EnemyResult:
         self.atk = atk
         self.delusion = delusion
         self.name = name
-        self.extra_turn = False
 
-        if state.level.level > 1:
-            if self.atk and self.original_atk and self.hp and self.max_hp:
-                self.original_atk = floor(self.atk * 1.3**state.level.level)
-                self.atk = self.original_atk
-                self.max_hp = floor(self.hp * 1.5**state.level.level)
-                self.hp = self.max_hp
+        if self.atk and self.hp:
+            self.max_hp, self.original_atk = enemy_stats(self.hp, self.atk, state.level.level)
+            self.hp = self.max_hp
+            self.atk = self.original_atk
 
 
 # GameObject
@@ -56,223 +56,279 @@ class Game:
     """The naming might be confused with GameWrapper in ./app.py , but this is actually the rendered game"""
 
     def __init__(
-        self, pad: window, game_map: list[list[Tile]], y_offset: int = 0, x_offset: int = 0
+        self,
+        pad: Surface,
+        game_map: GameMap,
+        rngs: Rngs | None = None,
+        y_offset: int | None = None,
+        x_offset: int | None = None,
     ) -> None:
         self.pad = pad
 
         self.game_map = game_map
-        self.y_offset = y_offset or player.rel_y
-        self.x_offset = x_offset or player.rel_x
+        # Unseeded streams of its own when the game isn't part of a session set up by app.setup()
+        self.rngs = Rngs() if rngs is None else rngs
+        # Map coordinates of the top left corner of the viewport. These go negative near the map
+        # edges, where everything outside the map is drawn as VOID
+        self.y_offset = player.map_y - G.view_y if y_offset is None else y_offset
+        self.x_offset = player.map_x - G.view_x if x_offset is None else x_offset
 
         self.enemy: EnemyResult | None = None
+        self.enemy_index = EnemyIndex(game_map, Enemies)
+
+        catalog = TileCatalog()  # type: ignore
+        self.chars = catalog.chars
+        self.colors = catalog.colors
+        self.passability = Passability(game_map, catalog.barriers)
+        self.encoder = RowEncoder(self.chars, self.colors)
+
+        # Encoded map rows by map y, each a stretch of the row wider than the viewport so that
+        # moving sideways keeps using it. A row is dropped as soon as one of its cells changes
+        self.row_cache: dict[int, EncodedRow] = {}
+
+        # The pad only holds the viewport, the map is composed into it one row or column at a time
+        # as the camera moves, so its size never depends on the size of the map. scroll() shifts
+        # rows, the spare last row and column keep curses from erroring on the bottom right cell
+        self.pad.scrollok(True)
+
+        # Map cells changed since the last render. Only these get rewritten to the pad, a full
+        # redraw is only needed when the pad itself is (re)created
+        self.dirty: set[tuple[int, int]] = set()
 
         self.redraw()
 
         self.render()
 
+    def encoded_row(self, y: int) -> Runs:
+        """Visible part of map row y as colour runs"""
+        left, right = self.x_offset, self.x_offset + G.view_width
+        row = self.row_cache.get(y)
+        if row is None or not row.covers(left, right):
+            self.encode_rows([y])
+            row = self.row_cache[y]
+        return row.window(left, right)
+
+    def stale_rows(self) -> list[int]:
+        """Map rows in view without cached runs covering the viewport"""
+        left, right = self.x_offset, self.x_offset + G.view_width
+        cache = self.row_cache
+        ys = range(self.y_offset, self.y_offset + G.view_height)
+        return [y for y in ys if y not in cache or not cache[y].covers(left, right)]
+
+    def encode_rows(self, ys: list[int]) -> None:
+        """Caches map rows ys around the viewport, encoded together in one batch"""
+        left, right = self.x_offset, self.x_offset + G.view_width
+        if len(self.row_cache) + len(ys) > 4 * G.view_height:
+            top = self.y_offset
+            self.row_cache = {
+                y: row for y, row in self.row_cache.items() if top <= y < top + G.view_height
+            }
+
+        # A viewport width more on both sides, but not past the map edges unless the viewport is,
+        # cells out there are all VOID
+        lo = max(left - G.view_width, min(left, 0))
+        hi = min(right + G.view_width, max(right, self.game_map.width))
+        rows = self.encoder.encode_rows([self.game_map.span(y, lo, hi) for y in ys])
+        for y, runs in zip(ys, rows):
+            self.row_cache[y] = EncodedRow(lo, runs)
+
+    def draw_row(self, row: int) -> None:
+        """Composes one viewport row from the map, one addstr per colour run"""
+        self.pad.move(row, 0)
+        for text, attr in self.encoded_row(self.y_offset + row):
+            self.pad.addstr(text, attr)
+
+    def draw_column(self, col: int) -> None:
+        chars, colors = self.chars, self.colors
+        x = self.x_offset + col
+        for row in range(G.view_height):
+            id = self.game_map.get(self.y_offset + row, x)
+            self.pad.addch(row, col, chars[id], colors[id])
+
+    def resize(self, pad: Surface) -> None:
+        """
+        Moves to a new pad after the screen was resized, with the viewport centred on the player
+        again. The map and everything derived from it stay as they are
+        """
+        self.pad = pad
+        self.pad.scrollok(True)
+        self.y_offset = player.map_y - G.view_y
+        self.x_offset = player.map_x - G.view_x
+        self.redraw()
+
     def redraw(self) -> None:
-        self.pad.clear()
-        for row in self.game_map:
-            for col in row:
-                self.pad.addch(col.char, col.color)
-            self.pad.addch("\n")
+        stale = self.stale_rows()
+        if stale:
+            self.encode_rows(stale)
+
+        self.pad.erase()
+        for row in range(G.view_height):
+            self.draw_row(row)
+        self.dirty.clear()
+
+    def scroll(self, dy: int, dx: int) -> None:
+        """Shifts the viewport after the camera moved by one cell and draws what came into view"""
+        if dy:
+            self.pad.scroll(dy)
+            self.draw_row(G.view_height - 1 if dy > 0 else 0)
+
+        if dx > 0:
+            for row in range(G.view_height):
+                self.pad.delch(row, 0)
+            self.draw_column(G.view_width - 1)
+        elif dx < 0:
+            chars, colors = self.chars, self.colors
+            for row in range(G.view_height):
+                id = self.game_map.get(self.y_offset + row, self.x_offset)
+                self.pad.insstr(row, 0, chars[id], colors[id])
+
+    def mark_dirty(self, y: int, x: int) -> None:
+        self.dirty.add((y, x))
+        self.row_cache.pop(y, None)
+
+    def flush(self) -> None:
+        """Writes the cells changed since the last render to the pad"""
+        if not self.dirty:
+            return
+
+        chars, colors = self.chars, self.colors
+        for y, x in self.dirty:
+            row, col = y - self.y_offset, x - self.x_offset
+            # Cells outside of the viewport are composed from the map once they scroll into view
+            if 0 <= row < G.view_height and 0 <= col < G.view_width:
+                id = self.game_map.get(y, x)
+                self.pad.addch(row, col, chars[id], colors[id])
+        self.dirty.clear()
 
     def render(self) -> None:
-        self.pad.refresh(
-            self.y_offset,
-            self.x_offset,
+        self.flush()
+        self.pad.noutrefresh(
+            0,
+            0,
             G.padding_height + 1,
             G.padding_width + 1,
-            G.padding_height + G.game_height - 2,
-            G.padding_width + G.game_width - 2,
+            G.padding_height + G.view_height,
+            G.padding_width + G.view_width,
         )
 
     def is_block(self, y, x) -> bool:
         """
-        Check if a specific tile cannot be passed
+        Check if a specific tile cannot be passed (walls, enemies, locks, trees, outside the map)
         """
-
-        match self.game_map[y][x].id:
-            # Walls, enemies, locks
-            case t if t in list(range(21)) + [22, 32]:
-                return True
-            case _:
-                return False
+        return self.passability.blocked(y, x)
 
     def check_enemy(self, y, x) -> EnemyResult:
         """
-        Check if there is an enemy adjacent to a specific tile
+        Check if there is an enemy adjacent to a specific tile. Returns a new EnemyResult with full
+        HP every time, use enemy_index.near to only check whether there is one
         """
-
-        up = self.game_map[y - 1][x]
-        down = self.game_map[y + 1][x]
-        left = self.game_map[y][x - 1]
-        right = self.game_map[y][x + 1]
-
-        tiles = [up, down, left, right]
-        ids = [up.id, down.id, left.id, right.id]
-
-        try:
-            enemy_idx = ids.index(22)
-        except ValueError:
+        found = self.enemy_index.near(y, x)
+        if found is None:
             return EnemyResult()
 
-        enemy = tiles[enemy_idx]
-
-        # Normal coordinate of the enemy tile
-        ny = nx = 0
-        if enemy == up:
-            ny, nx = player.y - 1, player.x
-        if enemy == down:
-            ny, nx = player.y + 1, player.x
-        if enemy == right:
-            ny, nx = player.y, player.x + 1
-        if enemy == left:
-            ny, nx = player.y, player.x - 1
-
-        # Map coordinates of the enemy tile
-        y = [self.game_map.index(r) for r in self.game_map if enemy in r][0]
-        x = [r.index(enemy) for r in self.game_map if enemy in r][0]
-
-        # enemy_data = Enemies[(player.y, player.x)]
-        enemy_data = Enemies[(ny, nx)]
+        (ey, ex), enemy_data = found
         atk, hp, delusion, name = enemy_data.values()
 
-        return EnemyResult(enemy, (y, x), atk, hp, delusion, name)
+        return EnemyResult(self.game_map.tile(ey, ex), (ey, ex), atk, hp, delusion, name)
+
+    def set_tile(self, y, x, id: int) -> None:
+        """Changes a map cell and everything derived from it"""
+        self.game_map.set(y, x, id)
+        self.passability.update(y, x, id)
+        self.enemy_index.remove(y, x)
+        self.mark_dirty(y, x)
 
     def remove_tile(self, y, x) -> None:
-        self.game_map[y][x] = Tile(".", False, Colors.PATH, 21, "PATH")
-        self.redraw()
+        self.set_tile(y, x, 21)
 
     def handle_chest(self, y, x) -> None:
         self.remove_tile(y, x)
         state.add_xp(10)
 
-    @staticmethod
-    def random_heal() -> Healable:
-        """
-        Returns a random healable
-        """
-        rng = random.random()
-        # Chance for bandage: 60%
-        # Chance for health pot: 25%
-        # Chance for med kit: 12%
-        # Chance for blessing: 3%
-        if rng < 0.03:
-            return Heals[4]()
-        elif rng < 0.15:
-            return Heals[3]()
-        elif rng < 0.40:
-            return Heals[2]()
-        else:
-            return Heals[1]()
+    def give(self, loot: Loot) -> None:
+        """Rolls the loot and puts it in the inventory"""
+        for item in map(make, loot.roll(self.rngs.loot)):
+            if isinstance(item, Weapon):
+                inventory.add_weapon(item)
+            else:
+                inventory.add_heal(item)
 
     def interact_tile(self) -> None:
         """
         Handles game interactions when the E key is pressed
         """
         y, x = player.map_y, player.map_x
-        match self.game_map[y][x].id:
+        match self.game_map.get(y, x):
             case 23:  # CHEST
-                # Big ass match clause for all the chests
-                match (player.y, player.x):
-                    case (176, 49):
-                        # Beginner chest, west of spawn
-                        self.handle_chest(y, x)
-                        idx = random.randint(1, 3)
-                        rand_weapon = Weapons[Rarity.Common][idx]()
-                        rand_heal = Heals[1]()
-                        inventory.add_weapon(rand_weapon)
-                        inventory.add_heal(rand_heal)
-                    case (185, 43):
-                        # Some other chest that's unguarded south west of spawn
-                        self.handle_chest(y, x)
-                        rarity = (Rarity.Common, Rarity.Rare)[random.randint(1, 2) == 1]
-                        idx = random.randint(1, 9)
-                        rand_weapon = Weapons[rarity][idx]()
-                        rand_heal = Heals[1]()
-                        rand_heal2 = Heals[2]()
-                        inventory.add_weapon(rand_weapon)
-                        inventory.add_heal(rand_heal)
-                        inventory.add_heal(rand_heal2)
-                    case _:
-                        # All other chests
-                        self.handle_chest(y, x)
-                        rng = random.randint(1, 6)
-                        rarity = (
-                            Rarity.Common
-                            if rng == 1 or rng == 2 or rng == 3
-                            else Rarity.Rare
-                            if rng == 4 or rng == 5
-                            else Rarity.Epic
-                        )
-                        idx = random.randint(1, 9)
-                        rand_weapon = Weapons[rarity][idx]()
-                        rand_heal = self.random_heal()
-                        inventory.add_weapon(rand_weapon)
-                        inventory.add_heal(rand_heal)
+                self.handle_chest(y, x)
+                self.give(CHESTS.get((player.y, player.x), CHEST))
             case 24:  # MONEY
                 self.remove_tile(y, x)
                 inventory.money += 5
-            case 26:  # HEAL
-                self.remove_tile(y, x)
-                inventory.add_heal(self.random_heal())
-            case 27:  # MYTHIC
+            case 26 | 27 as tile:  # HEAL, MYTHIC
                 self.remove_tile(y, x)
-                idx = random.randint(1, 9)
-                rand_weapon = Weapons[Rarity.Mythic][idx]()
-                inventory.add_weapon(rand_weapon)
+                self.give(TILES[tile])
             case 34:  # FIGHT
-                if self.game_map[player.map_y][player.map_x].id != 34:
+                if self.game_map.get(player.map_y, player.map_x) != 34:
                     return
 
                 enemy = self.check_enemy(player.map_y, player.map_x)
                 if not enemy.enemy:
                     return
 
-                assert inventory.equipped_weapon
-                Side().old_weapon_atk = inventory.equipped_weapon.atk  # type: ignore
+                weapon = inventory.equipped_weapon
+                assert weapon and enemy.delusion
 
-                Side().enemy = enemy  # type: ignore
-                fight_state.turn = Turn.player
-                fight_state.phase = Phase.begin
-                fight_state.player_fxd = False
-                fight_state.opponent_fxd = False
+                side = Side()  # type: ignore
+                side.enemy = enemy
+                side.fight = Fight(
+                    Fighter(
+                        state.hp.hp, state.hp.max_hp, weapon.atk, weapon.atk, weapon.delusion.type
+                    ),
+                    Fighter(
+                        enemy.hp, enemy.max_hp, enemy.atk, enemy.original_atk, enemy.delusion.type
+                    ),
+                )
 
                 Log("━━━━━━━━━━━━━━━━━━━━━━━")
                 Log("FIGHT! Return to begin!")
                 Log("━━━━━━━━━━━━━━━━━━━━━━━")
-                Side().toggle_prompt()  # type: ignore
+                side.toggle_prompt()
 
             case _:
                 pass
 
+    def on_move(self, dy: int, dx: int) -> None:
+        """Scrolls the viewport and lets streamed maps load what is coming into view"""
+        self.scroll(dy, dx)
+        self.game_map.prefetch(self.y_offset, self.x_offset, G.view_height, G.view_width, dy, dx)
+
     # All these displacement functions shift the rendered map around the player, giving the illusion that the
     # player is moving around the map
     def displace_up(self) -> None:
-        if self.y_offset - 1 > G.padding_height and not self.is_block(
-            player.map_y - 1, player.map_x
-        ):
+        if player.map_y > 0 and not self.is_block(player.map_y - 1, player.map_x):
             self.y_offset -= 1
             player.y -= 1
+            self.on_move(-1, 0)
 
     def displace_down(self) -> None:
-        if self.y_offset < 256 + G.padding_height and not self.is_block(
+        if player.map_y < self.game_map.height - 1 and not self.is_block(
             player.map_y + 1, player.map_x
         ):
             self.y_offset += 1
             player.y += 1
+            self.on_move(1, 0)
 
     def displace_left(self) -> None:
-        if self.x_offset - 1 > G.padding_width and not self.is_block(
-            player.map_y, player.map_x - 1
-        ):
+        if player.map_x > 0 and not self.is_block(player.map_y, player.map_x - 1):
             self.x_offset -= 1
             player.x -= 1
+            self.on_move(0, -1)
 
     def displace_right(self) -> None:
-        if self.x_offset < 256 + G.padding_width and not self.is_block(
+        if player.map_x < self.game_map.width - 1 and not self.is_block(
             player.map_y, player.map_x + 1
         ):
             self.x_offset += 1
             player.x += 1
+            self.on_move(0, 1)
@@ -1,28 +1,66 @@
-from os import get_terminal_size
+import os
 from math import floor
-from curses import init_pair, color_pair
-from recordclass import RecordClass  # type: ignore
 
+from recordclass import RecordClass  # type: ignore
 
-class Globals:
-    w, h = get_terminal_size()
+from .render.base import Backend
 
-    if h % 2 == 0:
-        h -= 1
-    if w % 2 == 0:
-        w -= 1
+# Screen size as (height, width) when there is no terminal to measure, e.g. in tests
+FALLBACK_SIZE = (40, 120)
 
-    height = h
-    width = w
-    center_y = height // 2
-    center_x = width // 2
-    game_height = height - 2 * floor(height / 8)
-    game_width = floor((width - 2 * floor(width / 8)) * 7 / 8)
 
-    # Map padding so the player can actually move to the edge of the map.
-    # It's a weird curses thing
-    padding_height = (height - game_height) // 2
-    padding_width = width - game_width
+class Globals:
+    """Screen layout, computed from the terminal size at import. configure() recomputes it"""
+
+    height: int
+    width: int
+    center_y: int
+    center_x: int
+    game_height: int
+    game_width: int
+    padding_height: int
+    padding_width: int
+    view_height: int
+    view_width: int
+    view_y: int
+    view_x: int
+
+    @classmethod
+    def configure(cls, height: int, width: int) -> None:
+        if height % 2 == 0:
+            height -= 1
+        if width % 2 == 0:
+            width -= 1
+
+        cls.height = height
+        cls.width = width
+        cls.center_y = height // 2
+        cls.center_x = width // 2
+        cls.game_height = height - 2 * floor(height / 8)
+        cls.game_width = floor((width - 2 * floor(width / 8)) * 7 / 8)
+
+        # Map padding so the player can actually move to the edge of the map.
+        # It's a weird curses thing
+        cls.padding_height = (height - cls.game_height) // 2
+        cls.padding_width = width - cls.game_width
+
+        # Map viewport inside the border, and where the player sits within it
+        cls.view_height = cls.game_height - 2
+        cls.view_width = cls.game_width - 2
+        cls.view_y = cls.center_y - cls.padding_height - 1
+        cls.view_x = cls.center_x - cls.padding_width - 1
+
+
+def terminal_size() -> tuple[int, int]:
+    """(height, width) of the terminal, FALLBACK_SIZE when there is none"""
+    try:
+        width, height = os.get_terminal_size()
+    except OSError:
+        return FALLBACK_SIZE
+    return height, width
+
+
+Globals.configure(*terminal_size())
 
 
 class Colors(RecordClass):
@@ -63,7 +101,9 @@ class Colors(RecordClass):
     MYTHIC: int
 
     @staticmethod
-    def setup_colors():
+    def setup_colors(backend: Backend):
+        init_pair, color_pair = backend.init_pair, backend.color_pair
+
         init_pair(1, 231, 16)
         init_pair(2, 240, 16)
         init_pair(3, 135, 16)
@@ -0,0 +1,297 @@
+"""
+Fight rules, kept apart from the UI. A Fight record holds everything a fight depends on, the
+functions here advance it and return what happened as log lines, and the caller shows them and
+copies the numbers back to the game state. Nothing here touches curses or the singletons in ctx, so
+fights can be played out headless, many thousands a second
+"""
+import random
+from math import floor
+from typing import Callable
+
+from recordclass import RecordClass  # type: ignore
+
+from ..ctx import Delusions, Phase, Turn, meta
+
+# Rolls a chance, an effect triggers when it is <= the effect's chance
+Rng = Callable[[], float]
+
+
+class Fighter(RecordClass):
+    hp: int
+    max_hp: int
+    atk: int
+    # ATK when the fight started, ATK bonuses and withers are a percentage of it
+    base_atk: int
+    delusion: Delusions
+
+
+class Fight(RecordClass):
+    player: Fighter
+    enemy: Fighter
+    turn: Turn = Turn.player
+    phase: Phase = Phase.begin
+    # Whether the player's and the enemy's delusion rolled this phase already
+    player_fxd: bool = False
+    opponent_fxd: bool = False
+    # The enemy skipped the player's turn and goes again
+    extra_turn: bool = False
+
+
+# An effect applies itself for `me` against `them` and returns the damage `me` takes from the
+# attack being countered, which is 0 outside of the counter phase. `mine` is True for the player
+Effect = Callable[[Fight, Fighter, Fighter, int, bool, list[str], int], int]
+
+
+def who(mine: bool) -> str:
+    return "(YOU)" if mine else "(ENEMY)"
+
+
+def skip(fight: Fight, mine: bool, events: list[str]) -> None:
+    """Skips the other side's turn, the phases start over for the side that skipped it"""
+    fight.phase = Phase.begin
+    fight.turn = Turn.player if mine else Turn.opponent
+    fight.player_fxd = False
+    fight.opponent_fxd = False
+    if not mine:
+        fight.extra_turn = True
+    events.append("Skipped Enemy Turn!" if mine else "Skipped Your Turn!")
+
+
+def freeze(fight, me, them, amount, mine, events, damage) -> int:
+    wither = floor(them.max_hp * amount / 100)
+    them.hp -= wither
+    events.append(f"{who(not mine)} -HP {wither}")
+    skip(fight, mine, events)
+    return damage
+
+
+def burn(fight, me, them, amount, mine, events, damage) -> int:
+    burn_dmg = floor(me.atk * amount / 100)
+    them.hp -= burn_dmg
+    events.append(f"{who(not mine)} -HP {burn_dmg}")
+    return damage
+
+
+def plant(fight, me, them, amount, mine, events, damage) -> int:
+    old_hp = me.hp
+    me.hp = min(old_hp + floor(me.max_hp * amount / 100), me.max_hp)
+    atk_bonus = floor(me.base_atk * amount / 100)
+    me.atk += atk_bonus
+    events.append(f"{who(mine)} +HP {me.hp - old_hp}")
+    events.append(f"{who(mine)} +ATK {atk_bonus}")
+    return damage
+
+
+def mech(fight, me, them, amount, mine, events, damage) -> int:
+    charge = floor(me.base_atk * amount / 100)
+    me.atk += charge
+    events.append("Halved damage")
+    events.append(f"{who(mine)} +ATK {charge}")
+    return damage // 2
+
+
+def corrupt(fight, me, them, amount, mine, events, damage) -> int:
+    mirror_damage = floor(damage * amount / 100)
+    them.hp -= mirror_damage
+    events.append("Corrupted damage")
+    events.append(f"{who(not mine)} -HP {mirror_damage}")
+    return 0
+
+
+def stun(fight, me, them, amount, mine, events, damage) -> int:
+    skip(fight, mine, events)
+    return damage
+
+
+def zap(fight, me, them, amount, mine, events, damage) -> int:
+    atk_wither = floor(them.base_atk * amount / 100)
+    # With negative ATK an attack would heal, so the limit is 0
+    them.atk = max(them.atk - atk_wither, 0)
+    events.append(f"{who(not mine)} -ATK {atk_wither}")
+    return damage
+
+
+def drain(fight, me, them, amount, mine, events, damage) -> int:
+    old_hp = me.hp
+    me.hp = min(old_hp + floor(me.atk * amount / 100), me.max_hp)
+    events.append(f"{who(mine)} +HP {me.hp - old_hp}")
+    return damage
+
+
+def bleed(fight, me, them, amount, mine, events, damage) -> int:
+    wither = floor(them.max_hp * amount / 100)
+    them.hp -= wither
+    events.append(f"{who(not mine)} -HP {wither}")
+    return damage
+
+
+class Rule:
+    """When a delusion's effect rolls, its chance to trigger and the percentage it works with"""
+
+    __slots__ = ("phase", "chance", "amount", "effect")
+
+    def __init__(self, phase: Phase, chance: float, amount: int, effect: Effect) -> None:
+        self.phase = phase
+        self.chance = chance
+        self.amount = amount
+        self.effect = effect
+
+
+# Begin and end effects roll once per phase on their owner's turn, counters whenever their owner
+# is attacked. See the Delusion docstring for what each one does
+RULES: dict[Delusions, Rule] = {
+    Delusions.Freeze: Rule(Phase.end, 0.35, 5, freeze),
+    Delusions.Burn: Rule(Phase.end, 0.5, 25, burn),
+    Delusions.Plant: Rule(Phase.begin, 0.75, 10, plant),
+    Delusions.Mech: Rule(Phase.counter, 0.75, 10, mech),
+    Delusions.Corrupt: Rule(Phase.counter, 0.5, 50, corrupt),
+    Delusions.Stun: Rule(Phase.end, 0.35, 0, stun),
+    Delusions.Zap: Rule(Phase.begin, 0.75, 15, zap),
+    Delusions.Drain: Rule(Phase.end, 0.75, 50, drain),
+    Delusions.Bleed: Rule(Phase.end, 0.5, 10, bleed),
+}
+
+# Attacking a delusion yours is strong against multiplies the damage
+STRONG: dict[Delusions, Delusions | None] = {d: meta[d]["strong"] for d in Delusions}
+STRONG_MULTIPLIER = 1.5
+
+# Commands the player can use in each phase of their turn
+ALLOWED = {
+    Phase.begin: {"heal", "attack", "pass", "abandon", "showheals"},
+    Phase.end: {"heal", "pass", "abandon", "showheals"},
+}
+
+
+def roll(
+    fight: Fight, me: Fighter, them: Fighter, mine: bool, rng: Rng, events: list[str], damage=0
+) -> int:
+    """Rolls the effect of `me`'s delusion and returns the damage `me` takes"""
+    rule = RULES[me.delusion]
+    kind = "Counter" if rule.phase == Phase.counter else "Ability"
+    events.append(f"~~~{'Your' if mine else 'Enemy'} {me.delusion.name} {kind}~~~")
+    if rng() <= rule.chance:
+        return rule.effect(fight, me, them, rule.amount, mine, events, damage)
+    events.append("Did nothing")
+    return damage
+
+
+def ability(fight: Fight, mine: bool, rng: Rng, events: list[str]) -> None:
+    """The begin or end effect of the side whose turn it is, once per phase"""
+    if mine:
+        me, them = fight.player, fight.enemy
+        if fight.player_fxd or RULES[me.delusion].phase != fight.phase:
+            return
+        fight.player_fxd = True
+    else:
+        me, them = fight.enemy, fight.player
+        if fight.opponent_fxd or RULES[me.delusion].phase != fight.phase:
+            return
+        fight.opponent_fxd = True
+    roll(fight, me, them, mine, rng, events)
+
+
+def attack(fight: Fight, rng: Rng, events: list[str]) -> None:
+    """Whoever's turn it is attacks, which may trigger the other side's counter. Ends the phase"""
+    mine = fight.turn == Turn.player
+    me, them = (fight.player, fight.enemy) if mine else (fight.enemy, fight.player)
+
+    damage = me.atk
+    if STRONG[me.delusion] == them.delusion:
+        damage = floor(damage * STRONG_MULTIPLIER)
+    if RULES[them.delusion].phase == Phase.counter:
+        damage = roll(fight, them, me, not mine, rng, events, damage)
+
+    them.hp -= damage
+    events.append("")
+    events.append(f"{'You' if mine else 'Enemy'} Dealt {damage} damage")
+    fight.phase = Phase.end
+    events.append("")
+
+
+def pass_turn(fight: Fight) -> None:
+    fight.turn = Turn.opponent if fight.turn == Turn.player else Turn.player
+    fight.player_fxd = False
+    fight.opponent_fxd = False
+    fight.phase = Phase.begin
+
+
+def heal(fighter, percent: int) -> int:
+    """Heals a Fighter or anything else with hp and max_hp by a percentage of its max HP"""
+    old_hp = fighter.hp
+    # Can't heal over max HP
+    fighter.hp = min(old_hp + floor(fighter.max_hp * percent / 100), fighter.max_hp)
+    return fighter.hp - old_hp
+
+
+def winner(fight: Fight) -> Turn | None:
+    if fight.enemy.hp <= 0:
+        return Turn.player
+    if fight.player.hp <= 0:
+        return Turn.opponent
+    return None
+
+
+def advance(fight: Fight, rng: Rng = random.random) -> list[str]:
+    """
+    What happens when the player hits return before their command is used: the effects of the
+    phases, and on the enemy's turn all of it, the enemy attacking and passing the turn back
+    """
+    events: list[str] = []
+
+    if fight.phase == Phase.begin:
+        if fight.turn == Turn.player:
+            events += ("[Phase begin! Your Turn!]", "")
+            ability(fight, True, rng, events)
+        else:
+            events += ("[Phase begin! Enemy Turn!]", "")
+            ability(fight, False, rng, events)
+            attack(fight, rng, events)
+            events += ("", "")
+
+    if fight.phase == Phase.end:
+        if fight.turn == Turn.player:
+            events += ("[Phase End! Your Turn!]", "")
+            ability(fight, True, rng, events)
+        else:
+            events.append("")
+            # The enemy goes again only if this phase skips the player's turn
+            fight.extra_turn = False
+            ability(fight, False, rng, events)
+
+    if fight.turn == Turn.opponent and not fight.extra_turn:
+        pass_turn(fight)
+        events.append("Turn passed")
+
+    return events
+
+
+def act(fight: Fight, command: str, rng: Rng = random.random, amount: int = 0) -> list[str]:
+    """The player uses a fight command, `amount` is the percentage a heal heals by"""
+    if command not in ALLOWED.get(fight.phase, ()):
+        return [f"Can't use that in {fight.phase.name} phase!"]
+
+    events: list[str] = []
+    match command:
+        case "attack":
+            attack(fight, rng, events)
+        case "pass":
+            pass_turn(fight)
+            events.append("Turn passed")
+        case "heal":
+            events.append(f"Healed {heal(fight.player, amount)}HP")
+        case "abandon":
+            fight.turn = Turn.null
+            fight.phase = Phase.null
+            events.append("Abandoned fight")
+    return events
+
+
+def step(
+    fight: Fight, command: str | None = None, rng: Rng = random.random, amount: int = 0
+) -> list[str]:
+    """One press of return, with the command the player typed. It's ignored on the enemy's turn"""
+    players_turn = fight.turn == Turn.player
+    events = advance(fight, rng)
+    if players_turn and command:
+        events += act(fight, command, rng, amount)
+    return events
@@ -0,0 +1,80 @@
+"""
+Weighted loot tables, compiled into Walker alias tables: a draw is one roll and two lookups however
+many items a table has. sample() draws many at once as arrays, for drop rate checks and simulators
+"""
+import random
+from typing import Generic, Hashable, Mapping, TypeVar
+
+import numpy as np
+
+T = TypeVar("T", bound=Hashable)
+
+
+class AliasTable(Generic[T]):
+    """
+    Items drawn with probability proportional to their weight. Each item owns a column of equal
+    width, split between itself, with share `prob`, and its `alias` for the rest of the column
+    """
+
+    __slots__ = ("items", "prob", "alias")
+
+    def __init__(self, weights: Mapping[T, float]) -> None:
+        if not weights or min(weights.values()) < 0 or sum(weights.values()) <= 0:
+            raise ValueError("a loot table needs positive weights")
+        self.items = tuple(weights)
+        n = len(self.items)
+        total = sum(weights.values())
+        scaled = [w * n / total for w in weights.values()]
+
+        # Vose's variant: columns with less than their share are topped up from ones with more
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # What's left is 1 up to float error
+
+        self.prob = np.array(prob)
+        self.alias = np.array(alias, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw(self, rng: random.Random) -> T:
+        """One item. The roll picks the column with its whole part and the side with the rest"""
+        u = rng.random() * len(self.items)
+        i = int(u)
+        return self.items[i if u - i < self.prob[i] else self.alias[i]]
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """`n` draws at once, as indices into `items`"""
+        u = rng.random(n) * len(self.items)
+        i = u.astype(np.intp)
+        return np.where(u - i < self.prob[i], i, self.alias[i])
+
+    def odds(self) -> dict[T, float]:
+        """Probability of each item, as the table draws them"""
+        odds = self.prob.copy()
+        np.add.at(odds, self.alias, 1 - self.prob)
+        return dict(zip(self.items, (odds / len(self.items)).tolist()))
+
+
+class Loot(Generic[T]):
+    """What a loot source gives: one item from each of its tables"""
+
+    __slots__ = ("tables",)
+
+    def __init__(self, *tables: Mapping[T, float]) -> None:
+        self.tables = tuple(AliasTable(table) for table in tables)
+
+    def roll(self, rng: random.Random) -> list[T]:
+        return [table.draw(rng) for table in self.tables]
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """`n` rolls as an (n, tables) array, column j indexing the items of table j"""
+        return np.stack([table.sample(n, rng) for table in self.tables], axis=1)
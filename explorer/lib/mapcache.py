@@ -0,0 +1,109 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from .palette import decode_image
+
+# Bump whenever decoding or tile ids change so old cache files get rebuilt
+PARSER_VERSION = 1
+
+CACHE_DIR_ENV = "EXPLORER_CACHE_DIR"
+
+MAGIC = b"EXPLMAP\0"
+# magic, parser version, sha256 of the image file, height, width
+HEADER = struct.Struct("<8sI32sII")
+# Tile data starts on a 64 byte boundary
+HEADER_SIZE = 64
+
+
+def cache_path(asset: Path, cache_dir: Path | None = None) -> Path:
+    """
+    Where the parsed grid of `asset` is cached. In order of priority: `cache_dir`, the
+    EXPLORER_CACHE_DIR environment variable, a `.cache` directory next to the asset
+    """
+    if cache_dir is None:
+        env = os.environ.get(CACHE_DIR_ENV)
+        cache_dir = Path(env) if env else asset.parent / ".cache"
+    return cache_dir / f"{asset.stem}.tiles"
+
+
+def _map_cache(path: Path, digest: bytes) -> np.ndarray | None:
+    """Memory maps a cache file, returns None if it is missing, stale or corrupt"""
+    try:
+        with open(path, "rb") as f:
+            # Copy on write: pages stay shared between processes until the game mutates a cell,
+            # and mutations never reach the file
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    if len(mm) < HEADER_SIZE:
+        return None
+
+    magic, version, cached_digest, height, width = HEADER.unpack_from(mm)
+    if (
+        magic != MAGIC
+        or version != PARSER_VERSION
+        or cached_digest != digest
+        or len(mm) != HEADER_SIZE + height * width
+    ):
+        return None
+
+    return np.frombuffer(mm, dtype=np.uint8, offset=HEADER_SIZE).reshape(height, width)
+
+
+def _write_cache(path: Path, digest: bytes, ids: np.ndarray) -> None:
+    """Writes atomically so concurrent games never map a half written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    height, width = ids.shape
+    header = HEADER.pack(MAGIC, PARSER_VERSION, digest, height, width).ljust(HEADER_SIZE, b"\0")
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(ids.astype(np.uint8).tobytes())
+        # mkstemp creates the file as 0600, other users' games should be able to share it
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load_ids(
+    asset: Path,
+    cache_dir: Path | None = None,
+    decode: Callable[[Image.Image], np.ndarray] = decode_image,
+) -> np.ndarray:
+    """
+    Returns the (height, width) tile id grid of a map image. Served straight from a memory mapped
+    cache file when one exists for this exact image content and parser version, otherwise the
+    image is decoded and the cache (re)built
+    """
+    data = asset.read_bytes()
+    digest = hashlib.sha256(data).digest()
+    path = cache_path(asset, cache_dir)
+
+    cached = _map_cache(path, digest)
+    if cached is not None:
+        return cached
+
+    ids = decode(Image.open(BytesIO(data)))
+
+    try:
+        _write_cache(path, digest, ids)
+    except OSError:
+        # Read only install or similar, still playable without the cache
+        return ids
+
+    cached = _map_cache(path, digest)
+    return ids if cached is None else cached
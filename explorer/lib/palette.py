@@ -0,0 +1,102 @@
+import numpy as np
+from PIL import Image
+
+# Map pixel colour -> tile id. The tile definitions themselves live in ./parser.py
+PIXEL_TO_ID: dict[tuple[int, int, int], int] = {
+    (240, 240, 240): 10,  # TOPL
+    (230, 230, 230): 11,  # TOPM
+    (220, 220, 220): 12,  # TOPR
+    (210, 210, 210): 13,  # MIDL
+    (25, 25, 25): 14,  # MIDM
+    (200, 200, 200): 15,  # MIDR
+    (190, 190, 190): 16,  # BOTL
+    (180, 180, 180): 17,  # BOTM
+    (170, 170, 170): 18,  # BOTR
+    (120, 120, 120): 19,  # HWALL
+    (100, 100, 100): 20,  # VWALL
+    (150, 150, 150): 21,  # PATH
+    (255, 0, 0): 22,  # ENEMY
+    (255, 0, 255): 23,  # CHEST
+    (255, 255, 0): 24,  # MONEY
+    (91, 192, 192): 25,  # SHOP
+    (0, 255, 0): 26,  # HEAL
+    (255, 120, 0): 27,  # SUPER
+    (0, 100, 0): 28,  # GRASS
+    (0, 150, 150): 29,  # TREE
+    (200, 125, 200): 30,  # SPAWN
+    (0, 0, 255): 31,  # WATER
+    (255, 215, 0): 32,  # LOCK
+    (255, 180, 0): 33,  # KEY
+    (200, 0, 0): 34,  # ATTACK
+    (255, 255, 255): 0,  # VOID
+}
+
+
+def pack_rgb(r, g, b):
+    """
+    Packs RGB channels (ints or arrays) into a single 24 bit integer key. The byte order matches
+    an RGBA pixel read as a little endian uint32 with the alpha byte masked off
+    """
+    return r | (g << 8) | (b << 16)
+
+
+class UnknownColorError(Exception):
+    """
+    Raised when an image contains colours that are not in the palette.
+    `coords` holds the (y, x) position of every offending pixel
+    """
+
+    def __init__(self, coords: list[tuple[int, int]], colors: list[tuple[int, int, int]]) -> None:
+        self.coords = coords
+        self.colors = colors
+        preview = ", ".join(f"{c} at {p}" for c, p in zip(colors[:5], coords[:5]))
+        more = f" (+{len(coords) - 5} more)" if len(coords) > 5 else ""
+        super().__init__(f"{len(coords)} pixel(s) with unknown colours: {preview}{more}")
+
+
+class Palette:
+    """
+    Colour -> tile id lookup compiled into a lookup table indexed by packed RGB, so a whole image
+    can be decoded with a single gather instead of one dict lookup per pixel
+    """
+
+    def __init__(self, mapping: dict[tuple[int, int, int], int]) -> None:
+        if len(mapping) > 255:
+            raise ValueError("Palette can hold at most 255 colours")
+
+        self.mapping = mapping
+        # Slot 0 is reserved for unknown colours
+        self.ids = np.array([0, *mapping.values()], dtype=np.uint8)
+        self._lut: np.ndarray | None = None
+
+    @property
+    def lut(self) -> np.ndarray:
+        """packed RGB -> index into self.ids. Built on first use since it takes 16MB"""
+        if self._lut is None:
+            self._lut = np.zeros(1 << 24, dtype=np.uint8)
+            for i, rgb in enumerate(self.mapping, start=1):
+                self._lut[pack_rgb(*rgb)] = i
+        return self._lut
+
+    def decode(self, m: Image.Image) -> np.ndarray:
+        """Decodes an Image into a (height, width) array of tile ids"""
+        rgba = np.asarray(m if m.mode == "RGBA" else m.convert("RGBA"))
+        packed = rgba.view("<u4")[..., 0] & 0xFFFFFF
+
+        idx = self.lut[packed]
+
+        if not idx.all():
+            ys, xs = np.nonzero(idx == 0)
+            coords = list(zip(ys.tolist(), xs.tolist()))
+            colors = [tuple(rgba[y, x, :3].tolist()) for y, x in coords]
+            raise UnknownColorError(coords, colors)  # type: ignore
+
+        return self.ids[idx]
+
+
+PALETTE = Palette(PIXEL_TO_ID)
+
+
+def decode_image(m: Image.Image, palette: Palette = PALETTE) -> np.ndarray:
+    """Decodes an Image into a 2D array of tile ids, see Palette.decode"""
+    return palette.decode(m)
@@ -1,112 +1,151 @@
-from math import floor
-import random
+import sys
+from pathlib import Path
 from typing import Callable
 
+import numpy as np
 from PIL import Image
 
-from ..ctx import Delusions, Phase, Side, Turn, inventory, state, player, fight_state, Log
+from ..ctx import Side, inventory, state, player, Log
 from ..globals import Colors
-from ..globals import Globals as G
+from . import combat
+from .mapcache import load_ids
+from .palette import PIXEL_TO_ID, decode_image
+from .rng import Rngs
+from .singleton import singleton
+from .tilemap import MAX_TILE_ID, TileMap
+from .world import ChunkedWorld
 
 
 class Tile:
     """
-    Tile objects that the game map is comprised of
+    Tile objects that the game map is comprised of. Tiles are immutable and shared: every map cell
+    of the same kind references the same prototype from TileCatalog
     """
 
     # Memory optimize
     __slots__ = ("char", "barrier", "color", "id", "name")
 
     def __init__(self, char: str, barrier: bool, color: int, id: int, name: str) -> None:
-        self.char = char
-        self.barrier = barrier
-        self.color = color
-        self.id = id
-        self.name = name
+        set_attr = super().__setattr__
+        set_attr("char", sys.intern(char))
+        set_attr("barrier", barrier)
+        set_attr("color", color)
+        set_attr("id", id)
+        set_attr("name", sys.intern(name))
 
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"Tile is immutable, can't set `{name}`")
 
-PIXEL_TO_TILE: dict[tuple[int, int, int], Callable[..., Tile]] = {
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"Tile is immutable, can't delete `{name}`")
+
+    def __repr__(self) -> str:
+        return f"Tile({self.name}, id={self.id})"
+
+
+ID_TO_TILE: dict[int, Callable[..., Tile]] = {
     # Top left 90 intersection
-    (240, 240, 240): lambda: Tile("┌", True, Colors.WALL, 10, "TOPL"),
+    10: lambda: Tile("┌", True, Colors.WALL, 10, "TOPL"),
     # Top center T intersection
-    (230, 230, 230): lambda: Tile("┬", True, Colors.WALL, 11, "TOPM"),
+    11: lambda: Tile("┬", True, Colors.WALL, 11, "TOPM"),
     # Top right 90 intersection
-    (220, 220, 220): lambda: Tile("┐", True, Colors.WALL, 12, "TOPR"),
+    12: lambda: Tile("┐", True, Colors.WALL, 12, "TOPR"),
     # Middle left T intersection
-    (210, 210, 210): lambda: Tile("├", True, Colors.WALL, 13, "MIDL"),
+    13: lambda: Tile("├", True, Colors.WALL, 13, "MIDL"),
     # Center four way intersection
-    (25, 25, 25): lambda: Tile("┼", True, Colors.WALL, 14, "MIDM"),
+    14: lambda: Tile("┼", True, Colors.WALL, 14, "MIDM"),
     # Middle right T intersection
-    (200, 200, 200): lambda: Tile("┤", True, Colors.WALL, 15, "MIDR"),
+    15: lambda: Tile("┤", True, Colors.WALL, 15, "MIDR"),
     # Bottom left 90 intersection
-    (190, 190, 190): lambda: Tile("└", True, Colors.WALL, 16, "BOTL"),
+    16: lambda: Tile("└", True, Colors.WALL, 16, "BOTL"),
     # Bottom center T intersection
-    (180, 180, 180): lambda: Tile("┴", True, Colors.WALL, 17, "BOTM"),
+    17: lambda: Tile("┴", True, Colors.WALL, 17, "BOTM"),
     # Bottom right 90 intersection
-    (170, 170, 170): lambda: Tile("┘", True, Colors.WALL, 18, "BOTR"),
+    18: lambda: Tile("┘", True, Colors.WALL, 18, "BOTR"),
     # Horizontal wall
-    (120, 120, 120): lambda: Tile("─", True, Colors.WALL, 19, "HWALL"),
+    19: lambda: Tile("─", True, Colors.WALL, 19, "HWALL"),
     # Vertical wall
-    (100, 100, 100): lambda: Tile("│", True, Colors.WALL, 20, "VWALL"),
+    20: lambda: Tile("│", True, Colors.WALL, 20, "VWALL"),
     # Path
-    (150, 150, 150): lambda: Tile(".", False, Colors.PATH, 21, "PATH"),
+    21: lambda: Tile(".", False, Colors.PATH, 21, "PATH"),
     # Enemy (icon not final)
-    # (255, 0, 0): lambda: Tile("", True, Colors.ENEMY, 22, "ENEMY"),
-    (255, 0, 0): lambda: Tile("", True, Colors.ENEMY, 22, "ENEMY"),
+    # 22: lambda: Tile("", True, Colors.ENEMY, 22, "ENEMY"),
+    22: lambda: Tile("", True, Colors.ENEMY, 22, "ENEMY"),
     # Chest
-    (255, 0, 255): lambda: Tile("", False, Colors.CHEST, 23, "CHEST"),
+    23: lambda: Tile("", False, Colors.CHEST, 23, "CHEST"),
     # Money
-    (255, 255, 0): lambda: Tile("", False, Colors.MONEY, 24, "MONEY"),
+    24: lambda: Tile("", False, Colors.MONEY, 24, "MONEY"),
     # Shop
-    (91, 192, 192): lambda: Tile("", False, Colors.SHOP, 25, "SHOP"),
+    25: lambda: Tile("", False, Colors.SHOP, 25, "SHOP"),
     # Heal
-    (0, 255, 0): lambda: Tile("", False, Colors.HEAL, 26, "HEAL"),
+    26: lambda: Tile("", False, Colors.HEAL, 26, "HEAL"),
     # Super
-    (255, 120, 0): lambda: Tile("", False, Colors.SUPER, 27, "SUPER"),
+    27: lambda: Tile("", False, Colors.SUPER, 27, "SUPER"),
     # Healing Grass
-    (0, 100, 0): lambda: Tile(" ", False, Colors.GRASS, 28, "GRASS"),
+    28: lambda: Tile(" ", False, Colors.GRASS, 28, "GRASS"),
     # Tree decoration
-    (0, 150, 150): lambda: Tile("", True, Colors.TREE, 29, "TREE"),
+    29: lambda: Tile("", True, Colors.TREE, 29, "TREE"),
     # Checkpoint
-    (200, 125, 200): lambda: Tile("", False, Colors.CHECK, 30, "SPAWN"),
+    30: lambda: Tile("", False, Colors.CHECK, 30, "SPAWN"),
     # Gamble water
-    (0, 0, 255): lambda: Tile(" ", False, Colors.WATER, 31, "WATER"),
+    31: lambda: Tile(" ", False, Colors.WATER, 31, "WATER"),
     # Lock
-    (255, 215, 0): lambda: Tile("", True, Colors.LOCK, 32, "LOCK"),
+    32: lambda: Tile("", True, Colors.LOCK, 32, "LOCK"),
     # Key
-    (255, 180, 0): lambda: Tile("", False, Colors.KEY, 33, "KEY"),
+    33: lambda: Tile("", False, Colors.KEY, 33, "KEY"),
     # Attack path
     # Change this to Colors.PATH once it works
-    (200, 0, 0): lambda: Tile(".", False, Colors.PATH, 34, "ATTACK"),
-    # Transparrent tile
-    (255, 255, 255): lambda: Tile(" ", False, Colors.BLACK, 999, "VOID"),
+    34: lambda: Tile(".", False, Colors.PATH, 34, "ATTACK"),
+    # Transparrent tile. Walkable inside the map, what is outside of it is blocked by Passability
+    0: lambda: Tile(" ", False, Colors.BLACK, 0, "VOID"),
 }
 
+# Kept for callers that still look tiles up by pixel colour
+PIXEL_TO_TILE: dict[tuple[int, int, int], Callable[..., Tile]] = {
+    pixel: ID_TO_TILE[id] for pixel, id in PIXEL_TO_ID.items()
+}
+
+
+@singleton
+class TileCatalog:
+    """
+    Flyweight store holding one Tile prototype per tile kind, plus flat side tables indexed by tile
+    id for hot paths. Built lazily because tile colours only exist after Colors.setup_colors()
+    """
+
+    def __init__(self) -> None:
+        self.tiles: dict[int, Tile] = {id: factory() for id, factory in ID_TO_TILE.items()}
 
-def parse_image(m: Image.Image) -> list[list[Tile]]:
-    """Parses an Image and returns a 2D array of Tiles with padding on all four edges"""
-    w, h = m.size
-    assert w == h == 256
-    blank = (255, 255, 255)
-    ret = []
+        self.table: list[Tile | None] = [None] * (MAX_TILE_ID + 1)
+        for id, tile in self.tiles.items():
+            self.table[id] = tile
 
-    for _ in range(G.center_y):
-        ret.append([PIXEL_TO_TILE[blank]() for _ in range(w + G.center_x * 2)])
+        self.chars: list[str] = [t.char if t else " " for t in self.table]
+        self.colors: list[int] = [t.color if t else 0 for t in self.table]
+        # Unknown ids block
+        self.barriers: bytes = bytes(t.barrier if t else 1 for t in self.table)
 
-    for x in range(w):
-        ret.append([])
+    def __getitem__(self, id: int) -> Tile:
+        return self.tiles[id]
 
-        for _ in range(G.center_x):
-            ret[G.center_y + x].append(PIXEL_TO_TILE[blank]())
-        for y in range(h):
-            ret[G.center_y + x].append(PIXEL_TO_TILE[m.getpixel((y, x))[0:3]]())
-        for _ in range(G.center_x):
-            ret[G.center_y + x].append(PIXEL_TO_TILE[blank]())
 
-    for _ in range(G.center_y):
-        ret.append([PIXEL_TO_TILE[blank]() for _ in range(w + G.center_x * 2)])
+def to_tile_map(ids: np.ndarray) -> TileMap:
+    return TileMap.from_array(ids, TileCatalog().table)  # type: ignore
 
-    return ret
+
+def parse_image(m: Image.Image) -> TileMap:
+    """Parses an Image and returns a TileMap of the same size"""
+    return to_tile_map(decode_image(m))
+
+
+def parse_map(path: Path, cache_dir: Path | None = None) -> TileMap:
+    """Like parse_image, but reads the image from disk through the parsed map cache"""
+    return to_tile_map(load_ids(path, cache_dir))
+
+
+def load_world(path: Path) -> ChunkedWorld:
+    """Opens a chunked world file (see ./world.py) for streaming"""
+    return ChunkedWorld(path, TileCatalog().table)  # type: ignore
 
 
 COMMANDS = {
@@ -127,9 +166,10 @@ class CommandResult:
         self.ok = ok
 
 
-def parse_command(command: str, **kwargs) -> CommandResult:
+def parse_command(command: str, rngs: Rngs, **kwargs) -> CommandResult:
     """
-    Takes in a command, verifies it, and hence parses it. Returns a CommandResult
+    Takes in a command, verifies it, and hence parses it. Returns a CommandResult. Attacks roll
+    from the combat stream of `rngs`
     """
     tokens = command.split()
     token_stream = iter(tokens)
@@ -148,15 +188,9 @@ def parse_command(command: str, **kwargs) -> CommandResult:
             return CommandResult(f"{command_name}: invalid command", ok=False)
 
         if kwargs.get("fight"):
-            match fight_state.phase:
-                case Phase.begin:
-                    if command_name not in ["heal", "attack", "pass", "abandon", "showheals"]:
-                        return CommandResult("Can't use that in begin phase!", ok=False)
-                case Phase.end:
-                    if command_name not in ["heal", "pass", "abandon", "showheals"]:
-                        return CommandResult("Can't use that in end phase!", ok=False)
-                case _:
-                    pass
+            phase = side.fight.phase
+            if command_name not in combat.ALLOWED[phase]:
+                return CommandResult(f"Can't use that in {phase.name} phase!", ok=False)
 
         match command_name:
             case "equip":
@@ -199,124 +233,25 @@ def parse_command(command: str, **kwargs) -> CommandResult:
 
             case "attack":
                 _ = kwargs["fight"]
-                assert inventory.equipped_weapon
-                assert side.enemy
-
-                match fight_state.turn:
-                    case Turn.player:
-                        damage = inventory.equipped_weapon.atk
-
-                        if (
-                            inventory.equipped_weapon.delusion.get_strong()
-                            == side.enemy.delusion.type
-                        ):
-                            damage = floor(damage * 1.5)
-
-                        # Counter ability
-                        match side.enemy.delusion.type:
-                            case Delusions.Mech:
-                                Log("~~~Enemy Mech Counter~~~")
-                                rng = random.random()
-                                if rng <= 0.75:
-                                    damage //= 2
-                                    charge = floor(side.enemy.original_atk * 10 / 100)
-                                    side.enemy.atk += charge
-                                    Log("Halved damage")
-                                    Log(f"(ENEMY) +ATK {charge}")
-                                else:
-                                    Log("Did nothing")
-
-                            case Delusions.Corrupt:
-                                Log("~~~Enemy Corrupt Counter~~~")
-                                rng = random.random()
-                                if rng <= 0.5:
-                                    mirror_damage = floor(damage / 2)
-                                    damage = 0
-
-                                    state.hp.hp -= mirror_damage
-                                    Log("Corrupted damage")
-                                    Log(f"(YOU) -HP {mirror_damage}")
-                                else:
-                                    Log("Did nothing")
-
-                            case _:
-                                pass
-
-                        side.enemy.hp -= damage
-                        Log("")
-                        Log(f"You Dealt {damage} damage")
-
-                    case Turn.opponent:
-                        damage = side.enemy.atk
-
-                        if (
-                            side.enemy.delusion.get_strong()
-                            == inventory.equipped_weapon.delusion.type
-                        ):
-                            damage = floor(damage * 1.5)
-
-                        # Counter ability
-                        match inventory.equipped_weapon.delusion.type:
-                            case Delusions.Mech:
-                                Log("~~~Your Mech Counter~~~")
-                                rng = random.random()
-                                if rng <= 0.75:
-                                    damage //= 2
-                                    charge = floor(side.old_weapon_atk * 10 / 100)
-                                    inventory.equipped_weapon.atk += charge
-                                    Log("Halved damage")
-                                    Log(f"(YOU) +ATK {charge}")
-                                else:
-                                    Log("Did nothing")
-
-                            case Delusions.Corrupt:
-                                Log("~~~Your Corrupt Counter~~~")
-                                rng = random.random()
-                                if rng <= 0.5:
-                                    mirror_damage = floor(damage / 2)
-                                    damage = 0
-
-                                    side.enemy.hp -= mirror_damage
-                                    Log("Corrupted damage")
-                                    Log(f"(ENEMY) -HP {mirror_damage}")
-                                else:
-                                    Log("Did nothing")
-
-                        state.hp.hp -= damage
-                        Log("")
-                        Log(f"Enemy Dealt {damage} damage")
-
-                fight_state.phase = Phase.end
-                Log("")
+                assert side.fight
+
+                events: list[str] = []
+                combat.attack(side.fight, rngs.combat.random, events)
+                for event in events:
+                    Log(event)
 
             case "pass":
                 _ = kwargs["fight"]
+                assert side.fight
 
-                if fight_state.turn == Turn.player:
-                    fight_state.turn = Turn.opponent
-                elif fight_state.turn == Turn.opponent:
-                    fight_state.turn = Turn.player
-
-                fight_state.player_fxd = False
-                fight_state.opponent_fxd = False
-
-                fight_state.phase = Phase.begin
-
+                combat.pass_turn(side.fight)
                 parsed_action += "Turn passed"
 
             case "abandon":
                 _ = kwargs["fight"]
-                assert inventory.equipped_weapon
 
                 # Reset all this fight state
-                side.enemy = None
-                inventory.equipped_weapon.atk = side.old_weapon_atk
-                side.old_weapon_atk = 0
-                fight_state.turn = Turn.null
-                fight_state.phase = Phase.null
-                fight_state.player_fxd = False
-                fight_state.opponent_fxd = False
-
+                side.end_fight()
                 parsed_action += "Abandoned fight"
 
         arg = next(token_stream)
@@ -364,15 +299,10 @@ def parse_command(command: str, **kwargs) -> CommandResult:
                     assert heal
                     inventory.add_heal(heal)
 
-                heal_qty = floor(state.hp.max_hp * target_heal.amount / 100)
-                old_hp = state.hp.hp
-                state.hp.hp = (
-                    # Ensure that you can't heal over max hp
-                    x
-                    if (x := old_hp + heal_qty) <= state.hp.max_hp
-                    else state.hp.max_hp
-                )
-                parsed_action += f"Healed {state.hp.hp - old_hp}HP"
+                # In a fight the HP is the fight's, it's copied to the state after
+                target = side.fight.player if side.fight else state.hp
+                healed = combat.heal(target, target_heal.amount)
+                parsed_action += f"Healed {healed}HP"
 
         next(token_stream)
         # This line will never be run, but my python LSP wants the function to return a CommandResult
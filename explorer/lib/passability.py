@@ -0,0 +1,37 @@
+from .tilemap import GameMap, TileMap
+
+
+class Passability:
+    """
+    Collision map with one byte per cell, 1 where the player can't walk. For a TileMap it is
+    computed once at map load by translating every row of tile ids through a barrier table (tile
+    id -> 0 or 1), then kept in sync with update() as cells change. A streamed map isn't copied,
+    that would decode every chunk: its cells are translated one at a time as they are checked.
+    Cells outside of the map are always blocked
+    """
+
+    __slots__ = ("height", "width", "barriers", "game_map", "cells")
+
+    def __init__(self, game_map: GameMap, barriers: bytes) -> None:
+        if len(barriers) != 256:
+            raise ValueError("The barrier table needs an entry for every tile id")
+
+        self.height = game_map.height
+        self.width = game_map.width
+        self.barriers = barriers
+        self.game_map = game_map
+        self.cells: bytearray | None = None
+        if isinstance(game_map, TileMap):
+            self.cells = bytearray(bytes(game_map.data).translate(barriers))
+
+    def blocked(self, y: int, x: int) -> bool:
+        if 0 <= y < self.height and 0 <= x < self.width:
+            if self.cells is None:
+                return self.barriers[self.game_map.get(y, x)] == 1
+            return self.cells[y * self.width + x] == 1
+        return True
+
+    def update(self, y: int, x: int, id: int) -> None:
+        """Call after the tile at (y, x) changed to `id`"""
+        if self.cells is not None:
+            self.cells[y * self.width + x] = self.barriers[id]
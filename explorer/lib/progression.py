@@ -0,0 +1,55 @@
+"""
+Level tables, computed once at import: the XP each level needs, the player's base max HP, and how
+weapons and enemies scale with the player's level. Level-ups and new enemies look numbers up
+instead of compounding them every time, so the level cap can go up without making either slower
+"""
+from bisect import bisect_right
+from functools import cache
+from math import floor
+
+
+def compound(first: int, rate: float, levels: int) -> list[int]:
+    """`first` at level 1, times `rate` for each level after, rounded to 10. Index 0 is unused"""
+    table = [0, first]
+    for _ in range(levels - 1):
+        table.append(int(round(table[-1] * rate, -1)))
+    return table
+
+
+# The level table: XP for the next level and max HP before the delusion's multiplier, by level.
+# The level cap is its length, everything else is sized after it
+MAX_XP = compound(20, 1.8, 10)
+MAX_LEVEL = len(MAX_XP) - 1
+BASE_MAX_HP = compound(50, 1.5, MAX_LEVEL)
+
+# Enemies get their base stats at level 1 and are scaled by these from level 2 on
+ENEMY_HP_SCALE = [1.0, 1.0] + [1.5**level for level in range(2, MAX_LEVEL + 1)]
+ENEMY_ATK_SCALE = [1.0, 1.0] + [1.3**level for level in range(2, MAX_LEVEL + 1)]
+
+
+def level_for(xp: int) -> int:
+    """The level `xp` reaches, at most MAX_LEVEL"""
+    return bisect_right(MAX_XP, xp, 1, MAX_LEVEL)
+
+
+@cache
+def weapon_atks(atk: int) -> tuple[int, ...]:
+    """
+    ATK of a weapon with `atk` after 0, 1, ... level-ups, each one 1.5 times the last rounded
+    down. Rows are cached by the ATK they start from
+    """
+    atks = [atk]
+    for _ in range(MAX_LEVEL - 1):
+        atks.append(atks[-1] * 3 // 2)
+    return tuple(atks)
+
+
+def weapon_atk(atk: int, levels: int) -> int:
+    """A weapon's ATK after levelling up with the player `levels` times"""
+    return weapon_atks(atk)[levels]
+
+
+@cache
+def enemy_stats(hp: int, atk: int, level: int) -> tuple[int, int]:
+    """An enemy's max HP and ATK when the player is at `level`"""
+    return floor(hp * ENEMY_HP_SCALE[level]), floor(atk * ENEMY_ATK_SCALE[level])
@@ -0,0 +1,34 @@
+"""
+Every random roll in the game comes from here. One seed makes a whole session repeatable: each
+subsystem draws from its own stream derived from the seed and the stream's name, so extra rolls in
+one of them, say a fight that lasts a turn longer, don't shift the loot of the next chest. Each
+session makes its own Rngs in app.setup() and hands it to what rolls, so games don't share streams
+"""
+import random
+
+# The subsystems that roll: what chests and pickups drop, see data/loot.py, and the delusion
+# effects and counters in fights
+STREAMS = ("loot", "combat")
+
+
+class Rngs:
+    """A random.Random per subsystem, all derived from `seed`. Unseeded it picks a seed itself"""
+
+    __slots__ = ("seed", "loot", "combat")
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.reseed(seed)
+
+    def reseed(self, seed: int | None = None) -> None:
+        """Starts every stream over, with a fresh seed when `seed` is None"""
+        self.seed = new_seed() if seed is None else seed
+        for name in STREAMS:
+            setattr(self, name, self.stream(name))
+
+    def stream(self, name: str) -> random.Random:
+        """A stream of its own for `name`. String seeds are hashed, so this is the same every run"""
+        return random.Random(f"{self.seed}:{name}")
+
+
+def new_seed() -> int:
+    return random.SystemRandom().randrange(1 << 32)
@@ -0,0 +1,114 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Sequence
+
+import numpy as np
+
+# Runs of the same byte, used on rows translated to colour keys
+RUN = re.compile(rb"(.)\1*", re.DOTALL)
+
+# A row encoded for curses: (text, attribute) pairs, one addstr each
+Runs = list[tuple[str, int]]
+
+
+class RowEncoder:
+    """
+    Turns rows of tile ids into runs of glyphs sharing a colour attribute, so a row can be drawn
+    with one addstr per run instead of one addch per cell. A single row goes through
+    str.translate, bytes.translate and a regex, many rows at once through NumPy arrays
+    """
+
+    __slots__ = ("glyphs", "attrs", "keys", "code_points", "key_array")
+
+    def __init__(self, chars: Sequence[str], colors: Sequence[int]) -> None:
+        # Indexed by code point, str.translate takes any sequence
+        self.glyphs = list(chars)
+
+        # tile id -> small key shared by every tile with the same attribute
+        self.attrs = list(dict.fromkeys(colors))
+        if len(self.attrs) > 256:
+            raise ValueError("RowEncoder supports at most 256 distinct colours")
+        index = {attr: key for key, attr in enumerate(self.attrs)}
+        self.keys = bytes(index[attr] for attr in colors).ljust(256, b"\0")
+
+        # The same two tables as arrays for encode_rows. Like str.translate, ids past the end of
+        # chars stay their latin-1 character
+        code_points = [ord(char) for char in chars[:256]] + list(range(len(chars), 256))
+        self.code_points = np.array(code_points, dtype="<u4")
+        self.key_array = np.frombuffer(self.keys, np.uint8)
+
+    def encode(self, ids: bytes) -> Runs:
+        text = ids.decode("latin-1").translate(self.glyphs)
+        attrs = self.attrs
+        return [
+            (text[m.start() : m.end()], attrs[m.group()[0]])
+            for m in RUN.finditer(ids.translate(self.keys))
+        ]
+
+    def encode_rows(self, rows: Sequence[bytes]) -> list[Runs]:
+        """The same as encode() on each row, but cheaper than encoding them one at a time"""
+        if len(rows) < 2:
+            return [self.encode(row) for row in rows]
+
+        ids = np.frombuffer(b"".join(rows), np.uint8)
+        text = self.code_points[ids].tobytes().decode("utf-32-le")
+        keys = self.key_array[ids]
+
+        # Runs start where the key changes and where each row starts
+        row_starts = np.cumsum([0] + [len(row) for row in rows[:-1]])
+        starts = np.empty(len(ids), dtype=bool)
+        starts[:1] = True
+        np.not_equal(keys[1:], keys[:-1], out=starts[1:])
+        starts[row_starts[row_starts < len(ids)]] = True
+
+        cuts = np.flatnonzero(starts)
+        ends = np.append(cuts[1:], len(ids)).tolist()
+        row_of = (np.searchsorted(row_starts, cuts, side="right") - 1).tolist()
+
+        attrs = self.attrs
+        encoded: list[Runs] = [[] for _ in rows]
+        for start, end, key, row in zip(cuts.tolist(), ends, keys[cuts].tolist(), row_of):
+            encoded[row].append((text[start:end], attrs[key]))
+        return encoded
+
+
+class EncodedRow:
+    """
+    Runs of a stretch of a map row starting at column `left`, kept while the camera moves sideways:
+    window() cuts out the part of them in view without encoding anything again
+    """
+
+    __slots__ = ("left", "right", "runs", "starts")
+
+    def __init__(self, left: int, runs: Runs) -> None:
+        self.left = left
+        self.runs = runs
+        # Column each run starts at
+        self.starts: list[int] = []
+        x = left
+        for text, _ in runs:
+            self.starts.append(x)
+            x += len(text)
+        self.right = x
+
+    def covers(self, left: int, right: int) -> bool:
+        return self.left <= left and right <= self.right
+
+    def window(self, left: int, right: int) -> Runs:
+        """The runs from column left up to right, which have to be covered"""
+        if left == self.left and right == self.right:
+            return self.runs
+        if left >= right:
+            return []
+
+        starts = self.starts
+        first = bisect_right(starts, left) - 1
+        last = bisect_left(starts, right) - 1
+        runs = self.runs[first : last + 1]
+
+        # The end first, so a run cut at both ends is cut relative to where it starts
+        text, attr = runs[-1]
+        runs[-1] = (text[: right - starts[last]], attr)
+        text, attr = runs[0]
+        runs[0] = (text[left - starts[first] :], attr)
+        return runs
@@ -0,0 +1,206 @@
+"""
+Plays many fights at once with NumPy, one lane per fight. The rules are combat.py's, taken from its
+RULES table, with each scalar effect mirrored by an array one in VECTOR. The player attacks every
+turn and passes only after their end effect had its chance, so a skip of the enemy's turn is never
+wasted. Wins and losses are decided where the game decides them, when the player hits return
+"""
+import numpy as np
+
+from ..ctx import Delusions, Phase
+from . import combat
+from .combat import RULES, STRONG, STRONG_MULTIPLIER
+
+# Rows of the per fighter arrays
+PLAYER, ENEMY = 0, 1
+
+# Where in a fight a lane is: the player's begin phase and attack, the player's end phase, or the
+# enemy's turn, which is played out in one go like in the game
+BEGIN, END, ENEMY_TURN = 0, 1, 2
+
+LOST, UNRESOLVED, WON = -1, 0, 1
+
+# Delusions as small ints, the order of the enum
+CODES = {delusion: code for code, delusion in enumerate(Delusions)}
+# Code of the delusion each one is strong against, -1 for none
+STRONG_CODES = np.array([CODES[s] if (s := STRONG[d]) else -1 for d in Delusions])
+
+
+class Batch:
+    """
+    State of a batch of fights as arrays. Fighter stats are (2, lanes) arrays, row PLAYER and row
+    ENEMY, the rest has one entry per lane. After run(), `outcome` is WON, LOST or UNRESOLVED,
+    `turns` counts the player's attacks and `dealt` and `taken` the damage of all attacks
+    """
+
+    __slots__ = (
+        "hp",
+        "max_hp",
+        "atk",
+        "base_atk",
+        "delusion",
+        "segment",
+        "outcome",
+        "turns",
+        "dealt",
+        "taken",
+        "skipped",
+    )
+
+    def __init__(
+        self,
+        player: tuple[np.ndarray, np.ndarray, np.ndarray],
+        enemy: tuple[np.ndarray, np.ndarray, np.ndarray],
+    ) -> None:
+        """`player` and `enemy` are (max HP, ATK, delusion code) arrays, one entry per lane"""
+        lanes = len(player[0])
+
+        self.max_hp = np.array([player[0], enemy[0]], dtype=np.int64)
+        self.hp = self.max_hp.copy()
+        self.atk = np.array([player[1], enemy[1]], dtype=np.int64)
+        self.base_atk = self.atk.copy()
+        self.delusion = np.array([player[2], enemy[2]], dtype=np.int8)
+
+        self.segment = np.full(lanes, BEGIN, dtype=np.int8)
+        self.outcome = np.full(lanes, UNRESOLVED, dtype=np.int8)
+        self.turns = np.zeros(lanes, dtype=np.int32)
+        self.dealt = np.zeros(lanes, dtype=np.int64)
+        self.taken = np.zeros(lanes, dtype=np.int64)
+        self.skipped = np.zeros(lanes, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    def run(self, rng: np.random.Generator, max_turns: int = 100) -> None:
+        """
+        Plays all fights to the end. Ones the player hasn't won or lost in `max_turns` turns stay
+        UNRESOLVED, two Zaps can wither each other's ATK to 0
+        """
+        hp, segment = self.hp, self.segment
+        live = np.ones(len(self), dtype=bool)
+
+        while True:
+            lanes = np.flatnonzero(live)
+            if not len(lanes):
+                return
+
+            # Checked in the same order as in the game
+            won = hp[ENEMY, lanes] <= 0
+            lost = ~won & (hp[PLAYER, lanes] <= 0)
+            self.outcome[lanes[won]] = WON
+            self.outcome[lanes[lost]] = LOST
+            done = won | lost | ((self.turns[lanes] >= max_turns) & (segment[lanes] == BEGIN))
+            live[lanes[done]] = False
+            lanes = lanes[~done]
+
+            at = segment[lanes]
+            begin, end, enemy = lanes[at == BEGIN], lanes[at == END], lanes[at == ENEMY_TURN]
+
+            self.ability(PLAYER, begin, Phase.begin, rng)
+            self.attack(PLAYER, begin, rng)
+            self.turns[begin] += 1
+            segment[begin] = END
+
+            skipped = self.ability(PLAYER, end, Phase.end, rng)
+            segment[end] = np.where(skipped, BEGIN, ENEMY_TURN)
+
+            self.ability(ENEMY, enemy, Phase.begin, rng)
+            self.attack(ENEMY, enemy, rng)
+            skipped = self.ability(ENEMY, enemy, Phase.end, rng)
+            segment[enemy] = np.where(skipped, ENEMY_TURN, BEGIN)
+
+    def ability(self, side: int, lanes: np.ndarray, phase: Phase, rng) -> np.ndarray:
+        """Rolls the `phase` effects of `side`, returns which lanes skipped the other side's turn"""
+        self.skipped[lanes] = False
+        codes = self.delusion[side, lanes]
+        for code, rule in PHASES[phase]:
+            rolled = lanes[codes == code]
+            hit = rolled[rng.random(len(rolled)) <= rule.chance]
+            if len(hit):
+                VECTOR[rule.effect](self, side, 1 - side, hit, rule.amount, None)
+        return self.skipped[lanes]
+
+    def attack(self, side: int, lanes: np.ndarray, rng) -> None:
+        them = 1 - side
+        damage = self.atk[side, lanes]
+        strong = STRONG_CODES[self.delusion[side, lanes]] == self.delusion[them, lanes]
+        damage[strong] = np.floor(damage[strong] * STRONG_MULTIPLIER)
+
+        codes = self.delusion[them, lanes]
+        for code, rule in PHASES[Phase.counter]:
+            rolled = np.flatnonzero(codes == code)
+            hit = rolled[rng.random(len(rolled)) <= rule.chance]
+            if len(hit):
+                effect = VECTOR[rule.effect]
+                damage[hit] = effect(self, them, side, lanes[hit], rule.amount, damage[hit])
+
+        self.hp[them, lanes] -= damage
+        if side == PLAYER:
+            self.dealt[lanes] += damage
+        else:
+            self.taken[lanes] += damage
+
+
+# Array versions of the effects in combat.py, same arguments except that `me` and `them` are rows
+# and `lanes` the lanes the effect triggered in. `damage` is only given to counters
+
+
+def freeze(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    b.hp[them, lanes] -= b.max_hp[them, lanes] * amount // 100
+    b.skipped[lanes] = True
+
+
+def burn(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    b.hp[them, lanes] -= b.atk[me, lanes] * amount // 100
+
+
+def plant(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    max_hp = b.max_hp[me, lanes]
+    b.hp[me, lanes] = np.minimum(b.hp[me, lanes] + max_hp * amount // 100, max_hp)
+    b.atk[me, lanes] += b.base_atk[me, lanes] * amount // 100
+
+
+def mech(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> np.ndarray:
+    b.atk[me, lanes] += b.base_atk[me, lanes] * amount // 100
+    return damage // 2
+
+
+def corrupt(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> np.ndarray:
+    b.hp[them, lanes] -= damage * amount // 100
+    return np.zeros_like(damage)
+
+
+def stun(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    b.skipped[lanes] = True
+
+
+def zap(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    atk = b.atk[them, lanes] - b.base_atk[them, lanes] * amount // 100
+    b.atk[them, lanes] = np.maximum(atk, 0)
+
+
+def drain(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    max_hp = b.max_hp[me, lanes]
+    b.hp[me, lanes] = np.minimum(b.hp[me, lanes] + b.atk[me, lanes] * amount // 100, max_hp)
+
+
+def bleed(b: Batch, me: int, them: int, lanes: np.ndarray, amount: int, damage) -> None:
+    b.hp[them, lanes] -= b.max_hp[them, lanes] * amount // 100
+
+
+VECTOR = {
+    combat.freeze: freeze,
+    combat.burn: burn,
+    combat.plant: plant,
+    combat.mech: mech,
+    combat.corrupt: corrupt,
+    combat.stun: stun,
+    combat.zap: zap,
+    combat.drain: drain,
+    combat.bleed: bleed,
+}
+
+# The delusions whose effects roll in each phase, as codes, with their rules
+PHASES = {
+    phase: [(CODES[d], rule) for d, rule in RULES.items() if rule.phase == phase]
+    for phase in (Phase.begin, Phase.end, Phase.counter)
+}
@@ -0,0 +1,172 @@
+from typing import TYPE_CHECKING, Iterator, Protocol, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .parser import Tile
+
+# Tile ids are stored in one byte per cell
+MAX_TILE_ID = 255
+
+# Tile id read for every cell outside of the map
+VOID = 0
+
+
+class GameMap(Protocol):
+    """What Game needs from a map: TileMap for maps in memory, ChunkedWorld for streamed ones"""
+
+    height: int
+    width: int
+    tiles: Sequence["Tile | None"]
+
+    def get(self, y: int, x: int) -> int:
+        ...
+
+    def set(self, y: int, x: int, id: int) -> None:
+        ...
+
+    def tile(self, y: int, x: int) -> "Tile":
+        ...
+
+    def span(self, y: int, left: int, right: int) -> bytes:
+        ...
+
+    def prefetch(self, top: int, left: int, height: int, width: int, dy: int, dx: int) -> None:
+        ...
+
+
+class TileRow:
+    """
+    Read only view of one TileMap row so `game_map[y][x].id` keeps working
+    """
+
+    __slots__ = ("_map", "_start")
+
+    def __init__(self, tile_map: "TileMap", y: int) -> None:
+        self._map = tile_map
+        self._start = y * tile_map.width
+
+    def __len__(self) -> int:
+        return self._map.width
+
+    def __getitem__(self, x: int) -> "Tile":
+        if not 0 <= x < self._map.width:
+            raise IndexError("TileRow index out of range")
+        return self._map.tiles[self._map.data[self._start + x]]
+
+    def __iter__(self) -> Iterator["Tile"]:
+        tiles = self._map.tiles
+        return (tiles[id] for id in self._map.data[self._start : self._start + self._map.width])
+
+
+class TileMap:
+    """
+    2D grid of tile ids backed by one contiguous byte buffer in row-major order.
+    Static tile attributes (glyph, colour, barrier) live in the `tiles` side table, indexed by id.
+    Reads outside of the map return VOID, so there is no need to store padding around it
+    """
+
+    __slots__ = ("height", "width", "data", "tiles")
+
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        tiles: Sequence["Tile | None"],
+        data: bytearray | memoryview | None = None,
+        fill: int = 0,
+    ) -> None:
+        if data is None:
+            data = bytearray([fill]) * (height * width)
+        if len(data) != height * width:
+            raise ValueError(f"Expected {height * width} cells, got {len(data)}")
+
+        self.height = height
+        self.width = width
+        self.data = data
+        self.tiles = tiles
+
+    @classmethod
+    def from_array(cls, ids: np.ndarray, tiles: Sequence["Tile | None"]) -> "TileMap":
+        """
+        Builds a TileMap from a 2D array of tile ids. A C-contiguous uint8 array (like the memory
+        mapped map cache) is used in place, anything else is copied
+        """
+        height, width = ids.shape
+
+        if ids.dtype == np.uint8 and ids.flags.c_contiguous and ids.flags.writeable:
+            return cls(height, width, tiles, memoryview(ids).cast("B"))
+
+        if ids.size and int(ids.max()) > MAX_TILE_ID:
+            raise ValueError(f"Tile ids must fit in a byte, got {int(ids.max())}")
+
+        return cls(height, width, tiles, bytearray(ids.astype(np.uint8).tobytes()))
+
+    def get(self, y: int, x: int) -> int:
+        """Tile id at (y, x), VOID if that is outside of the map"""
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return self.data[y * self.width + x]
+        return VOID
+
+    def set(self, y: int, x: int, id: int) -> None:
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise IndexError(f"({y}, {x}) is outside of the map")
+        self.data[y * self.width + x] = id
+
+    def tile(self, y: int, x: int) -> "Tile":
+        """Tile prototype at (y, x)"""
+        return self.tiles[self.get(y, x)]  # type: ignore
+
+    def span(self, y: int, left: int, right: int) -> bytes:
+        """Tile ids of row y from column left up to right, VOID for the cells outside of the map"""
+        lo, hi = max(left, 0), min(right, self.width)
+        if not 0 <= y < self.height or lo >= hi:
+            return bytes([VOID]) * (right - left)
+
+        start = y * self.width
+        return b"".join(
+            (
+                bytes([VOID]) * (lo - left),
+                self.data[start + lo : start + hi],
+                bytes([VOID]) * (right - hi),
+            )
+        )
+
+    def prefetch(self, top: int, left: int, height: int, width: int, dy: int, dx: int) -> None:
+        """The whole map is in memory already"""
+
+    def row(self, y: int) -> memoryview:
+        """Zero copy view of the tile ids in row y"""
+        return memoryview(self.data)[y * self.width : (y + 1) * self.width]
+
+    def rows(self) -> Iterator[memoryview]:
+        view = memoryview(self.data)
+        for start in range(0, self.height * self.width, self.width):
+            yield view[start : start + self.width]
+
+    def ids(self) -> np.ndarray:
+        """Zero copy (height, width) NumPy view of the grid, writes go through to the map"""
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.height, self.width)
+
+    def find(self, id: int) -> list[tuple[int, int]]:
+        """(y, x) of every cell with the given tile id, in row-major order"""
+        ys, xs = np.nonzero(self.ids() == id)
+        return list(zip(ys.tolist(), xs.tolist()))
+
+    def count(self, id: int) -> int:
+        return int(np.count_nonzero(self.ids() == id))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> TileRow:
+        if not 0 <= y < self.height:
+            raise IndexError("TileMap index out of range")
+        return TileRow(self, y)
+
+    def __iter__(self) -> Iterator[TileRow]:
+        return (TileRow(self, y) for y in range(self.height))
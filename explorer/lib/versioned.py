@@ -0,0 +1,21 @@
+from typing import Type, TypeVar
+
+T = TypeVar("T")
+
+
+def versioned(cls: Type[T]) -> Type[T]:
+    """
+    Class decorator counting changes to an object in its `version` attribute, which the class
+    declares with a default of 0. Every assignment to a public attribute bumps it, so a view can
+    tell whether anything changed since it last drew the object. Mutating a list attribute in
+    place doesn't go through assignment, bump `version` by hand after doing that
+    """
+    setattr_ = cls.__setattr__
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr_(self, name, value)
+        if name != "version" and not name.startswith("_"):
+            setattr_(self, "version", self.version + 1)  # type: ignore
+
+    cls.__setattr__ = __setattr__  # type: ignore
+    return cls
@@ -0,0 +1,281 @@
+import mmap
+import queue
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+import numpy as np
+
+from .tilemap import VOID
+
+if TYPE_CHECKING:
+    from .parser import Tile
+
+MAGIC = b"EXPLWRLD"
+VERSION = 1
+# magic, version, height, width, chunk size
+HEADER = struct.Struct("<8sIIII")
+# Per chunk, in row-major chunk order: offset of the compressed chunk in the file, its length
+INDEX_ENTRY = np.dtype([("offset", "<u8"), ("length", "<u4")])
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def write_world(
+    path: Path,
+    height: int,
+    width: int,
+    chunk_at: Callable[[int, int], np.ndarray],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    """
+    Writes a chunked world file. `chunk_at(cy, cx)` returns the tile ids of one chunk, so worlds
+    far larger than memory can be generated or converted one chunk at a time. Chunks on the
+    bottom and right edges may be smaller than chunk_size
+    """
+    if chunk_size & (chunk_size - 1):
+        raise ValueError("chunk_size must be a power of two")
+
+    rows = -(-height // chunk_size)
+    cols = -(-width // chunk_size)
+    index = np.zeros(rows * cols, dtype=INDEX_ENTRY)
+    offset = HEADER.size + index.nbytes
+
+    with open(path, "wb") as f:
+        f.seek(offset)
+
+        for cy in range(rows):
+            for cx in range(cols):
+                chunk = np.full((chunk_size, chunk_size), VOID, dtype=np.uint8)
+                ids = chunk_at(cy, cx)
+                chunk[: ids.shape[0], : ids.shape[1]] = ids
+
+                data = zlib.compress(chunk.tobytes(), 6)
+                index[cy * cols + cx] = (offset, len(data))
+                f.write(data)
+                offset += len(data)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, height, width, chunk_size))
+        f.write(index.tobytes())
+
+
+def write_world_array(path: Path, ids: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """write_world for a 2D array of tile ids (np.memmap works for arrays bigger than memory)"""
+    height, width = ids.shape
+
+    def chunk_at(cy: int, cx: int) -> np.ndarray:
+        y, x = cy * chunk_size, cx * chunk_size
+        return ids[y : y + chunk_size, x : x + chunk_size]
+
+    write_world(path, height, width, chunk_at, chunk_size)
+
+
+class ChunkedWorld:
+    """
+    Game map streamed from a chunked world file. Chunks are decompressed the first time a cell in
+    them is read, kept in an LRU cache of `capacity` chunks and evicted when the camera moves
+    away. A background thread decodes chunks in the direction of travel ahead of time (see
+    prefetch). Modified chunks are pinned in memory so edits are never lost to eviction.
+
+    Exposes the same get/set/tile interface as TileMap
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        tiles: Sequence["Tile | None"],
+        capacity: int = 256,
+        prefetch_margin: int = 1,
+    ) -> None:
+        with open(path, "rb") as f:
+            self._file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, height, width, chunk_size = HEADER.unpack_from(self._file)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} world file")
+
+        self.height = height
+        self.width = width
+        self.tiles = tiles
+        self.chunk_size = chunk_size
+        self.chunk_rows = -(-height // chunk_size)
+        self.chunk_cols = -(-width // chunk_size)
+        self._shift = chunk_size.bit_length() - 1
+        self._mask = chunk_size - 1
+        # Copied out of the mapping so the file can be closed
+        self._index = np.frombuffer(
+            self._file,
+            dtype=INDEX_ENTRY,
+            count=self.chunk_rows * self.chunk_cols,
+            offset=HEADER.size,
+        ).copy()
+
+        self.capacity = capacity
+        self.prefetch_margin = prefetch_margin
+        self._cache: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+        self._dirty: dict[tuple[int, int], bytearray] = {}
+        self._lock = threading.Lock()
+
+        # Most recently used chunk, most reads land in the same chunk as the previous one
+        self._last_key: tuple[int, int] | None = None
+        self._last_chunk: bytes | bytearray = b""
+
+        self.stats = {"loads": 0, "prefetched": 0, "evictions": 0}
+
+        self._queue: queue.SimpleQueue[tuple[int, int] | None] = queue.SimpleQueue()
+        self._queued: set[tuple[int, int]] = set()
+        self._prefetch_state: tuple[int, ...] = ()
+        self._worker = threading.Thread(target=self._prefetch_worker, daemon=True)
+        self._worker.start()
+
+    def _decode(self, key: tuple[int, int]) -> bytes:
+        offset, length = self._index[key[0] * self.chunk_cols + key[1]].tolist()
+        return zlib.decompress(self._file[offset : offset + length])
+
+    def _insert(self, key: tuple[int, int], chunk: bytes) -> None:
+        """Adds a chunk to the LRU cache, caller holds the lock"""
+        self._cache[key] = chunk
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _chunk(self, key: tuple[int, int]) -> bytes | bytearray:
+        chunk: bytes | bytearray | None = self._dirty.get(key)
+
+        if chunk is None:
+            with self._lock:
+                chunk = self._cache.get(key)
+                if chunk is not None:
+                    self._cache.move_to_end(key)
+
+            if chunk is None:
+                chunk = self._decode(key)
+                self.stats["loads"] += 1
+                with self._lock:
+                    self._insert(key, chunk)
+
+        self._last_key = key
+        self._last_chunk = chunk
+        return chunk
+
+    def get(self, y: int, x: int) -> int:
+        """Tile id at (y, x), VOID if that is outside of the world"""
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            return VOID
+
+        key = (y >> self._shift, x >> self._shift)
+        chunk = self._last_chunk if key == self._last_key else self._chunk(key)
+        return chunk[((y & self._mask) << self._shift) | (x & self._mask)]
+
+    def set(self, y: int, x: int, id: int) -> None:
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise IndexError(f"({y}, {x}) is outside of the world")
+
+        key = (y >> self._shift, x >> self._shift)
+        chunk = self._dirty.get(key)
+        if chunk is None:
+            chunk = self._dirty[key] = bytearray(self._chunk(key))
+            self._last_key = key
+            self._last_chunk = chunk
+
+        chunk[((y & self._mask) << self._shift) | (x & self._mask)] = id
+
+    def tile(self, y: int, x: int) -> "Tile":
+        return self.tiles[self.get(y, x)]  # type: ignore
+
+    def span(self, y: int, left: int, right: int) -> bytes:
+        """Tile ids of row y from column left up to right, VOID outside of the world"""
+        lo, hi = max(left, 0), min(right, self.width)
+        if not 0 <= y < self.height or lo >= hi:
+            return bytes([VOID]) * (right - left)
+
+        parts = [bytes([VOID]) * (lo - left)]
+        cy = y >> self._shift
+        row = (y & self._mask) << self._shift
+        x = lo
+        while x < hi:
+            key = (cy, x >> self._shift)
+            chunk = self._last_chunk if key == self._last_key else self._chunk(key)
+            end = min((key[1] + 1) << self._shift, hi)
+            start = row | (x & self._mask)
+            parts.append(chunk[start : start + end - x])
+            x = end
+        parts.append(bytes([VOID]) * (right - hi))
+        return b"".join(parts)
+
+    def prefetch(self, top: int, left: int, height: int, width: int, dy: int, dx: int) -> None:
+        """
+        Queues the chunks around the viewport (top, left, height, width) for background decoding,
+        reaching prefetch_margin chunks further in the direction of travel (dy, dx)
+        """
+        cs = self.chunk_size
+        # Nothing new to queue until the viewport crosses into another chunk
+        state = (top // cs, left // cs, (top + height) // cs, (left + width) // cs, dy, dx)
+        if state == self._prefetch_state:
+            return
+        self._prefetch_state = state
+
+        margin = self.prefetch_margin * cs
+
+        top2, bottom = top, top + height
+        left2, right = left, left + width
+        if dy < 0:
+            top2 -= margin
+        elif dy > 0:
+            bottom += margin
+        if dx < 0:
+            left2 -= margin
+        elif dx > 0:
+            right += margin
+
+        for cy in range(max(top2 // cs, 0), min((bottom - 1) // cs, self.chunk_rows - 1) + 1):
+            for cx in range(max(left2 // cs, 0), min((right - 1) // cs, self.chunk_cols - 1) + 1):
+                key = (cy, cx)
+                if key in self._cache or key in self._dirty or key in self._queued:
+                    continue
+                self._queued.add(key)
+                self._queue.put(key)
+
+    def _prefetch_worker(self) -> None:
+        while (key := self._queue.get()) is not None:
+            try:
+                if key in self._cache or key in self._dirty:
+                    continue
+                # zlib releases the GIL while inflating, so this overlaps with the game loop
+                chunk = self._decode(key)
+                with self._lock:
+                    if key not in self._cache:
+                        self._insert(key, chunk)
+                        self.stats["prefetched"] += 1
+            finally:
+                self._queued.discard(key)
+
+    def close(self) -> None:
+        """Stops the prefetch thread and unmaps the file"""
+        self._queue.put(None)
+        self._worker.join()
+        self._file.close()
+
+    @property
+    def resident_chunks(self) -> int:
+        return len(self._cache) + len(self._dirty)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from PIL import Image
+
+    from .palette import decode_image
+
+    parser = argparse.ArgumentParser(description="Converts a map image into a chunked world file")
+    parser.add_argument("image", type=Path)
+    parser.add_argument("world", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    write_world_array(args.world, decode_image(Image.open(args.image)), args.chunk_size)
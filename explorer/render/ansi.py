@@ -0,0 +1,168 @@
+import curses
+import os
+import select
+import termios
+import tty
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from .headless import HeadlessBackend
+
+# Alternate screen, no cursor, no autowrap so the bottom right cell can't scroll, blank screen
+ENTER = "\x1b[?1049h\x1b[?25l\x1b[?7l\x1b[0m\x1b[2J"
+LEAVE = "\x1b[0m\x1b[?7h\x1b[?25h\x1b[?1049l"
+
+# Curses attributes the game can use and their SGR parameters
+ATTRIBUTES = (
+    (curses.A_BOLD, "1"),
+    (curses.A_DIM, "2"),
+    (curses.A_UNDERLINE, "4"),
+    (curses.A_REVERSE, "7"),
+)
+
+
+class AnsiBackend(HeadlessBackend):
+    """
+    Writes frames to the terminal with escape sequences instead of going through curses.
+    Surfaces and composing are HeadlessBackend's, and its last frame is the cell grid of what the
+    terminal shows. doupdate diffs the new frame against it and writes only the changed cells,
+    moving the cursor only between runs of them and changing colours only between cells with
+    different attributes, in one os.write. Use it through ansi_terminal()
+    """
+
+    def __init__(self, height: int, width: int, output: int = 1, input: int = 0) -> None:
+        super().__init__(height, width)
+        self.output = output
+        self.input = input
+
+        # SGR sequence for each attribute value seen so far
+        self.sgr: dict[int, str] = {}
+        # What the terminal is at, kept across frames. None when the cursor position is unknown
+        self.cursor: tuple[int, int] | None = None
+        self.attr = 0
+
+        # Bytes written by the last frame and in total
+        self.frame_bytes = 0
+        self.total_bytes = 0
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        super().init_pair(pair, fg, bg)
+        self.sgr.clear()
+
+    def style(self, attr: int) -> str:
+        try:
+            return self.sgr[attr]
+        except KeyError:
+            pass
+
+        # -1 is the terminal's own colour, as with curses.use_default_colors()
+        fg, bg = self.pairs.get((attr & curses.A_COLOR) >> 8, (-1, -1))
+        params = ["0"] + [code for bit, code in ATTRIBUTES if attr & bit]
+        if fg >= 0:
+            params.append(f"38;5;{fg}")
+        if bg >= 0:
+            params.append(f"48;5;{bg}")
+
+        sgr = self.sgr[attr] = f"\x1b[{';'.join(params)}m"
+        return sgr
+
+    def move(self, y: int, x: int) -> str:
+        cursor = self.cursor
+        if cursor == (y, x):
+            return ""
+        if cursor is not None and cursor[0] == y and cursor[1] < x:
+            return f"\x1b[{x - cursor[1]}C"
+        return f"\x1b[{y + 1};{x + 1}H"
+
+    def diff(self) -> tuple[str, int]:
+        """Escape sequences turning the last frame into the composed one, and the changed cells"""
+        width = self.width
+        changed = (self.chars != self.frame_chars) | (self.attrs != self.frame_attrs)
+
+        # Rewriting one unchanged cell is cheaper than moving the cursor over it
+        cells = changed.copy()
+        cells[:, 1:-1] |= changed[:, :-2] & changed[:, 2:]
+
+        # Flat indices of the cells to write, split where a run of them starts, either after a
+        # gap or on a new row, and where the attributes change within a run
+        index = np.flatnonzero(cells)
+        if not len(index):
+            return "", 0
+        attrs = self.attrs.ravel()[index]
+        runs = np.empty(len(index), dtype=bool)
+        runs[0] = True
+        runs[1:] = (np.diff(index) != 1) | (index[1:] % width == 0)
+        splits = runs.copy()
+        splits[1:] |= attrs[1:] != attrs[:-1]
+        starts = np.flatnonzero(splits)
+
+        text = self.chars.ravel()[index].tobytes().decode("utf-32-le")
+        out = []
+        ends = starts[1:].tolist() + [len(index)]
+        for start, end, run, pos, attr in zip(
+            starts.tolist(),
+            ends,
+            runs[starts].tolist(),
+            index[starts].tolist(),
+            attrs[starts].tolist(),
+        ):
+            if run:
+                out.append(self.move(*divmod(pos, width)))
+            if attr != self.attr:
+                out.append(self.style(attr))
+                self.attr = attr
+            out.append(text[start:end])
+
+            # Past the last column the terminal's cursor position isn't well defined
+            y, x = divmod(pos + end - start, width)
+            self.cursor = (y, x) if x else None
+
+        return "".join(out), int(np.count_nonzero(changed))
+
+    def doupdate(self) -> None:
+        text, changed = self.diff()
+        self.frame_chars[:] = self.chars
+        self.frame_attrs[:] = self.attrs
+
+        data = text.encode()
+        self.frame_bytes = len(data)
+        self.total_bytes += len(data)
+        while data:
+            data = data[os.write(self.output, data) :]
+
+        self.stats.end_frame(changed)
+
+    def resized(self) -> tuple[int, int]:
+        width, height = os.get_terminal_size(self.output)
+        self.allocate(height, width)
+
+        # Terminals differ in what they keep on a resize, so start over from a blank screen
+        os.write(self.output, b"\x1b[0m\x1b[2J")
+        self.attr = 0
+        self.cursor = None
+        return height, width
+
+    def getch(self) -> int:
+        """Next byte typed, -1 when there is none. Never blocks"""
+        if not self.keys and select.select([self.input], [], [], 0)[0]:
+            self.keys.extend(os.read(self.input, 1024))
+        return self.keys.popleft() if self.keys else -1
+
+
+@contextmanager
+def ansi_terminal(output: int = 1, input: int = 0) -> Iterator[AnsiBackend]:
+    """
+    Sets the terminal up for AnsiBackend like curses.wrapper does for curses: keys are read as
+    they are typed without echo, and the screen is restored on the way out
+    """
+    mode = termios.tcgetattr(input)
+    tty.setcbreak(input)
+    os.write(output, ENTER.encode())
+    try:
+        width, height = os.get_terminal_size(output)
+        yield AnsiBackend(height, width, output, input)
+    finally:
+        os.write(output, LEAVE.encode())
+        termios.tcsetattr(input, termios.TCSADRAIN, mode)
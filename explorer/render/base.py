@@ -0,0 +1,124 @@
+from typing import Protocol
+
+
+class Surface(Protocol):
+    """
+    The part of the curses window API the game draws with. Curses windows and pads are surfaces
+    as they are, other backends implement the same calls with the same semantics
+    """
+
+    def addstr(self, *args) -> None:
+        ...
+
+    def addch(self, *args) -> None:
+        ...
+
+    def insstr(self, *args) -> None:
+        ...
+
+    def delch(self, *args) -> None:
+        ...
+
+    def move(self, y: int, x: int) -> None:
+        ...
+
+    def getyx(self) -> tuple[int, int]:
+        ...
+
+    def erase(self) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def clrtobot(self) -> None:
+        ...
+
+    def scroll(self, lines: int = 1) -> None:
+        ...
+
+    def scrollok(self, flag: bool) -> None:
+        ...
+
+    def bkgd(self, ch: str, attr: int = 0) -> None:
+        ...
+
+    def attron(self, attr: int) -> None:
+        ...
+
+    def attroff(self, attr: int) -> None:
+        ...
+
+    def noutrefresh(self, *args) -> None:
+        ...
+
+    def nodelay(self, flag: bool) -> None:
+        ...
+
+    def getch(self) -> int:
+        ...
+
+
+class FrameStats:
+    """
+    Counts what frames cost: surface calls made, cells written into surfaces by those calls, and
+    cells that ended up different on the screen. Backends that can't see a number leave it at 0
+    """
+
+    __slots__ = ("frames", "calls", "cells", "last", "total_calls", "total_cells", "total_changed")
+
+    def __init__(self) -> None:
+        self.frames = 0
+        # Counts for the frame being drawn, end_frame() moves them to `last` and the totals
+        self.calls = 0
+        self.cells = 0
+        # (calls, cells, changed) of the last frame
+        self.last = (0, 0, 0)
+        self.total_calls = 0
+        self.total_cells = 0
+        self.total_changed = 0
+
+    def end_frame(self, changed: int = 0) -> None:
+        self.last = (self.calls, self.cells, changed)
+        self.frames += 1
+        self.total_calls += self.calls
+        self.total_cells += self.cells
+        self.total_changed += changed
+        self.calls = self.cells = 0
+
+
+class Backend(Protocol):
+    """
+    Where frames go. Hands out the surfaces the game draws into, owns the colour pairs, and
+    composes what the surfaces copied with noutrefresh into a frame on doupdate
+    """
+
+    stdscr: Surface
+    stats: FrameStats
+
+    def size(self) -> tuple[int, int]:
+        """Height and width of the screen"""
+        ...
+
+    def start(self) -> None:
+        """Called once before the first frame, after the screen was cleared"""
+        ...
+
+    def resized(self) -> tuple[int, int]:
+        """Called after the terminal was resized, adapts the screen and returns its new size"""
+        ...
+
+    def newpad(self, height: int, width: int) -> Surface:
+        ...
+
+    def newwin(self, height: int, width: int, y: int, x: int) -> Surface:
+        ...
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        ...
+
+    def color_pair(self, pair: int) -> int:
+        ...
+
+    def doupdate(self) -> None:
+        ...
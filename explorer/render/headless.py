@@ -0,0 +1,333 @@
+import curses
+from collections import deque
+from typing import Iterable
+
+import numpy as np
+
+from .base import FrameStats
+
+# Screen size of the headless backend when none is given, as (height, width)
+SIZE = (40, 120)
+
+BLANK = ord(" ")
+
+
+def codes(text: str) -> np.ndarray:
+    """Code points of `text`, one per cell"""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class Buffer:
+    """
+    Surface writing into arrays of code points and attributes. Follows curses where the game
+    relies on it: the cursor, newlines clearing the rest of the line, wrapping at the right edge,
+    erroring at the bottom unless scrollok, window backgrounds, and noutrefresh for windows and
+    pads
+    """
+
+    __slots__ = (
+        "backend",
+        "stats",
+        "height",
+        "width",
+        "y",
+        "x",
+        "chars",
+        "attrs",
+        "cy",
+        "cx",
+        "attr",
+        "blank",
+        "bg",
+        "scrolling",
+    )
+
+    def __init__(self, backend: "HeadlessBackend", height: int, width: int, y=0, x=0) -> None:
+        self.backend = backend
+        self.stats = backend.stats
+        self.height = height
+        self.width = width
+        # Where noutrefresh() without arguments copies the buffer to, pads are placed by the caller
+        self.y = y
+        self.x = x
+
+        self.chars = np.full((height, width), BLANK, dtype=np.uint32)
+        self.attrs = np.zeros((height, width), dtype=np.uint32)
+
+        # Cursor, attributes set with attron and the background set with bkgd
+        self.cy = self.cx = 0
+        self.attr = 0
+        self.blank = BLANK
+        self.bg = 0
+        self.scrolling = False
+
+    def _args(self, args: tuple) -> tuple:
+        """(text, attr) from the (text), (text, attr), (y, x, text) and (y, x, text, attr) forms"""
+        if len(args) >= 3:
+            self._move(args[0], args[1])
+            args = args[2:]
+        return args[0], args[1] if len(args) > 1 else 0
+
+    def _move(self, y: int, x: int) -> None:
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error(f"move({y}, {x}) is outside of a {self.height}x{self.width} window")
+        self.cy, self.cx = y, x
+
+    def _attr(self, attr: int) -> int:
+        """Attributes a cell written with `attr` gets, like curses merges them"""
+        if attr & curses.A_COLOR:
+            return attr | (self.attr & ~curses.A_COLOR)
+        attr |= self.attr
+        if not attr & curses.A_COLOR:
+            attr |= self.bg & curses.A_COLOR
+        return attr
+
+    def _next_line(self) -> None:
+        self.cx = 0
+        if self.cy + 1 < self.height:
+            self.cy += 1
+        elif self.scrolling:
+            self._scroll(1)
+        else:
+            raise curses.error("wrote past the bottom of a window without scrollok")
+
+    def _write(self, text: str, attr: int) -> None:
+        attr = self._attr(attr)
+        for i, line in enumerate(text.split("\n")):
+            if i:
+                self._clear(self.cy, self.cx, self.cy + 1)
+                self._next_line()
+
+            while line:
+                n = min(len(line), self.width - self.cx)
+                self.chars[self.cy, self.cx : self.cx + n] = codes(line[:n])
+                self.attrs[self.cy, self.cx : self.cx + n] = attr
+                self.stats.cells += n
+                self.cx += n
+                line = line[n:]
+                if self.cx == self.width:
+                    self._next_line()
+
+    def _clear(self, y: int, x: int, bottom: int) -> None:
+        """Blanks row y from x on, and every row after it until `bottom`"""
+        self.chars[y, x:] = self.blank
+        self.attrs[y, x:] = self.bg
+        self.chars[y + 1 : bottom] = self.blank
+        self.attrs[y + 1 : bottom] = self.bg
+
+    def _scroll(self, lines: int) -> None:
+        if lines > 0:
+            self.chars[:-lines] = self.chars[lines:].copy()
+            self.attrs[:-lines] = self.attrs[lines:].copy()
+            self._clear(self.height - lines, 0, self.height)
+        elif lines < 0:
+            self.chars[-lines:] = self.chars[:lines].copy()
+            self.attrs[-lines:] = self.attrs[:lines].copy()
+            self._clear(0, 0, -lines)
+
+    def addstr(self, *args) -> None:
+        self.stats.calls += 1
+        text, attr = self._args(args)
+        self._write(text, attr)
+
+    def addch(self, *args) -> None:
+        self.stats.calls += 1
+        ch, attr = self._args(args)
+        self._write(ch if isinstance(ch, str) else chr(ch), attr)
+
+    def insstr(self, *args) -> None:
+        """Inserts before the cursor, pushing the rest of the line right. The cursor stays"""
+        self.stats.calls += 1
+        text, attr = self._args(args)
+        y, x = self.cy, self.cx
+        n = min(len(text), self.width - x)
+        if not n:
+            return
+
+        self.chars[y, x + n :] = self.chars[y, x : self.width - n].copy()
+        self.attrs[y, x + n :] = self.attrs[y, x : self.width - n].copy()
+        self.chars[y, x : x + n] = codes(text[:n])
+        self.attrs[y, x : x + n] = self._attr(attr)
+        self.stats.cells += n
+
+    def delch(self, *args) -> None:
+        """Deletes the cell under the cursor, pulling the rest of the line left"""
+        self.stats.calls += 1
+        if args:
+            self._move(*args)
+        y, x = self.cy, self.cx
+        self.chars[y, x:-1] = self.chars[y, x + 1 :].copy()
+        self.attrs[y, x:-1] = self.attrs[y, x + 1 :].copy()
+        self.chars[y, -1] = self.blank
+        self.attrs[y, -1] = self.bg
+
+    def move(self, y: int, x: int) -> None:
+        self.stats.calls += 1
+        self._move(y, x)
+
+    def resize(self, height: int, width: int) -> None:
+        """Keeps what fits of the content, new cells are blank"""
+        self.stats.calls += 1
+        chars = np.full((height, width), self.blank, dtype=np.uint32)
+        attrs = np.full((height, width), self.bg, dtype=np.uint32)
+        rows, cols = min(height, self.height), min(width, self.width)
+        chars[:rows, :cols] = self.chars[:rows, :cols]
+        attrs[:rows, :cols] = self.attrs[:rows, :cols]
+
+        self.height, self.width = height, width
+        self.chars, self.attrs = chars, attrs
+        self.cy, self.cx = min(self.cy, height - 1), min(self.cx, width - 1)
+
+    def getyx(self) -> tuple[int, int]:
+        return self.cy, self.cx
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def erase(self) -> None:
+        self.stats.calls += 1
+        self._clear(0, 0, self.height)
+        self.cy = self.cx = 0
+
+    clear = erase
+
+    def clrtoeol(self) -> None:
+        self.stats.calls += 1
+        self._clear(self.cy, self.cx, self.cy + 1)
+
+    def clrtobot(self) -> None:
+        self.stats.calls += 1
+        self._clear(self.cy, self.cx, self.height)
+
+    def scroll(self, lines: int = 1) -> None:
+        self.stats.calls += 1
+        if not self.scrolling:
+            raise curses.error("scroll() needs scrollok(True)")
+        self._scroll(lines)
+
+    def scrollok(self, flag: bool) -> None:
+        self.scrolling = flag
+
+    def bkgd(self, ch: str, attr: int = 0) -> None:
+        """Sets the background, blank cells take the new one"""
+        self.stats.calls += 1
+        blank = (self.chars == self.blank) & (self.attrs == self.bg)
+        self.blank, self.bg = ord(ch), attr
+        self.chars[blank] = self.blank
+        self.attrs[blank] = self.bg
+
+    def attron(self, attr: int) -> None:
+        self.attr |= attr
+
+    def attroff(self, attr: int) -> None:
+        self.attr &= ~attr
+
+    def noutrefresh(self, *args) -> None:
+        """
+        Copies the buffer to the backend's screen: all of it to (y, x) for windows, the part
+        starting at (pminrow, pmincol) to the screen rectangle given for pads
+        """
+        self.stats.calls += 1
+        if args:
+            top, left, sy, sx, ey, ex = args
+        else:
+            top, left, sy, sx = 0, 0, self.y, self.x
+            ey, ex = sy + self.height - 1, sx + self.width - 1
+
+        screen = self.backend
+        rows = min(ey + 1, screen.height) - sy
+        cols = min(ex + 1, screen.width) - sx
+        rows, cols = min(rows, self.height - top), min(cols, self.width - left)
+        if rows <= 0 or cols <= 0:
+            return
+
+        dst = (slice(sy, sy + rows), slice(sx, sx + cols))
+        src = (slice(top, top + rows), slice(left, left + cols))
+        screen.chars[dst] = self.chars[src]
+        screen.attrs[dst] = self.attrs[src]
+
+    def nodelay(self, flag: bool) -> None:
+        pass
+
+    def getch(self) -> int:
+        return self.backend.getch()
+
+
+class HeadlessBackend:
+    """
+    Renders into memory instead of a terminal, for tests and benchmarks. Surfaces are Buffers,
+    noutrefresh composes them into a screen of a fixed size, and doupdate turns that into the
+    frame, counting how many cells changed. Input comes from feed()
+    """
+
+    def __init__(self, height: int = SIZE[0], width: int = SIZE[1]) -> None:
+        self.stats = FrameStats()
+        self.pairs: dict[int, tuple[int, int]] = {}
+        self.keys: deque[int] = deque()
+
+        self.stdscr = Buffer(self, height, width)
+        self.allocate(height, width)
+
+    def allocate(self, height: int, width: int) -> None:
+        """(Re)creates the screen, which starts out blank"""
+        self.height = height
+        self.width = width
+
+        # What noutrefresh composed since the last doupdate, and the last frame
+        self.chars = np.full((height, width), BLANK, dtype=np.uint32)
+        self.attrs = np.zeros((height, width), dtype=np.uint32)
+        self.frame_chars = self.chars.copy()
+        self.frame_attrs = self.attrs.copy()
+
+        if self.stdscr.getmaxyx() != (height, width):
+            self.stdscr.resize(height, width)
+
+    def size(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def resize(self, height: int, width: int) -> None:
+        """Acts like the terminal was resized, the game picks it up with KEY_RESIZE"""
+        self.allocate(height, width)
+
+    def resized(self) -> tuple[int, int]:
+        return self.size()
+
+    def start(self) -> None:
+        pass
+
+    def newpad(self, height: int, width: int) -> Buffer:
+        return Buffer(self, height, width)
+
+    def newwin(self, height: int, width: int, y: int, x: int) -> Buffer:
+        return Buffer(self, height, width, y, x)
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        if not 0 < pair <= curses.A_COLOR >> 8:
+            raise ValueError(f"Colour pair {pair} doesn't fit in the attribute bits")
+        self.pairs[pair] = (fg, bg)
+
+    def color_pair(self, pair: int) -> int:
+        # Same encoding as curses, so attributes can be compared across backends
+        return pair << 8
+
+    def doupdate(self) -> None:
+        changed = (self.chars != self.frame_chars) | (self.attrs != self.frame_attrs)
+        self.frame_chars[:] = self.chars
+        self.frame_attrs[:] = self.attrs
+        self.stats.end_frame(int(np.count_nonzero(changed)))
+
+    def getch(self) -> int:
+        """Next key given to feed(), -1 when there is none"""
+        return self.keys.popleft() if self.keys else -1
+
+    def feed(self, keys: Iterable[int | str]) -> None:
+        """Queues keys for getch, as key codes or characters"""
+        self.keys.extend(k if isinstance(k, int) else ord(k) for k in keys)
+
+    def text(self) -> list[str]:
+        """The last frame, one string per row"""
+        return [row.tobytes().decode("utf-32-le") for row in self.frame_chars]
+
+    def pair_at(self, y: int, x: int) -> int:
+        """Colour pair of a cell of the last frame"""
+        return (int(self.frame_attrs[y, x]) & curses.A_COLOR) >> 8
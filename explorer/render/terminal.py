@@ -0,0 +1,73 @@
+import curses
+import os
+from typing import Any
+
+from .base import FrameStats
+
+
+class Counted:
+    """Passes calls on to a curses window, counting them and the characters they write"""
+
+    __slots__ = ("window", "stats")
+
+    def __init__(self, window: curses.window, stats: FrameStats) -> None:
+        self.window = window
+        self.stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.window, name)
+        stats = self.stats
+
+        def counted(*args):
+            stats.calls += 1
+            stats.cells += sum(len(a) for a in args if isinstance(a, str))
+            return method(*args)
+
+        return counted
+
+
+class CursesBackend:
+    """
+    Renders with curses, surfaces are the curses windows and pads themselves. With `count` they
+    are wrapped to fill in calls and cells of the frame stats, which costs a bit on every call.
+    Curses doesn't tell what it sent to the terminal, so changed cells stay 0
+    """
+
+    def __init__(self, stdscr: curses.window, count: bool = False) -> None:
+        self.stats = FrameStats()
+        self.count = count
+        self.stdscr = self.wrap(stdscr)
+
+    def wrap(self, window: curses.window) -> Any:
+        return Counted(window, self.stats) if self.count else window
+
+    def size(self) -> tuple[int, int]:
+        return self.stdscr.getmaxyx()
+
+    def start(self) -> None:
+        curses.curs_set(0)
+        curses.start_color()
+        curses.use_default_colors()
+
+    def resized(self) -> tuple[int, int]:
+        width, height = os.get_terminal_size()
+        # resizeterm queues a KEY_RESIZE, which would come back here
+        if (height, width) != self.size():
+            curses.resizeterm(height, width)
+        return height, width
+
+    def newpad(self, height: int, width: int) -> Any:
+        return self.wrap(curses.newpad(height, width))
+
+    def newwin(self, height: int, width: int, y: int, x: int) -> Any:
+        return self.wrap(curses.newwin(height, width, y, x))
+
+    def init_pair(self, pair: int, fg: int, bg: int) -> None:
+        curses.init_pair(pair, fg, bg)
+
+    def color_pair(self, pair: int) -> int:
+        return curses.color_pair(pair)
+
+    def doupdate(self) -> None:
+        curses.doupdate()
+        self.stats.end_frame()
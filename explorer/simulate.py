@@ -0,0 +1,251 @@
+"""
+Balance check: every weapon against every enemy at each player level, many fights per matchup,
+played out at once by lib/simulate.py. Writes one row per matchup with the player's win rate and the
+distributions of turns and damage, as CSV or JSON by the extension of --out
+
+The grid is cut into shards of matchups that worker processes play, each with its own random stream
+derived from --seed and the shard's index, so the output is the same for any number of workers.
+Rows are written as their shards come back, in grid order
+
+    python -m explorer.simulate [--fights 1000] [--levels 1-10] [--every-delusion] [--seed 0]
+                                [--workers N] [--out balance.csv]
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .ctx import Delusions, Rarity, max_hp
+from .data.game_items import Enemies, Weapons
+from .lib.progression import MAX_LEVEL, enemy_stats, weapon_atk
+from .lib.simulate import CODES, UNRESOLVED, WON, Batch
+
+# Lanes simulated at once, bounds the memory used
+BATCH_LANES = 1 << 20
+
+# Lanes in a shard, about. Depends only on --fights so that shards don't change with the workers
+SHARD_LANES = 1 << 18
+
+COLUMNS = (
+    "weapon",
+    "rarity",
+    "delusion",
+    "enemy",
+    "enemy_delusion",
+    "level",
+    "player_hp",
+    "player_atk",
+    "enemy_hp",
+    "enemy_atk",
+    "fights",
+    "win_rate",
+    "unresolved",
+    "turns_mean",
+    "turns_p10",
+    "turns_p50",
+    "turns_p90",
+    "hit_mean",
+    "dealt_mean",
+    "taken_mean",
+    "taken_p50",
+    "taken_p90",
+)
+
+
+def matchups(levels: range, every_delusion: bool = False) -> Iterator[dict]:
+    """
+    Stats of both sides for every weapon, enemy and level, as the game computes them. With
+    `every_delusion`, each weapon's ATK is tried with each of the delusions
+    """
+    for level in levels:
+        for rarity in Rarity:
+            for weapon in Weapons[rarity].values():
+                delusions = Delusions if every_delusion else (weapon.delusion.type,)
+                for delusion in delusions:
+                    for enemy in Enemies.values():
+                        hp, atk = enemy_stats(enemy["hp"], enemy["atk"], level)
+                        yield {
+                            "weapon": weapon.name,
+                            "rarity": rarity.name,
+                            "delusion": delusion.name,
+                            "enemy": enemy["name"],
+                            "enemy_delusion": enemy["delusion"].type.name,
+                            "level": level,
+                            "player_hp": max_hp(level, delusion),
+                            "player_atk": weapon_atk(weapon.atk, level - 1),
+                            "enemy_hp": hp,
+                            "enemy_atk": atk,
+                        }
+
+
+def simulate(rows: list[dict], fights: int, rng: np.random.Generator, max_turns: int) -> None:
+    """Plays `fights` fights for each row and adds the results to it"""
+    codes = {delusion.name: code for delusion, code in CODES.items()}
+    column = lambda key, convert=int: np.array([convert(row[key]) for row in rows])
+    stats = (
+        column("player_hp"),
+        column("player_atk"),
+        column("delusion", codes.get),
+        column("enemy_hp"),
+        column("enemy_atk"),
+        column("enemy_delusion", codes.get),
+    )
+
+    per_batch = max(1, BATCH_LANES // fights)
+    for start in range(0, len(rows), per_batch):
+        chunk = slice(start, start + per_batch)
+        lanes = [np.repeat(s[chunk], fights) for s in stats]
+        batch = Batch(tuple(lanes[:3]), tuple(lanes[3:]))  # type: ignore
+        batch.run(rng, max_turns)
+
+        shape = (-1, fights)
+        outcome = batch.outcome.reshape(shape)
+        won = outcome == WON
+        turns = batch.turns.reshape(shape)
+        dealt = batch.dealt.reshape(shape)
+        taken = batch.taken.reshape(shape)
+        won_turns = np.where(won, turns, np.nan)
+
+        # Matchups the player never wins have no turns to kill
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            turns_mean = np.nanmean(won_turns, axis=1)
+            turns_cuts = np.nanpercentile(won_turns, (10, 50, 90), axis=1)
+        taken_cuts = np.percentile(taken, (50, 90), axis=1)
+
+        results = {
+            "fights": np.full(len(outcome), fights),
+            "win_rate": won.mean(axis=1),
+            "unresolved": (outcome == UNRESOLVED).mean(axis=1),
+            "turns_mean": turns_mean,
+            "turns_p10": turns_cuts[0],
+            "turns_p50": turns_cuts[1],
+            "turns_p90": turns_cuts[2],
+            "hit_mean": dealt.sum(axis=1) / np.maximum(turns.sum(axis=1), 1),
+            "dealt_mean": dealt.mean(axis=1),
+            "taken_mean": taken.mean(axis=1),
+            "taken_p50": taken_cuts[0],
+            "taken_p90": taken_cuts[1],
+        }
+        for i, row in enumerate(rows[chunk]):
+            for key, values in results.items():
+                value = values[i].item()
+                row[key] = None if isinstance(value, float) and math.isnan(value) else value
+
+
+def play_shard(rows: list[dict], index: int, seed: int, fights: int, max_turns: int) -> list[dict]:
+    """Runs in a worker. The shard's random stream depends only on the seed and its index"""
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    simulate(rows, fights, rng, max_turns)
+    return rows
+
+
+def sweep(
+    rows: Iterable[dict], fights: int, seed: int, max_turns: int = 100, workers: int = 1
+) -> Iterator[dict]:
+    """
+    Plays the rows in shards across `workers` processes and yields them with their results, in
+    the order they came in. Only a few shards per worker are in flight at a time
+    """
+    rows = iter(rows)
+    size = max(1, SHARD_LANES // fights)
+    pending: deque[Future] = deque()
+
+    with ProcessPoolExecutor(workers) as pool:
+        index = 0
+        while shard := list(islice(rows, size)):
+            pending.append(pool.submit(play_shard, shard, index, seed, fights, max_turns))
+            index += 1
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class Totals:
+    """Win rates per level and overall, merged from the rows as they stream past"""
+
+    __slots__ = ("fights", "wins")
+
+    def __init__(self) -> None:
+        self.fights: dict[int, int] = {}
+        self.wins: dict[int, float] = {}
+
+    def add(self, row: dict) -> dict:
+        level = row["level"]
+        self.fights[level] = self.fights.get(level, 0) + row["fights"]
+        self.wins[level] = self.wins.get(level, 0) + row["win_rate"] * row["fights"]
+        return row
+
+    def report(self) -> str:
+        lines = [
+            f"level {level:>2}: {self.wins[level] / fights:.1%} won"
+            for level, fights in self.fights.items()
+        ]
+        total = sum(self.fights.values())
+        lines.append(f"overall:  {sum(self.wins.values()) / total:.1%} won of {total} fights")
+        return "\n".join(lines)
+
+
+def write(rows: Iterable[dict], path: str) -> int:
+    """Writes the rows one at a time, returns how many there were"""
+    count = 0
+    with open(path, "w", newline="") as f:
+        if path.endswith(".json"):
+            f.write("[")
+            for count, row in enumerate(rows, 1):
+                f.write(",\n " if count > 1 else "\n ")
+                json.dump(row, f)
+            f.write("\n]\n")
+        else:
+            writer = csv.DictWriter(f, COLUMNS)
+            writer.writeheader()
+            for count, row in enumerate(rows, 1):
+                writer.writerow(row)
+    return count
+
+
+def parse_levels(levels: str) -> range:
+    first, _, last = levels.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="explorer.simulate", description=__doc__)
+    parser.add_argument("--fights", type=int, default=1000, help="fights per matchup")
+    parser.add_argument("--levels", default=f"1-{MAX_LEVEL}", help="FIRST-LAST")
+    parser.add_argument(
+        "--every-delusion", action="store_true", help="try every weapon with all nine delusions"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default="balance.csv", help="a .csv or .json file")
+    args = parser.parse_args()
+
+    rows = matchups(parse_levels(args.levels), args.every_delusion)
+    totals = Totals()
+
+    start = perf_counter()
+    played = sweep(rows, args.fights, args.seed, args.max_turns, args.workers)
+    count = write(map(totals.add, played), args.out)
+    elapsed = perf_counter() - start
+
+    fights = count * args.fights
+    print(f"{count} matchups, {fights} fights in {elapsed:.1f}s on {args.workers} workers")
+    print(f"{fights / elapsed:.0f} fights/s")
+    print(totals.report())
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import curses
+import os
+
+import pytest
+
+from explorer.render.ansi import AnsiBackend
+
+
+@pytest.fixture
+def backend():
+    read, write = os.pipe()
+    backend = AnsiBackend(3, 8, output=write)
+    backend.init_pair(1, 196, 16)
+    backend.init_pair(2, 46, -1)
+    yield backend, read
+    os.close(read)
+    os.close(write)
+
+
+def frame(backend: AnsiBackend, read: int) -> str:
+    backend.stdscr.noutrefresh()
+    backend.doupdate()
+    return os.read(read, 4096).decode() if backend.frame_bytes else ""
+
+
+def test_only_changed_cells_are_written(backend) -> None:
+    backend, read = backend
+    screen = backend.stdscr
+
+    screen.addstr(1, 2, "ab", backend.color_pair(1))
+    screen.addstr(1, 6, "c", backend.color_pair(1) | curses.A_BOLD)
+    assert frame(backend, read) == (
+        "\x1b[2;3H\x1b[0;38;5;196;48;5;16mab\x1b[2C\x1b[0;1;38;5;196;48;5;16mc"
+    )
+    assert backend.stats.last[2] == 3
+
+    # Nothing changed, nothing is written
+    assert frame(backend, read) == ""
+
+
+def test_runs_bridge_single_unchanged_cells(backend) -> None:
+    backend, read = backend
+    screen = backend.stdscr
+
+    screen.addstr(0, 0, "abc")
+    frame(backend, read)
+
+    # The cursor is still after "abc", the unchanged "b" is rewritten instead of skipped
+    screen.addstr(0, 0, "x")
+    screen.addstr(0, 2, "z")
+    screen.addstr(0, 3, "", backend.color_pair(2))
+    assert frame(backend, read) == "\x1b[1;1Hxbz\x1b[0;38;5;46m"
+
+
+def test_rows_ending_at_the_last_column_forget_the_cursor(backend) -> None:
+    backend, read = backend
+    screen = backend.stdscr
+
+    screen.addstr(0, 6, "ab")
+    screen.addstr(1, 0, "c")
+    assert frame(backend, read) == "\x1b[1;7Hab\x1b[2;1Hc"
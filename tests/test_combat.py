@@ -0,0 +1,77 @@
+import random
+
+from explorer.ctx import Delusions, Phase, Turn
+from explorer.lib.combat import Fight, Fighter, act, advance, step, winner
+
+# Rolls that always or never trigger an effect
+HIT = lambda: 0.0
+MISS = lambda: 1.0
+
+
+def fight(player: Delusions, enemy: Delusions, **kwargs) -> Fight:
+    return Fight(Fighter(100, 100, 20, 20, player), Fighter(200, 200, 10, 10, enemy), **kwargs)
+
+
+def test_strong_against_multiplies_damage() -> None:
+    f = fight(Delusions.Freeze, Delusions.Burn)
+    events = act(f, "attack", MISS)
+    assert f.enemy.hp == 170
+    assert "You Dealt 30 damage" in events
+    assert f.phase == Phase.end
+
+
+def test_counters() -> None:
+    # Mech halves the damage and charges the enemy's ATK by 10% of its base
+    f = fight(Delusions.Drain, Delusions.Mech)
+    events = act(f, "attack", HIT)
+    assert events[:3] == ["~~~Enemy Mech Counter~~~", "Halved damage", "(ENEMY) +ATK 1"]
+    assert (f.enemy.hp, f.enemy.atk) == (190, 11)
+
+    # Corrupt turns half of it back on the attacker
+    f = fight(Delusions.Drain, Delusions.Corrupt)
+    act(f, "attack", HIT)
+    assert (f.player.hp, f.enemy.hp) == (90, 200)
+
+
+def test_freeze_skips_the_enemy_turn() -> None:
+    f = fight(Delusions.Freeze, Delusions.Drain, phase=Phase.end)
+    events = advance(f, HIT)
+    assert events[-2:] == ["(ENEMY) -HP 10", "Skipped Enemy Turn!"]
+    assert (f.turn, f.phase, f.player_fxd) == (Turn.player, Phase.begin, False)
+
+
+def test_enemy_turn_is_played_out() -> None:
+    f = fight(Delusions.Drain, Delusions.Bleed, turn=Turn.opponent)
+    events = advance(f, MISS)
+    assert "Enemy Dealt 10 damage" in events
+    assert events[-1] == "Turn passed"
+    assert (f.player.hp, f.turn, f.phase) == (90, Turn.player, Phase.begin)
+
+
+def test_stun_gives_the_enemy_another_turn() -> None:
+    f = fight(Delusions.Drain, Delusions.Stun, turn=Turn.opponent)
+    assert advance(f, HIT)[-1] == "Skipped Your Turn!"
+    assert (f.turn, f.extra_turn) == (Turn.opponent, True)
+
+    advance(f, MISS)
+    assert (f.turn, f.extra_turn) == (Turn.player, False)
+
+
+def test_commands_are_checked_against_the_phase() -> None:
+    f = fight(Delusions.Drain, Delusions.Bleed, phase=Phase.end)
+    assert act(f, "attack") == ["Can't use that in end phase!"]
+    assert f.enemy.hp == 200
+
+
+def play(seed: int) -> tuple[Turn | None, list[str]]:
+    rng = random.Random(seed).random
+    f = fight(Delusions.Burn, Delusions.Plant)
+    events = []
+    while not winner(f):
+        events += step(f, "attack" if f.phase == Phase.begin else "pass", rng)
+    return winner(f), events
+
+
+def test_seeded_fights_replay() -> None:
+    assert play(1) == play(1)
+    assert play(1) != play(2)
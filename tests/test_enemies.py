@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from explorer.lib.enemies import EnemyIndex
+from explorer.lib.tilemap import TileMap
+
+TILES = [None] * 256
+
+
+@pytest.fixture
+def index() -> EnemyIndex:
+    # Two enemies sharing the ATTACK tile between them, a third with no entry in the table
+    ids = np.array(
+        [
+            [21, 21, 21, 21, 21],
+            [22, 34, 22, 21, 22],
+            [21, 21, 34, 21, 34],
+        ],
+        dtype=np.uint8,
+    )
+    game_map = TileMap.from_array(ids, TILES)
+    # Keyed by normal coordinates, map coordinates + 1
+    table = {(2, 1): "left", (2, 3): "right", (9, 9): "not on the map"}
+    return EnemyIndex(game_map, table)
+
+
+def test_only_enemies_on_the_map_are_indexed(index: EnemyIndex) -> None:
+    assert len(index) == 2
+    assert index.near(2, 4) is None
+
+
+def test_neighbours_are_checked_up_down_left_right(index: EnemyIndex) -> None:
+    assert index.near(1, 1) == ((1, 0), "left")
+    assert index.near(2, 2) == ((1, 2), "right")
+    assert index.near(0, 0) == ((1, 0), "left")
+
+
+def test_defeated_enemies_are_forgotten(index: EnemyIndex) -> None:
+    index.remove(1, 0)
+
+    assert index.near(1, 1) == ((1, 2), "right")
+    assert index.near(0, 0) is None
+
+    index.remove(1, 2)
+    index.remove(2, 2)
+    assert index.near(1, 1) is None
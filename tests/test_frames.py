@@ -0,0 +1,145 @@
+"""
+Golden frames: the game is rendered with the headless backend and compared to tests/golden. After
+a change to what is drawn, check the new frames and regenerate them with
+UPDATE_GOLDEN=1 python -m pytest tests/test_frames.py
+"""
+import asyncio
+import curses
+import os
+from pathlib import Path
+
+import pytest
+
+from explorer.app import GameWrapper, setup
+from explorer.globals import Colors
+from explorer.globals import Globals as G
+from explorer.render.headless import HeadlessBackend
+
+GOLDEN = Path(__file__).parent / "golden"
+
+
+@pytest.fixture(scope="module")
+def game(tmp_path_factory) -> tuple[GameWrapper, HeadlessBackend]:
+    # The game only exists once per process: player, inventory and the side pad are globals
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("EXPLORER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        mp.setattr("explorer.ctx.getuser", lambda: "explorer")
+        backend = HeadlessBackend(40, 120)
+        yield setup(backend, seed=0), backend
+
+
+def press(game: tuple[GameWrapper, HeadlessBackend], keys: str | list[int]) -> list[str]:
+    wrapper, backend = game
+    for key in keys:
+        wrapper.listen(ord(key) if isinstance(key, str) else key)
+    wrapper.render()
+    return backend.text()
+
+
+def golden(name: str, frame: list[str]) -> list[str]:
+    path = GOLDEN / f"{name}.txt"
+    if os.environ.get("UPDATE_GOLDEN"):
+        path.write_text("\n".join(frame) + "\n", encoding="utf-8")
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_first_frame(game) -> None:
+    _, backend = game
+    assert backend.text() == golden("start", backend.text())
+
+    assert backend.pair_at(G.padding_height, G.padding_width) == Colors.OVERLAY >> 8
+    assert backend.pair_at(G.center_y, G.center_x) == Colors.OVERLAY >> 8
+
+
+def test_the_session_owns_its_rolls(game) -> None:
+    wrapper, _ = game
+    view = wrapper.get_game()
+    assert view is not None
+    assert wrapper.rngs.seed == 0 and view.rngs is wrapper.rngs
+
+
+def test_walking(game) -> None:
+    start = game[1].text()
+
+    frame = press(game, "dddds")
+    assert frame == golden("walked", frame)
+
+    # Scrolling back composes the same frame again
+    assert press(game, "waaaa") == start
+
+
+def test_inventory(game) -> None:
+    start = game[1].text()
+
+    frame = press(game, "i")
+    assert frame == golden("inventory", frame)
+
+    assert press(game, "i") == start
+
+
+def test_side_panel_never_clears(game, monkeypatch) -> None:
+    # clear() makes curses repaint the whole terminal on the next doupdate
+    side = game[0].get_side()
+    assert side is not None
+    cleared = []
+    monkeypatch.setattr(type(side.pad), "clear", lambda pad: cleared.append(pad))
+
+    press(game, "ii")
+    assert cleared == []
+
+
+def test_frame_stats(game) -> None:
+    wrapper, backend = game
+
+    wrapper.render()
+    calls, cells, changed = backend.stats.last
+    assert changed == 0
+
+    # A step scrolls the map and draws one column, the side only redraws the position
+    press(game, "d")
+    calls, cells, changed = backend.stats.last
+    assert 0 < changed < G.view_height * G.view_width
+    assert cells < G.view_height * G.view_width // 10
+
+    press(game, "a")
+
+
+def test_rows_stay_encoded_while_walking_sideways(game) -> None:
+    wrapper, _ = game
+    view = wrapper.get_game()
+    assert view is not None
+    rows = dict(view.row_cache)
+    assert len(rows) >= G.view_height
+
+    # A few steps sideways and back cut the viewport out of the rows already encoded
+    press(game, "dddaaa")
+    assert all(view.row_cache[y] is row for y, row in rows.items())
+
+
+def test_resize(game) -> None:
+    wrapper, backend = game
+
+    backend.resize(30, 100)
+    frame = press(game, [curses.KEY_RESIZE])
+    assert frame == golden("resized", frame)
+    assert (G.height, G.width) == (29, 99)
+
+    # Keys wait while the layout doesn't fit
+    backend.resize(10, 30)
+    assert press(game, [curses.KEY_RESIZE, ord("d")])[0].rstrip() == "Terminal too small"
+
+    backend.resize(40, 120)
+    assert press(game, [curses.KEY_RESIZE]) == golden("start", backend.text())
+
+
+def test_a_failing_task_ends_the_game(game, monkeypatch) -> None:
+    wrapper, _ = game
+    read, write = os.pipe()
+    monkeypatch.setattr("explorer.app.sys.stdin", os.fdopen(read))
+    monkeypatch.setattr(wrapper, "timers", [(0, lambda: 1 / 0)])
+
+    try:
+        with pytest.raises(ZeroDivisionError):
+            asyncio.run(asyncio.wait_for(wrapper.run(), 1))
+    finally:
+        os.close(write)
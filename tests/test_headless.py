@@ -0,0 +1,101 @@
+import curses
+
+import pytest
+
+from explorer.render.headless import Buffer, HeadlessBackend
+
+
+@pytest.fixture
+def backend() -> HeadlessBackend:
+    return HeadlessBackend(4, 6)
+
+
+def rows(buffer: Buffer) -> list[str]:
+    return [row.tobytes().decode("utf-32-le") for row in buffer.chars]
+
+
+def test_newlines_clear_the_rest_of_the_line(backend: HeadlessBackend) -> None:
+    pad = backend.newpad(3, 4)
+    pad.addstr("abcd")
+    pad.move(0, 0)
+    pad.addstr("x\ny")
+
+    assert rows(pad) == ["x   ", "y   ", "    "]
+    assert pad.getyx() == (1, 1)
+
+
+def test_text_wraps_and_errors_at_the_bottom(backend: HeadlessBackend) -> None:
+    pad = backend.newpad(2, 3)
+    pad.addstr("abcd")
+    assert rows(pad) == ["abc", "d  "]
+
+    with pytest.raises(curses.error):
+        pad.addstr("efgh")
+
+    pad.scrollok(True)
+    pad.move(1, 0)
+    pad.addstr("12\n")
+    assert rows(pad) == ["12 ", "   "]
+
+
+def test_insert_and_delete_shift_the_line(backend: HeadlessBackend) -> None:
+    pad = backend.newpad(1, 5)
+    pad.addstr(0, 0, "abcd")
+
+    pad.insstr(0, 1, "X", 7)
+    assert rows(pad) == ["aXbcd"]
+    assert pad.attrs[0, 1] == 7
+    assert pad.getyx() == (0, 1)
+
+    pad.delch(0, 0)
+    assert rows(pad) == ["Xbcd "]
+
+
+def test_scroll(backend: HeadlessBackend) -> None:
+    pad = backend.newpad(3, 2)
+    pad.scrollok(True)
+    for y, ch in enumerate("abc"):
+        pad.addch(y, 0, ch)
+
+    pad.scroll(1)
+    assert rows(pad) == ["b ", "c ", "  "]
+    pad.scroll(-2)
+    assert rows(pad) == ["  ", "  ", "b "]
+
+
+def test_background_colours_uncoloured_text(backend: HeadlessBackend) -> None:
+    pad = backend.newpad(1, 3)
+    pad.bkgd(" ", backend.color_pair(1))
+    pad.addstr("a", curses.A_BOLD)
+    pad.addstr("b", backend.color_pair(2))
+
+    assert pad.attrs[0].tolist() == [curses.A_BOLD | 1 << 8, 2 << 8, 1 << 8]
+
+
+def test_frames_are_composed_from_noutrefresh(backend: HeadlessBackend) -> None:
+    # A spare row, writing to the bottom right cell is an error like in curses
+    pad = backend.newpad(3, 10)
+    pad.addstr(0, 0, "0123456789")
+    pad.addstr(1, 0, "abcdefghij")
+    win = backend.newwin(1, 1, 3, 5)
+    win.insstr(0, 0, "@")
+
+    # The pad is clipped to the screen, the window goes where it was created
+    pad.noutrefresh(0, 2, 1, 1, 2, 9)
+    win.noutrefresh()
+    assert backend.text()[1] == "      "
+
+    backend.doupdate()
+    assert backend.text() == ["      ", " 23456", " cdefg", "     @"]
+    assert backend.stats.last == (5, 21, 11)
+
+    backend.doupdate()
+    assert backend.stats.last == (0, 0, 0)
+    assert backend.stats.frames == 2
+
+
+def test_keys(backend: HeadlessBackend) -> None:
+    backend.feed("w")
+    backend.feed([27])
+
+    assert [backend.stdscr.getch() for _ in range(3)] == [ord("w"), 27, -1]
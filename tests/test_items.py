@@ -0,0 +1,27 @@
+import pytest
+
+from explorer.ctx import Delusion, Delusions, Rarity
+from explorer.data.game_items import Enemies, Heals, Weapons
+
+
+def test_delusions_are_interned() -> None:
+    assert Delusion(Delusions.Zap) is Delusion(Delusions.Zap)
+    assert Weapons[Rarity.Common][7].delusion is Delusion(Delusions.Zap)
+    assert {id(e["delusion"]) for e in Enemies.values()} <= {id(Delusion(d)) for d in Delusions}
+    assert Delusion(Delusions.Freeze).strong == Delusions.Burn
+
+
+def test_items_share_their_template() -> None:
+    template = Weapons[Rarity.Epic][2]
+    a, b = template(), template()
+    assert a is not b and a.template is b.template
+    assert (a.name, a.atk, a.rarity) == ("Lava Fist", 29, Rarity.Epic)
+
+    # ATK is the weapon's own, the name is the template's
+    a.atk += 5
+    assert (a.atk, b.atk, template.atk) == (34, 29, 29)
+    with pytest.raises(AttributeError):
+        a.name = "Lava Toe"  # type: ignore
+
+    assert Heals[1]() is not Heals[1]()
+    assert Heals[1]().amount == 15
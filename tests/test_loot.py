@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+import pytest
+
+from explorer.ctx import Rarity
+from explorer.data.loot import CHEST, CHESTS, HEALS, TILES, make
+from explorer.lib.loot import AliasTable
+
+
+def test_odds_match_the_weights() -> None:
+    weights = {"a": 1, "b": 7, "c": 0.5, "d": 0, "e": 3.5}
+    odds = AliasTable(weights).odds()
+    for item, weight in weights.items():
+        assert odds[item] == pytest.approx(weight / 12)
+
+
+def test_draws_follow_the_odds() -> None:
+    table = AliasTable(HEALS)
+    counts = np.bincount(table.sample(200_000, np.random.default_rng(1)), minlength=len(table))
+    assert counts / counts.sum() == pytest.approx([0.60, 0.25, 0.12, 0.03], abs=0.005)
+
+    rng = random.Random(1)
+    draws = [table.draw(rng) for _ in range(20_000)]
+    assert draws.count(("heal", 1)) / len(draws) == pytest.approx(0.60, abs=0.02)
+
+
+def test_bad_weights() -> None:
+    for weights in ({}, {"a": 0}, {"a": 1, "b": -1}):
+        with pytest.raises(ValueError):
+            AliasTable(weights)
+
+
+def test_chests_give_what_they_used_to() -> None:
+    rng = random.Random(0)
+    beginner = [make(item) for item in CHESTS[(176, 49)].roll(rng)]
+    assert beginner[0].rarity == Rarity.Common and beginner[1].name == "Bandage"
+
+    odds = CHEST.tables[0].odds()
+    assert odds[("weapon", Rarity.Common, 1)] == pytest.approx(3 / 6 / 9)
+    assert odds[("weapon", Rarity.Epic, 9)] == pytest.approx(1 / 6 / 9)
+    assert {make(i).rarity for i in TILES[27].tables[0].items} == {Rarity.Mythic}
+
+
+def test_sample_shape() -> None:
+    rolls = CHESTS[(185, 43)].sample(1000, np.random.default_rng(0))
+    assert rolls.shape == (1000, 3)
+    assert rolls[:, 0].max() < 18 and not rolls[:, 1:].any()
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from explorer.lib import mapcache
+from explorer.lib.mapcache import cache_path, load_ids
+from explorer.lib.palette import decode_image
+
+
+class CountingDecoder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, m: Image.Image) -> np.ndarray:
+        self.calls += 1
+        return decode_image(m)
+
+
+def save_map(path: Path, pixels: list[list[tuple[int, int, int]]]) -> None:
+    Image.fromarray(np.array(pixels, dtype=np.uint8), "RGB").save(path)
+
+
+@pytest.fixture
+def asset(tmp_path: Path) -> Path:
+    path = tmp_path / "map.png"
+    save_map(path, [[(150, 150, 150), (255, 0, 0)], [(255, 255, 255), (200, 0, 0)]])
+    return path
+
+
+def test_cold_then_warm_load(asset: Path, tmp_path: Path) -> None:
+    decode = CountingDecoder()
+    cache_dir = tmp_path / "cache"
+
+    cold = load_ids(asset, cache_dir, decode)
+    warm = load_ids(asset, cache_dir, decode)
+
+    assert decode.calls == 1
+    assert cache_path(asset, cache_dir).exists()
+    assert cold.tolist() == warm.tolist() == [[21, 22], [0, 34]]
+
+
+def test_changed_image_rebuilds(asset: Path, tmp_path: Path) -> None:
+    decode = CountingDecoder()
+    load_ids(asset, tmp_path, decode)
+
+    save_map(asset, [[(255, 255, 0), (255, 255, 0)], [(255, 255, 0), (255, 255, 0)]])
+
+    assert load_ids(asset, tmp_path, decode).tolist() == [[24, 24], [24, 24]]
+    assert decode.calls == 2
+
+
+def test_parser_version_bump_rebuilds(
+    asset: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    decode = CountingDecoder()
+    load_ids(asset, tmp_path, decode)
+
+    monkeypatch.setattr(mapcache, "PARSER_VERSION", mapcache.PARSER_VERSION + 1)
+    load_ids(asset, tmp_path, decode)
+    load_ids(asset, tmp_path, decode)
+
+    assert decode.calls == 2
+
+
+def test_corrupt_cache_rebuilds(asset: Path, tmp_path: Path) -> None:
+    decode = CountingDecoder()
+    load_ids(asset, tmp_path, decode)
+
+    path = cache_path(asset, tmp_path)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    assert load_ids(asset, tmp_path, decode).tolist() == [[21, 22], [0, 34]]
+    assert decode.calls == 2
+
+
+def test_writes_never_reach_the_cache_file(asset: Path, tmp_path: Path) -> None:
+    load_ids(asset, tmp_path)
+    ids = load_ids(asset, tmp_path)
+
+    ids[0, 0] = 24
+
+    assert load_ids(asset, tmp_path).tolist() == [[21, 22], [0, 34]]
+
+
+def test_cache_dir_from_environment(
+    asset: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(mapcache.CACHE_DIR_ENV, str(tmp_path / "env"))
+
+    assert cache_path(asset) == tmp_path / "env" / "map.tiles"
+    monkeypatch.delenv(mapcache.CACHE_DIR_ENV)
+    assert cache_path(asset) == asset.parent / ".cache" / "map.tiles"
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from explorer.lib.palette import PIXEL_TO_ID, Palette, UnknownColorError, decode_image
+
+
+def make_image(pixels: list[list[tuple[int, int, int]]]) -> Image.Image:
+    return Image.fromarray(np.array(pixels, dtype=np.uint8), "RGB")
+
+
+def test_decode_matches_palette() -> None:
+    pixels = [
+        [(150, 150, 150), (255, 0, 0), (255, 255, 255)],
+        [(200, 0, 0), (25, 25, 25), (0, 0, 255)],
+    ]
+    ids = decode_image(make_image(pixels))
+
+    assert ids.shape == (2, 3)
+    assert ids.tolist() == [[PIXEL_TO_ID[p] for p in row] for row in pixels]
+
+
+def test_decode_ignores_alpha() -> None:
+    m = make_image([[(255, 0, 255), (255, 255, 0)]]).convert("RGBA")
+
+    assert decode_image(m).tolist() == [[23, 24]]
+
+
+def test_unknown_colors_are_reported_with_coordinates() -> None:
+    m = make_image([[(150, 150, 150), (1, 2, 3)], [(255, 255, 254), (150, 150, 150)]])
+
+    with pytest.raises(UnknownColorError) as e:
+        decode_image(m)
+
+    assert e.value.coords == [(0, 1), (1, 0)]
+    assert e.value.colors == [(1, 2, 3), (255, 255, 254)]
+
+
+def test_custom_palette() -> None:
+    palette = Palette({(0, 0, 0): 1, (255, 255, 255): 2})
+
+    assert palette.decode(make_image([[(255, 255, 255), (0, 0, 0)]])).tolist() == [[2, 1]]
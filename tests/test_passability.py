@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from explorer.globals import Colors
+from explorer.lib.parser import TileCatalog
+from explorer.lib.passability import Passability
+from explorer.lib.tilemap import TileMap
+from explorer.lib.world import ChunkedWorld, write_world_array
+from explorer.render.headless import HeadlessBackend
+
+# Walls (19) and locks (32) block, paths (21) and chests (23) don't
+BARRIERS = bytes(1 if id in (19, 32) else 0 for id in range(256))
+
+
+@pytest.fixture
+def passability() -> Passability:
+    ids = np.array([[19, 21, 23], [21, 32, 19]], dtype=np.uint8)
+    return Passability(TileMap.from_array(ids, [None] * 256), BARRIERS)
+
+
+def test_blocked_cells(passability: Passability) -> None:
+    assert [[passability.blocked(y, x) for x in range(3)] for y in range(2)] == [
+        [True, False, False],
+        [False, True, True],
+    ]
+
+
+def test_outside_of_the_map_is_blocked(passability: Passability) -> None:
+    assert passability.blocked(-1, 1)
+    assert passability.blocked(0, 3)
+
+
+def test_void_inside_the_map_is_walkable() -> None:
+    # The tile catalog takes its colours from Colors the first time it's used
+    Colors.setup_colors(HeadlessBackend(40, 120))
+    catalog = TileCatalog()  # type: ignore
+
+    ids = np.array([[0, 19], [21, 0]], dtype=np.uint8)
+    passability = Passability(TileMap.from_array(ids, catalog.table), catalog.barriers)
+    assert not passability.blocked(0, 0) and not passability.blocked(1, 1)
+    assert passability.blocked(0, 1) and passability.blocked(-1, 0) and passability.blocked(1, 2)
+    assert catalog.barriers[255] == 1
+
+
+def test_update(passability: Passability) -> None:
+    # Unlocking a lock
+    passability.update(1, 1, 21)
+    assert not passability.blocked(1, 1)
+
+    passability.update(0, 1, 19)
+    assert passability.blocked(0, 1)
+
+
+def test_barrier_table_covers_every_id() -> None:
+    with pytest.raises(ValueError):
+        Passability(TileMap(1, 1, [None] * 256), b"\0" * 35)
+
+
+def test_streamed_maps_are_not_copied(tmp_path) -> None:
+    ids = np.array([[19, 21, 23], [21, 32, 19]], dtype=np.uint8)
+    write_world_array(tmp_path / "test.world", ids, chunk_size=2)
+    world = ChunkedWorld(tmp_path / "test.world", [None] * 256)
+    try:
+        passability = Passability(world, BARRIERS)
+        assert passability.cells is None and world.stats["loads"] == 0
+        assert [[passability.blocked(y, x) for x in range(3)] for y in range(2)] == [
+            [True, False, False],
+            [False, True, True],
+        ]
+        assert passability.blocked(2, 0)
+
+        world.set(1, 1, 21)
+        passability.update(1, 1, 21)
+        assert not passability.blocked(1, 1)
+    finally:
+        world.close()
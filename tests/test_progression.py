@@ -0,0 +1,55 @@
+from math import floor
+
+from explorer.data.game_items import Enemies, Weapons
+from explorer.lib import progression
+from explorer.lib.progression import (
+    BASE_MAX_HP,
+    MAX_LEVEL,
+    MAX_XP,
+    compound,
+    enemy_stats,
+    level_for,
+    weapon_atk,
+)
+
+
+def test_level_cap_follows_the_level_table() -> None:
+    assert MAX_LEVEL == len(MAX_XP) - 1 == 10
+    tables = (BASE_MAX_HP, progression.ENEMY_HP_SCALE, progression.ENEMY_ATK_SCALE)
+    assert all(len(table) == len(MAX_XP) for table in tables)
+    assert len(progression.weapon_atks(10)) == MAX_LEVEL
+
+
+def test_tables_match_compounding() -> None:
+    xp, hp = 20, 50
+    for level in range(1, MAX_LEVEL + 1):
+        assert (MAX_XP[level], BASE_MAX_HP[level]) == (xp, hp)
+        xp, hp = int(round(xp * 1.8, -1)), int(round(hp * 1.5, -1))
+
+    for weapons in Weapons.values():
+        for template in weapons.values():
+            atk = template.atk
+            for levels in range(MAX_LEVEL):
+                assert weapon_atk(template.atk, levels) == atk
+                atk = floor(atk * 1.5)
+
+    for enemy in Enemies.values():
+        for level in range(1, MAX_LEVEL + 1):
+            scaled = (floor(enemy["hp"] * 1.5**level), floor(enemy["atk"] * 1.3**level))
+            expected = scaled if level > 1 else (enemy["hp"], enemy["atk"])
+            assert enemy_stats(enemy["hp"], enemy["atk"], level) == expected
+
+
+def test_level_for_xp() -> None:
+    assert [level_for(xp) for xp in (0, 19, 20, 39, MAX_XP[2])] == [1, 1, 2, 2, 3]
+    assert level_for(10**30) == MAX_LEVEL
+
+
+def test_a_hundred_levels(monkeypatch) -> None:
+    table = compound(20, 1.8, 100)
+    monkeypatch.setattr(progression, "MAX_LEVEL", 100)
+    progression.weapon_atks.cache_clear()
+    atks = progression.weapon_atks(37)
+    progression.weapon_atks.cache_clear()
+    assert len(table) == 101 and len(atks) == 100
+    assert table == sorted(table) and atks == tuple(sorted(atks))
@@ -0,0 +1,24 @@
+from explorer.data.loot import CHEST
+from explorer.lib.rng import Rngs
+
+
+def test_seeded_streams_repeat() -> None:
+    a, b = Rngs(5), Rngs(5)
+    assert [a.loot.randint(1, 9) for _ in range(20)] == [b.loot.randint(1, 9) for _ in range(20)]
+    assert Rngs(5).combat.random() != Rngs(6).combat.random()
+
+
+def test_streams_are_independent() -> None:
+    a, b = Rngs(5), Rngs(5)
+    # A fight that rolls more often doesn't change what the chests hold
+    for _ in range(100):
+        a.combat.random()
+    assert a.loot.random() == b.loot.random()
+    assert a.combat.random() != a.loot.random()
+
+
+def test_reseeding_replays_the_loot() -> None:
+    rngs = Rngs(3)
+    first = [CHEST.roll(rngs.loot) for _ in range(30)]
+    rngs.reseed(3)
+    assert [CHEST.roll(rngs.loot) for _ in range(30)] == first
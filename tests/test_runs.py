@@ -0,0 +1,50 @@
+import pytest
+
+from explorer.lib.runs import EncodedRow, RowEncoder
+
+CHARS = [" ", "#", "#", ".", "$"]
+COLORS = [0, 7, 7, 3, 5]
+
+
+def test_groups_cells_by_colour() -> None:
+    encoder = RowEncoder(CHARS, COLORS)
+
+    # Different tiles with the same colour share a run
+    runs = encoder.encode(bytes([1, 2, 1, 3, 3, 4, 0]))
+    assert runs == [("###", 7), ("..", 3), ("$", 5), (" ", 0)]
+    assert encoder.encode(b"") == []
+
+
+def test_newline_tile_id_is_not_special() -> None:
+    # Tile id 10 is "\n" when read as a byte, runs must not stop at it
+    chars = ["x"] * 11
+    colors = [1] * 11
+    assert RowEncoder(chars, colors).encode(bytes([10, 10, 3])) == [("xxx", 1)]
+
+
+def test_rows_encoded_together_stay_apart() -> None:
+    encoder = RowEncoder(CHARS, COLORS)
+
+    # Runs never reach across rows, even when a row ends in the colour the next starts with
+    rows = [bytes([1, 1]), b"", bytes([2, 3]), bytes([0]), bytes([3, 3, 1])]
+    assert encoder.encode_rows(rows) == [encoder.encode(row) for row in rows]
+    assert encoder.encode_rows(rows)[2] == [("#", 7), (".", 3)]
+    assert encoder.encode_rows([]) == []
+
+
+def test_too_many_colours() -> None:
+    with pytest.raises(ValueError):
+        RowEncoder(["x"] * 300, list(range(300)))
+
+
+def test_windows_match_encoding_the_window() -> None:
+    encoder = RowEncoder(CHARS, COLORS)
+    ids = bytes([1, 2, 1, 3, 3, 4, 0, 0, 3])
+    row = EncodedRow(-2, encoder.encode(ids))
+    assert (row.left, row.right) == (-2, 7)
+
+    for left in range(-2, 8):
+        for right in range(left, 8):
+            assert row.covers(left, right)
+            assert row.window(left, right) == encoder.encode(ids[left + 2 : right + 2])
+    assert not row.covers(-3, 0) and not row.covers(0, 8)
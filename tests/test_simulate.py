@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from explorer.ctx import Delusions, Phase, Turn
+from explorer.lib.combat import Fight, Fighter, step, winner
+from explorer.lib.simulate import CODES, LOST, UNRESOLVED, WON, Batch
+from explorer.simulate import matchups, sweep
+
+PAIRS = [(p, e) for p in Delusions for e in Delusions]
+
+
+class Rolls:
+    """Stands in for a Generator whose rolls are all `value`, so effects always or never trigger"""
+
+    def __init__(self, value: float) -> None:
+        self.value = value
+
+    def random(self, n: int) -> np.ndarray:
+        return np.full(n, self.value)
+
+    def __call__(self) -> float:
+        return self.value
+
+
+def play(fight: Fight, rng: Rolls, max_turns: int) -> tuple[int, int]:
+    """The simulator's player with the combat engine: attack, see the end effect, then pass"""
+    turns = 0
+    while not winner(fight):
+        if fight.turn == Turn.opponent:
+            step(fight, None, rng)
+            continue
+        if turns == max_turns:
+            return UNRESOLVED, turns
+
+        step(fight, "attack", rng)
+        turns += 1
+        for command in (None, "pass"):
+            if winner(fight) or fight.phase != Phase.end:
+                break
+            step(fight, command, rng)
+    return (WON if winner(fight) == Turn.player else LOST), turns
+
+
+@pytest.mark.parametrize("value", [0.0, 1.0])
+def test_lanes_play_like_the_engine(value: float) -> None:
+    rng = Rolls(value)
+    player = (np.full(len(PAIRS), 60), np.full(len(PAIRS), 20), [CODES[p] for p, _ in PAIRS])
+    enemy = (np.full(len(PAIRS), 120), np.full(len(PAIRS), 14), [CODES[e] for _, e in PAIRS])
+    batch = Batch(player, enemy)  # type: ignore
+    batch.run(rng, max_turns=30)  # type: ignore
+
+    for lane, (p, e) in enumerate(PAIRS):
+        fight = Fight(Fighter(60, 60, 20, 20, p), Fighter(120, 120, 14, 14, e))
+        outcome, turns = play(fight, rng, 30)
+        assert (batch.outcome[lane], batch.turns[lane]) == (outcome, turns), (p, e)
+        assert batch.hp[:, lane].tolist() == [fight.player.hp, fight.enemy.hp], (p, e)
+
+
+def test_seeded_runs_repeat() -> None:
+    lanes = 1000
+    player = (np.full(lanes, 60), np.full(lanes, 20), np.full(lanes, CODES[Delusions.Burn]))
+    enemy = (np.full(lanes, 120), np.full(lanes, 14), np.full(lanes, CODES[Delusions.Plant]))
+
+    results = []
+    for _ in range(2):
+        batch = Batch(player, enemy)
+        batch.run(np.random.default_rng(7))
+        results.append((batch.outcome.copy(), batch.turns.copy(), batch.taken.copy()))
+    for a, b in zip(*results):
+        assert np.array_equal(a, b)
+
+
+def test_sweep_output_does_not_depend_on_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Shards of 3 rows, so that a few are in flight at once
+    monkeypatch.setattr("explorer.simulate.SHARD_LANES", 3 * 20)
+    rows = lambda: list(matchups(range(2, 3)))[:20]
+
+    one, three = (list(sweep(rows(), 20, seed=3, workers=n)) for n in (1, 3))
+    assert one == three
+    assert [row["enemy"] for row in one] == [row["enemy"] for row in rows()]
+    assert one != list(sweep(rows(), 20, seed=4, workers=1))
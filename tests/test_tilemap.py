@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from explorer.lib.tilemap import TileMap
+
+# Stand-in for the tile catalog table, TileMap only indexes into it
+TILES = [f"tile-{id}" for id in range(256)]
+
+
+@pytest.fixture
+def tile_map() -> TileMap:
+    ids = np.array([[0, 21, 22], [21, 22, 21]], dtype=np.uint8)
+    return TileMap.from_array(ids, TILES)  # type: ignore
+
+
+def test_get_set(tile_map: TileMap) -> None:
+    assert (tile_map.height, tile_map.width) == (2, 3)
+    assert tile_map.get(0, 2) == 22
+
+    tile_map.set(0, 2, 21)
+    assert tile_map.get(0, 2) == 21
+    assert tile_map.ids()[0, 2] == 21
+
+
+def test_tile_lookup_through_side_table(tile_map: TileMap) -> None:
+    assert tile_map.tile(1, 1) == "tile-22"
+    assert tile_map[1][1] == "tile-22"
+    assert list(tile_map[0]) == ["tile-0", "tile-21", "tile-22"]
+
+    with pytest.raises(IndexError):
+        tile_map[0][3]
+
+
+def test_row_views(tile_map: TileMap) -> None:
+    assert bytes(tile_map.row(1)) == bytes([21, 22, 21])
+    assert [bytes(r) for r in tile_map.rows()] == [bytes([0, 21, 22]), bytes([21, 22, 21])]
+
+
+def test_span_pads_with_void(tile_map: TileMap) -> None:
+    assert tile_map.span(1, 0, 3) == bytes([21, 22, 21])
+    assert tile_map.span(0, -2, 5) == bytes([0, 0, 0, 21, 22, 0, 0])
+    assert tile_map.span(2, 0, 3) == tile_map.span(0, 3, 6) == bytes(3)
+
+
+def test_bulk_queries(tile_map: TileMap) -> None:
+    assert tile_map.find(22) == [(0, 2), (1, 1)]
+    assert tile_map.count(21) == 3
+    assert tile_map.find(99) == []
+
+
+def test_one_byte_per_cell() -> None:
+    tile_map = TileMap(64, 128, TILES, fill=7)  # type: ignore
+
+    assert tile_map.nbytes == 64 * 128
+    assert tile_map.get(63, 127) == 7
+
+
+def test_rejects_wide_ids() -> None:
+    with pytest.raises(ValueError):
+        TileMap.from_array(np.array([[999]]), TILES)  # type: ignore
+
+
+def test_out_of_bounds_reads_are_void(tile_map: TileMap) -> None:
+    for y, x in ((-1, 0), (0, -1), (2, 0), (0, 3)):
+        assert tile_map.get(y, x) == 0
+    assert tile_map.tile(5, 5) == "tile-0"
+
+    with pytest.raises(IndexError):
+        tile_map.set(-1, 0, 21)
+
+
+def test_uint8_arrays_are_used_in_place() -> None:
+    ids = np.array([[21, 22], [23, 24]], dtype=np.uint8)
+    tile_map = TileMap.from_array(ids, TILES)  # type: ignore
+
+    tile_map.set(1, 0, 34)
+
+    assert ids[1, 0] == 34
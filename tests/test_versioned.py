@@ -0,0 +1,46 @@
+from recordclass import RecordClass  # type: ignore
+
+from explorer.lib.versioned import versioned
+
+
+@versioned
+class Counter:
+    def __init__(self) -> None:
+        self.version = 0
+        self.n = 0
+        self._cache = None
+
+
+@versioned
+class Wallet(RecordClass):
+    _money: int
+    version: int = 0
+
+    @property
+    def money(self) -> int:
+        return self._money
+
+    @money.setter
+    def money(self, n: int) -> None:
+        self._money = n
+
+
+def test_assignments_bump_version() -> None:
+    c = Counter()
+    assert c.version == 1
+
+    c.n += 1
+    c.n = 2
+    assert c.version == 3
+
+
+def test_private_attributes_are_ignored() -> None:
+    c = Counter()
+    c._cache = 1
+    assert c.version == 1
+
+
+def test_recordclass_and_properties() -> None:
+    w = Wallet(10)
+    w.money += 5
+    assert (w.money, w.version) == (15, 1)
@@ -0,0 +1,118 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from explorer.app import MAP_IMAGE
+from explorer.game import Game
+from explorer.globals import Colors
+from explorer.globals import Globals as G
+from explorer.lib.mapcache import load_ids
+from explorer.lib.parser import load_world, to_tile_map
+from explorer.lib.world import ChunkedWorld, write_world_array
+from explorer.render.headless import HeadlessBackend
+
+TILES = [f"tile-{id}" for id in range(256)]
+
+
+@pytest.fixture
+def ids() -> np.ndarray:
+    # Not a multiple of the chunk size on purpose
+    rng = np.random.default_rng(0)
+    return rng.integers(10, 35, (37, 53), dtype=np.uint8)
+
+
+@pytest.fixture
+def world(tmp_path: Path, ids: np.ndarray):
+    path = tmp_path / "test.world"
+    write_world_array(path, ids, chunk_size=8)
+    world = ChunkedWorld(path, TILES, capacity=4)  # type: ignore
+    yield world
+    world.close()
+
+
+def read_all(world: ChunkedWorld) -> list[list[int]]:
+    return [[world.get(y, x) for x in range(world.width)] for y in range(world.height)]
+
+
+def test_round_trip(world: ChunkedWorld, ids: np.ndarray) -> None:
+    assert (world.height, world.width) == ids.shape
+    assert read_all(world) == ids.tolist()
+    assert world.tile(3, 4) == f"tile-{ids[3, 4]}"
+
+
+def test_lru_keeps_memory_bounded(world: ChunkedWorld) -> None:
+    read_all(world)
+
+    assert world.resident_chunks <= world.capacity
+    assert world.stats["evictions"] > 0
+
+
+def test_edits_survive_eviction(world: ChunkedWorld, ids: np.ndarray) -> None:
+    world.set(0, 0, 21)
+    world.set(36, 52, 22)
+    read_all(world)
+
+    assert world.get(0, 0) == 21
+    assert world.get(36, 52) == 22
+    assert world.get(0, 1) == ids[0, 1]
+
+
+def test_out_of_bounds(world: ChunkedWorld) -> None:
+    assert world.get(-1, 0) == world.get(0, 53) == 0
+
+    with pytest.raises(IndexError):
+        world.set(37, 0, 21)
+
+
+def test_span_crosses_chunks(world: ChunkedWorld, ids: np.ndarray) -> None:
+    world.set(5, 20, 21)
+    ids[5, 20] = 21
+
+    assert world.span(5, 3, 45) == ids[5, 3:45].tobytes()
+    assert world.span(36, -4, 57) == bytes(4) + ids[36].tobytes() + bytes(4)
+    assert world.span(37, 0, 10) == bytes(10)
+
+
+def test_prefetch_in_direction_of_travel(world: ChunkedWorld) -> None:
+    # Viewport covering chunk (0, 0), moving right: chunk (0, 1) gets decoded in the background
+    world.prefetch(0, 0, 8, 8, 0, 1)
+
+    deadline = time.monotonic() + 5
+    while world.stats["prefetched"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert world.stats["prefetched"] == 2
+    world.get(0, 9)
+    assert world.stats["loads"] == 0
+
+
+def test_chunk_size_must_be_power_of_two(tmp_path: Path, ids: np.ndarray) -> None:
+    with pytest.raises(ValueError):
+        write_world_array(tmp_path / "bad.world", ids, chunk_size=10)
+
+
+def test_game_streams_a_world(tmp_path: Path) -> None:
+    backend = HeadlessBackend(40, 120)
+    # The tile catalog takes its colours from Colors the first time it's used
+    Colors.setup_colors(backend)
+
+    ids = load_ids(Path(__file__).parents[1] / MAP_IMAGE, tmp_path)
+    write_world_array(tmp_path / "map.world", ids)
+    world = load_world(tmp_path / "map.world")
+    try:
+        pads = [backend.newpad(G.view_height + 1, G.view_width + 1) for _ in range(2)]
+        streamed, parsed = Game(pads[0], world), Game(pads[1], to_tile_map(ids))
+        assert np.array_equal(pads[0].chars, pads[1].chars)
+
+        # Only the chunks around the viewport were decoded
+        assert world.resident_chunks < world.chunk_rows * world.chunk_cols
+        assert streamed.passability.cells is None
+
+        for game in (streamed, parsed):
+            game.on_move(0, 1)
+            game.render()
+        assert np.array_equal(pads[0].chars, pads[1].chars)
+    finally:
+        world.close()